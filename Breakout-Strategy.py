@@ -30,7 +30,26 @@ CONFIGURATION:
 Modify these parameters to change strategy behavior:
 """
 
+import sys
+from dataclasses import dataclass
 import numpy as np
+from strategy_messages import message as _message
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - kernels fall back to plain Python loops
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Numba's on-disk cache re-imports this module by name when loading compiled kernels,
+# so only enable it when the loader registered the module in sys.modules
+JIT_CACHE = __name__ in sys.modules
+
+# Validate array input contracts (dtype/contiguity) on the hot paths - off in production
+DEBUG_CHECKS = False
 
 # ==================== STRATEGY CONFIGURATION ====================
 
@@ -97,57 +116,310 @@ class StrategyConfig:
     MAX_CONCURRENT_POSITIONS = 3       # Maximum number of symbols to trade simultaneously
 
 
+# EMA smoothing factors derived from StrategyConfig (call reload_alphas() after changing MACD periods)
+# Kept as np.float64 so the JIT kernels see a typed scalar, with 1 - alpha precomputed
+ALPHA_FAST = np.float64(2.0 / (StrategyConfig.MACD_FAST + 1))
+ALPHA_SLOW = np.float64(2.0 / (StrategyConfig.MACD_SLOW + 1))
+ALPHA_SIGNAL = np.float64(2.0 / (StrategyConfig.MACD_SIGNAL + 1))
+ONE_MINUS_ALPHA_FAST = 1.0 - ALPHA_FAST
+ONE_MINUS_ALPHA_SLOW = 1.0 - ALPHA_SLOW
+ONE_MINUS_ALPHA_SIGNAL = 1.0 - ALPHA_SIGNAL
+
+
+def reload_alphas():
+    """Recompute the cached EMA smoothing factors from StrategyConfig"""
+    global ALPHA_FAST, ALPHA_SLOW, ALPHA_SIGNAL
+    global ONE_MINUS_ALPHA_FAST, ONE_MINUS_ALPHA_SLOW, ONE_MINUS_ALPHA_SIGNAL
+    ALPHA_FAST = np.float64(2.0 / (StrategyConfig.MACD_FAST + 1))
+    ALPHA_SLOW = np.float64(2.0 / (StrategyConfig.MACD_SLOW + 1))
+    ALPHA_SIGNAL = np.float64(2.0 / (StrategyConfig.MACD_SIGNAL + 1))
+    ONE_MINUS_ALPHA_FAST = 1.0 - ALPHA_FAST
+    ONE_MINUS_ALPHA_SLOW = 1.0 - ALPHA_SLOW
+    ONE_MINUS_ALPHA_SIGNAL = 1.0 - ALPHA_SIGNAL
+
+
+# ==================== BAR DATA ====================
+
+class BarsSoA:
+    """
+    Struct-of-arrays bar container - one float64 ndarray per field instead of a list of dicts
+    
+    Supports len() and slicing like a list of bars, so bars[-N:] returns a
+    BarsSoA of views (no copy). Indexing a single bar returns a bar dictionary.
+    'times' holds epoch seconds (int64) or None when bars carry no datetimes.
+    """
+    __slots__ = ('opens', 'highs', 'lows', 'closes', 'volumes', 'times')
+    
+    def __init__(self, opens, highs, lows, closes, volumes, times=None):
+        self.opens = opens
+        self.highs = highs
+        self.lows = lows
+        self.closes = closes
+        self.volumes = volumes
+        self.times = times
+    
+    @classmethod
+    def from_records(cls, bars):
+        """
+        Build a BarsSoA from a list of bar dictionaries
+        
+        Parameters:
+        - bars: List of bar dictionaries with 'open', 'high', 'low', 'close', 'volume' (and optional 'date')
+        
+        Returns: BarsSoA
+        """
+        n = len(bars)
+        opens = np.empty(n, dtype=np.float64)
+        highs = np.empty(n, dtype=np.float64)
+        lows = np.empty(n, dtype=np.float64)
+        closes = np.empty(n, dtype=np.float64)
+        volumes = np.empty(n, dtype=np.float64)
+        
+        for i, bar in enumerate(bars):
+            opens[i] = bar['open']
+            highs[i] = bar['high']
+            lows[i] = bar['low']
+            closes[i] = bar['close']
+            volumes[i] = bar['volume']
+        
+        times = None
+        if n > 0 and all(hasattr(bar.get('date'), 'timestamp') for bar in bars):
+            times = np.fromiter((int(bar['date'].timestamp()) for bar in bars), dtype=np.int64, count=n)
+        
+        return cls(opens, highs, lows, closes, volumes, times)
+    
+    def __len__(self):
+        return self.closes.shape[0]
+    
+    def tail(self, n):
+        """Newest min(n, len) bars as a BarsSoA of views (no copy)"""
+        return self[-n:] if n < len(self) else self
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return BarsSoA(self.opens[key], self.highs[key], self.lows[key], self.closes[key], self.volumes[key],
+                           None if self.times is None else self.times[key])
+        
+        bar = {
+            'open': self.opens[key],
+            'high': self.highs[key],
+            'low': self.lows[key],
+            'close': self.closes[key],
+            'volume': self.volumes[key],
+        }
+        if self.times is not None:
+            bar['date'] = self.times[key]
+        return bar
+
+
+def as_soa(bars):
+    """
+    Return bars as a BarsSoA, converting a list of bar dictionaries if needed
+    
+    Parameters:
+    - bars: BarsSoA, RingBufferSoA or list of bar dictionaries
+    
+    Returns: BarsSoA
+    """
+    if isinstance(bars, BarsSoA):
+        return bars
+    if isinstance(bars, RingBufferSoA):
+        return bars.snapshot_last()
+    return BarsSoA.from_records(bars)
+
+
+class RingBufferSoA:
+    """
+    Fixed-capacity rolling bar window stored as preallocated column arrays
+    
+    Each value is written twice (at i and i + capacity) so the last n bars are
+    always one contiguous slice - snapshot_last() returns views with no copy and
+    nothing is allocated per bar. Views are only valid until the slots they
+    cover are overwritten, so take a fresh snapshot on each check.
+    """
+    __slots__ = ('capacity', 'write_index', 'generation', 'has_times',
+                 '_opens', '_highs', '_lows', '_closes', '_volumes', '_times',
+                 'macd_cache', 'vwap_cache')
+    
+    def __init__(self, capacity=None):
+        if capacity is None:
+            capacity = max(StrategyConfig.VWAP_LOOKBACK_BARS, 400)
+        self.capacity = capacity
+        self.write_index = 0  # Total bars pushed since the last clear()
+        self.generation = 0   # Bumped by clear() so (generation, write_index) identifies the contents
+        self.has_times = True
+        self._opens = np.zeros(2 * capacity, dtype=np.float64)
+        self._highs = np.zeros(2 * capacity, dtype=np.float64)
+        self._lows = np.zeros(2 * capacity, dtype=np.float64)
+        self._closes = np.zeros(2 * capacity, dtype=np.float64)
+        self._volumes = np.zeros(2 * capacity, dtype=np.float64)
+        self._times = np.zeros(2 * capacity, dtype=np.int64)
+        self.macd_cache = None  # ((generation, write_index), MACD series) - see get_cached_macd_series
+        self.vwap_cache = None  # ((generation, write_index), VWAP) - see get_cached_vwap
+    
+    def push(self, open_, high, low, close, volume, time=None):
+        """
+        Append one bar, overwriting the oldest once the buffer is full
+        
+        Parameters:
+        - open_, high, low, close, volume: Bar values
+        - time: Bar time as a datetime or epoch seconds (optional)
+        """
+        i = self.write_index % self.capacity
+        j = i + self.capacity
+        self._opens[i] = self._opens[j] = open_
+        self._highs[i] = self._highs[j] = high
+        self._lows[i] = self._lows[j] = low
+        self._closes[i] = self._closes[j] = close
+        self._volumes[i] = self._volumes[j] = volume
+        
+        if time is None:
+            self.has_times = False
+        else:
+            if hasattr(time, 'timestamp'):
+                time = int(time.timestamp())
+            self._times[i] = self._times[j] = time
+        
+        self.write_index += 1
+    
+    def push_bar(self, bar):
+        """Append one bar dictionary with 'open', 'high', 'low', 'close', 'volume' (and optional 'date')"""
+        self.push(bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'], bar.get('date'))
+    
+    def clear(self):
+        """Drop all bars (e.g. at session start)"""
+        self.write_index = 0
+        self.generation += 1
+        self.has_times = True
+    
+    def __len__(self):
+        return min(self.write_index, self.capacity)
+    
+    def snapshot_last(self, n=None):
+        """
+        Get the most recent n bars as a BarsSoA of contiguous views
+        
+        Parameters:
+        - n: Number of bars (default/capped: all bars held)
+        
+        Returns: BarsSoA (oldest first)
+        """
+        size = len(self)
+        if n is None or n > size:
+            n = size
+        
+        # Once wrapped, the window ends in the mirrored half so it never straddles the seam
+        if self.write_index < self.capacity:
+            end = self.write_index
+        else:
+            end = self.write_index % self.capacity + self.capacity
+        start = end - n
+        
+        return BarsSoA(self._opens[start:end], self._highs[start:end], self._lows[start:end],
+                       self._closes[start:end], self._volumes[start:end],
+                       self._times[start:end] if self.has_times else None)
+    
+    def tail(self, n):
+        """Newest min(n, len) bars as a BarsSoA of contiguous views (never wraps, never copies)"""
+        return self.snapshot_last(n)
+
+
 # ==================== INDICATOR CALCULATIONS ====================
 
-def calculate_macd(closes, fast=None, slow=None, signal=None):
+@njit(cache=JIT_CACHE)
+def _ema_numba(values, alpha, one_minus_alpha):
     """
-    Calculate MACD indicator
+    EMA recurrence: ema[i] = values[i] * alpha + ema[i-1] * (1 - alpha), seeded with values[0]
     
     Parameters:
-    - closes: List of closing prices
+    - values: Contiguous float64 array
+    - alpha: Smoothing factor 2 / (period + 1)
+    - one_minus_alpha: 1 - alpha (precomputed, e.g. ONE_MINUS_ALPHA_FAST)
+    
+    Returns: float64 array of EMA values (same length as values)
+    """
+    n = values.shape[0]
+    ema = np.empty(n, dtype=np.float64)
+    ema[0] = values[0]
+    for i in range(1, n):
+        ema[i] = values[i] * alpha + ema[i-1] * one_minus_alpha
+    return ema
+
+
+def calculate_macd_series(closes, fast=None, slow=None, signal=None):
+    """
+    Calculate full MACD series (one EMA pass over all closes)
+    
+    Parameters:
+    - closes: np.ndarray of closing prices - float64 is used as-is (no copy); lists are
+      still accepted but converted
     - fast: Fast EMA period (default from config)
     - slow: Slow EMA period (default from config)
     - signal: Signal line period (default from config)
     
-    Returns: (macd_line, signal_line, histogram) or (None, None, None)
+    Returns: (macd_arr, signal_arr, histogram_arr) as ndarrays or (None, None, None)
     """
-    if fast is None:
-        fast = StrategyConfig.MACD_FAST
+    if DEBUG_CHECKS:
+        assert isinstance(closes, np.ndarray) and closes.dtype == np.float64 and closes.flags.c_contiguous, \
+            "calculate_macd_series expects a contiguous float64 ndarray"
+    
+    alpha_fast = ALPHA_FAST if fast is None else np.float64(2.0 / (fast + 1))
+    alpha_slow = ALPHA_SLOW if slow is None else np.float64(2.0 / (slow + 1))
+    alpha_signal = ALPHA_SIGNAL if signal is None else np.float64(2.0 / (signal + 1))
+    one_minus_fast = ONE_MINUS_ALPHA_FAST if fast is None else 1.0 - alpha_fast
+    one_minus_slow = ONE_MINUS_ALPHA_SLOW if slow is None else 1.0 - alpha_slow
+    one_minus_signal = ONE_MINUS_ALPHA_SIGNAL if signal is None else 1.0 - alpha_signal
+    
     if slow is None:
         slow = StrategyConfig.MACD_SLOW
-    if signal is None:
-        signal = StrategyConfig.MACD_SIGNAL
     
     if len(closes) < slow:
         return None, None, None
     
-    closes_arr = np.array(closes)
+    closes_arr = np.ascontiguousarray(closes, dtype=np.float64)
     
-    # Calculate EMAs
-    ema_fast = np.zeros(len(closes))
-    ema_slow = np.zeros(len(closes))
+    # Calculate EMAs (compiled recurrence)
+    ema_fast = _ema_numba(closes_arr, alpha_fast, one_minus_fast)
+    ema_slow = _ema_numba(closes_arr, alpha_slow, one_minus_slow)
     
-    ema_fast[0] = closes_arr[0]
-    ema_slow[0] = closes_arr[0]
+    macd_line = ema_fast - ema_slow
     
-    alpha_fast = 2 / (fast + 1)
-    alpha_slow = 2 / (slow + 1)
+    # Calculate signal line
+    signal_line = _ema_numba(macd_line, alpha_signal, one_minus_signal)
     
-    for i in range(1, len(closes)):
-        ema_fast[i] = closes_arr[i] * alpha_fast + ema_fast[i-1] * (1 - alpha_fast)
-        ema_slow[i] = closes_arr[i] * alpha_slow + ema_slow[i-1] * (1 - alpha_slow)
+    histogram = macd_line - signal_line
     
-    macd_line = ema_fast - ema_slow
+    return macd_line, signal_line, histogram
+
+
+def calculate_macd(closes, fast=None, slow=None, signal=None, return_prev=False):
+    """
+    Calculate MACD indicator (latest values only)
     
-    # Calculate signal line
-    signal_line = np.zeros(len(macd_line))
-    signal_line[0] = macd_line[0]
-    alpha_signal = 2 / (signal + 1)
+    Parameters:
+    - closes: List of closing prices
+    - fast: Fast EMA period (default from config)
+    - slow: Slow EMA period (default from config)
+    - signal: Signal line period (default from config)
+    - return_prev: Also return the previous bar's histogram from the same pass
     
-    for i in range(1, len(macd_line)):
-        signal_line[i] = macd_line[i] * alpha_signal + signal_line[i-1] * (1 - alpha_signal)
+    Returns: (macd_line, signal_line, histogram) or (None, None, None);
+             with return_prev, (macd_line, signal_line, histogram, histogram_prev) -
+             histogram_prev is None when closes[:-1] alone would be too short for MACD
+    """
+    # Outer boundary: list input is converted here so the series contract stays ndarray-only
+    if not isinstance(closes, np.ndarray):
+        closes = np.asarray(closes, dtype=np.float64)
     
-    histogram = macd_line - signal_line
+    macd_line, signal_line, histogram = calculate_macd_series(closes, fast, slow, signal)
+    
+    if macd_line is None:
+        return (None, None, None, None) if return_prev else (None, None, None)
+    
+    if return_prev:
+        slow_period = StrategyConfig.MACD_SLOW if slow is None else slow
+        histogram_prev = histogram[-2] if len(closes) - 1 >= slow_period else None
+        return macd_line[-1], signal_line[-1], histogram[-1], histogram_prev
     
     return macd_line[-1], signal_line[-1], histogram[-1]
 
@@ -159,137 +431,281 @@ def calculate_vwap(bars):
     Using typical price: (High + Low + Close) / 3
     
     Parameters:
-    - bars: List of bar dictionaries with 'high', 'low', 'close', 'volume'
+    - bars: BarsSoA or list of bar dictionaries with 'high', 'low', 'close', 'volume'
     
     Returns: VWAP value or None
     """
     if len(bars) < 2:
         return None
     
-    total_pv = 0.0
-    total_volume = 0.0
+    bars = as_soa(bars)
     
-    for bar in bars:
-        typical_price = (bar['high'] + bar['low'] + bar['close']) / 3
-        pv = typical_price * bar['volume']
-        total_pv += pv
-        total_volume += bar['volume']
+    volumes = bars.volumes
+    total_volume = volumes.sum()
     
     if total_volume == 0:
         return None
     
-    return total_pv / total_volume
+    typical_prices = (bars.highs + bars.lows + bars.closes) / 3
+    # einsum reduction keeps the sum accurate over a full session of large volumes
+    return float(np.einsum('i,i->', typical_prices, volumes)) / total_volume
+
+
+def get_cached_macd_series(ring):
+    """
+    MACD series for a RingBufferSoA, computed once per new bar
+    
+    Repeated calls within the same bar (entry scan, logging, display) hit the
+    cache; pushing a bar changes write_index and forces a recompute.
+    
+    Parameters:
+    - ring: RingBufferSoA
+    
+    Returns: (macd_arr, signal_arr, histogram_arr) or (None, None, None)
+    """
+    key = (ring.generation, ring.write_index)
+    if ring.macd_cache is None or ring.macd_cache[0] != key:
+        ring.macd_cache = (key, calculate_macd_series(ring.snapshot_last().closes))
+    return ring.macd_cache[1]
+
+
+def get_cached_vwap(ring):
+    """
+    VWAP for a RingBufferSoA, computed once per new bar
+    
+    Parameters:
+    - ring: RingBufferSoA
+    
+    Returns: VWAP value or None
+    """
+    key = (ring.generation, ring.write_index)
+    if ring.vwap_cache is None or ring.vwap_cache[0] != key:
+        ring.vwap_cache = (key, calculate_vwap(ring.snapshot_last()))
+    return ring.vwap_cache[1]
+
+
+@dataclass
+class VWAPState:
+    """Running session VWAP sums, updated once per completed bar (live trading)"""
+    cum_pv: float = 0.0
+    cum_pv_comp: float = 0.0  # Kahan compensation term for cum_pv
+    cum_volume: float = 0.0
+    bar_count: int = 0
+    session_date: object = None
+    in_session: bool = False
+    
+    def reset(self, session_date=None, in_session=False):
+        self.cum_pv = 0.0
+        self.cum_pv_comp = 0.0
+        self.cum_volume = 0.0
+        self.bar_count = 0
+        self.session_date = session_date
+        self.in_session = in_session
+
+
+def update_vwap_state(state, high, low, close, volume, bar_time):
+    """
+    Fold one completed bar into the running VWAP - O(1) per bar
+    
+    Sums reset on a new trading day and again when the first regular-hours
+    bar (9:30 AM) arrives, so the result matches calculate_vwap over the session.
+    
+    Parameters:
+    - state: VWAPState for this symbol (modified in place)
+    - high, low, close, volume: Bar values
+    - bar_time: Bar start time (datetime in exchange time)
+    
+    Returns: VWAP value or None (same rules as calculate_vwap)
+    """
+    in_session = (bar_time.hour, bar_time.minute) >= (StrategyConfig.MARKET_OPEN_HOUR, StrategyConfig.MARKET_OPEN_MINUTE)
+    
+    if bar_time.date() != state.session_date or (in_session and not state.in_session):
+        state.reset(bar_time.date(), in_session)
+    
+    # Kahan-compensated running sum - no drift over a full session of million-share bars
+    term = (high + low + close) / 3 * volume - state.cum_pv_comp
+    total = state.cum_pv + term
+    state.cum_pv_comp = (total - state.cum_pv) - term
+    state.cum_pv = total
+    state.cum_volume += volume
+    state.bar_count += 1
+    
+    return get_vwap_from_state(state)
+
+
+def get_vwap_from_state(state):
+    """
+    Read the current VWAP from a VWAPState
+    
+    Parameters:
+    - state: VWAPState
+    
+    Returns: VWAP value or None
+    """
+    if state.bar_count < 2 or state.cum_volume == 0:
+        return None
+    return state.cum_pv / state.cum_volume
 
 
 # ==================== ENTRY CONDITIONS ====================
 
-def check_macd_positive(bars):
+def check_macd_positive(bars, macd_series=None):
     """
     Check if MACD is positive and increasing (strong momentum for breakout)
     
     Parameters:
-    - bars: List of bar dictionaries with 'close' key
+    - bars: BarsSoA or list of bar dictionaries with 'close' key
+    - macd_series: Optional precomputed (macd_arr, signal_arr, histogram_arr) for these bars
     
     Returns: (bool, str) - (condition_met, message)
     """
     if len(bars) < StrategyConfig.MIN_BARS_FOR_PATTERN + 2:
         return False, "Not enough data"
     
-    closes = [bar['close'] for bar in bars]
-    
-    # Calculate current MACD
-    macd, signal, histogram = calculate_macd(closes)
+    # Calculate MACD series once - the previous bar's values are the second-to-last entries
+    if macd_series is None:
+        macd_series = calculate_macd_series(as_soa(bars).closes)
+    macd_arr, signal_arr, hist_arr = macd_series
     
-    if macd is None:
+    if macd_arr is None:
         return False, "MACD calculation failed"
     
+    macd, signal, histogram = macd_arr[-1], signal_arr[-1], hist_arr[-1]
+    
+    # Previous histogram needs a full slow-EMA window of its own
+    histogram_prev = hist_arr[-2] if len(bars) - 1 >= StrategyConfig.MACD_SLOW else None
+    
     # MACD must be above signal line
     if macd <= signal:
-        return False, f"MACD negative: {macd:.4f} <= {signal:.4f}"
+        return False, _message("MACD negative: {:.4f} <= {:.4f}", macd, signal)
     
     # Check histogram is positive and increasing (momentum building)
-    closes_prev = closes[:-1]
-    macd_prev, signal_prev, histogram_prev = calculate_macd(closes_prev)
-    
     if histogram_prev is None or histogram <= histogram_prev:
-        return False, f"MACD not accelerating: current={histogram:.4f}, prev={histogram_prev:.4f if histogram_prev else 'N/A'}"
+        if histogram_prev is None:
+            return False, _message("MACD not accelerating: current={:.4f}, prev=N/A", histogram)
+        return False, _message("MACD not accelerating: current={:.4f}, prev={:.4f}", histogram, histogram_prev)
     
-    return True, f"MACD positive & accelerating: {macd:.4f} > {signal:.4f}, histogram {histogram_prev:.4f}→{histogram:.4f}"
+    return True, _message("MACD positive & accelerating: {:.4f} > {:.4f}, histogram {:.4f}→{:.4f}", macd, signal, histogram_prev, histogram)
 
 
-def detect_breakout_pattern(bars):
+# Breakout kernel result codes
+BREAKOUT_OK = 0
+BREAKOUT_INSUFFICIENT_DATA = 1
+BREAKOUT_SHORT_CONSOLIDATION = 2
+BREAKOUT_RANGE_TOO_WIDE = 3
+BREAKOUT_NO_BREAKOUT = 4
+BREAKOUT_TOO_WEAK = 5
+BREAKOUT_NOT_GREEN = 6
+BREAKOUT_RETREATED = 7
+
+
+@njit(cache=JIT_CACHE)  # No fastmath: the percentage thresholds need strict IEEE division
+def _detect_breakout_numba(highs, lows, closes, opens, lookback, momentum_bars, consolidation_lookback,
+                           min_consolidation_bars, max_range_pct, min_breakout_pct):
     """
-    Detect breakout pattern:
-    1. Find consolidation range (tight price action for 5+ bars)
-    2. Verify consolidation range is small (< 3%)
-    3. Detect breakout: price breaking above consolidation high
-    4. Breakout must be recent (within last 3 bars)
-    5. Breakout bar should be strong (green candle, good volume)
+    Breakout pattern scan over the last `lookback` bars (numeric core of detect_breakout_pattern)
     
     Parameters:
-    - bars: List of bar dictionaries with 'high', 'low', 'close', 'open', 'volume'
+    - highs, lows, closes, opens: Bar columns (oldest first)
+    - lookback, momentum_bars, consolidation_lookback, min_consolidation_bars,
+      max_range_pct, min_breakout_pct: StrategyConfig values
     
-    Returns: (bool, str, float, float) - (pattern_found, message, consolidation_low, consolidation_high)
+    Returns: (code, consolidation_low, consolidation_high, consolidation_range_pct, breakout_high, breakout_pct)
     """
-    if len(bars) < StrategyConfig.MIN_BARS_FOR_PATTERN:
-        return False, "Not enough bars", None, None
-    
-    # Look at recent bars
-    recent = bars[-StrategyConfig.PATTERN_LOOKBACK_BARS:] if len(bars) >= StrategyConfig.PATTERN_LOOKBACK_BARS else bars
+    n = highs.shape[0]
+    window = min(n, lookback)
+    base = n - window
     
-    if len(recent) < 8:
-        return False, "Insufficient data", None, None
+    if window < 8:
+        return BREAKOUT_INSUFFICIENT_DATA, 0.0, 0.0, 0.0, 0.0, 0.0
     
-    # STEP 1: Find consolidation range (looking back, excluding last 3 bars for breakout check)
-    consolidation_end_idx = len(recent) - StrategyConfig.BREAKOUT_MOMENTUM_BARS
-    consolidation_start_idx = max(0, consolidation_end_idx - StrategyConfig.CONSOLIDATION_LOOKBACK)
-    
-    if consolidation_end_idx - consolidation_start_idx < StrategyConfig.MIN_CONSOLIDATION_BARS:
-        return False, "Not enough bars for consolidation", None, None
+    # Consolidation range (excluding the momentum bars at the end)
+    end = window - momentum_bars
+    start = max(0, end - consolidation_lookback)
     
-    consolidation_bars = recent[consolidation_start_idx:consolidation_end_idx]
+    if end - start < min_consolidation_bars:
+        return BREAKOUT_SHORT_CONSOLIDATION, 0.0, 0.0, 0.0, 0.0, 0.0
     
-    if len(consolidation_bars) < StrategyConfig.MIN_CONSOLIDATION_BARS:
-        return False, "Insufficient consolidation period", None, None
+    cons_high = highs[base + start:base + end].max()
+    cons_low = lows[base + start:base + end].min()
     
-    # Find consolidation range
-    consolidation_high = max([bar['high'] for bar in consolidation_bars])
-    consolidation_low = min([bar['low'] for bar in consolidation_bars])
-    consolidation_range_pct = ((consolidation_high - consolidation_low) / consolidation_low) * 100
+    range_pct = ((cons_high - cons_low) / cons_low) * 100
+    if range_pct > max_range_pct:
+        return BREAKOUT_RANGE_TOO_WIDE, cons_low, cons_high, range_pct, 0.0, 0.0
     
-    # STEP 2: Verify consolidation is tight (< 3% range)
-    if consolidation_range_pct > StrategyConfig.MAX_CONSOLIDATION_RANGE_PCT:
-        return False, f"Consolidation too wide: {consolidation_range_pct:.2f}% (need < {StrategyConfig.MAX_CONSOLIDATION_RANGE_PCT}%)", None, None
+    # Breakout over the momentum bars
+    breakout_high = highs[max(base, n - momentum_bars):n].max()
     
-    # STEP 3: Check for breakout in last 3 bars
-    breakout_bars = recent[-StrategyConfig.BREAKOUT_MOMENTUM_BARS:]
-    breakout_high = max([bar['high'] for bar in breakout_bars])
+    if breakout_high <= cons_high:
+        return BREAKOUT_NO_BREAKOUT, cons_low, cons_high, range_pct, breakout_high, 0.0
     
-    # Must break above consolidation high
-    if breakout_high <= consolidation_high:
-        return False, f"No breakout: high ${breakout_high:.2f} <= consolidation ${consolidation_high:.2f}", None, None
+    breakout_pct = ((breakout_high - cons_high) / cons_high) * 100
+    if breakout_pct < min_breakout_pct:
+        return BREAKOUT_TOO_WEAK, cons_low, cons_high, range_pct, breakout_high, breakout_pct
     
-    # Calculate breakout percentage
-    breakout_pct = ((breakout_high - consolidation_high) / consolidation_high) * 100
+    # Last bar must be green and still near the breakout
+    if closes[n - 1] <= opens[n - 1]:
+        return BREAKOUT_NOT_GREEN, cons_low, cons_high, range_pct, breakout_high, breakout_pct
     
-    if breakout_pct < StrategyConfig.MIN_BREAKOUT_PCT:
-        return False, f"Breakout too weak: {breakout_pct:.2f}% (need {StrategyConfig.MIN_BREAKOUT_PCT}%+)", None, None
+    if highs[n - 1] < cons_high * 1.005:
+        return BREAKOUT_RETREATED, cons_low, cons_high, range_pct, breakout_high, breakout_pct
     
-    # STEP 4: Verify last bar is strong (making the breakout)
-    last_bar = recent[-1]
+    return BREAKOUT_OK, cons_low, cons_high, range_pct, breakout_high, breakout_pct
+
+
+def detect_breakout_pattern(bars):
+    """
+    Detect breakout pattern:
+    1. Find consolidation range (tight price action for 5+ bars)
+    2. Verify consolidation range is small (< 3%)
+    3. Detect breakout: price breaking above consolidation high
+    4. Breakout must be recent (within last 3 bars)
+    5. Breakout bar should be strong (green candle, good volume)
     
-    # Must be green candle
-    if last_bar['close'] <= last_bar['open']:
-        return False, "Last bar not green (weak momentum)", None, None
+    Parameters:
+    - bars: BarsSoA or list of bar dictionaries with 'high', 'low', 'close', 'open', 'volume'
     
-    # Last bar should be near the breakout high
-    if last_bar['high'] < consolidation_high * 1.005:  # Within 0.5% of breakout
-        return False, "Current bar retreated from breakout", None, None
+    Returns: (bool, str, float, float) - (pattern_found, message, consolidation_low, consolidation_high)
+    """
+    # Bind config once (class attribute lookups are slower than locals)
+    lookback = StrategyConfig.PATTERN_LOOKBACK_BARS
+    max_range_pct = StrategyConfig.MAX_CONSOLIDATION_RANGE_PCT
+    min_breakout_pct = StrategyConfig.MIN_BREAKOUT_PCT
     
-    # Pattern confirmed!
-    message = f"Breakout: consolidated ${consolidation_low:.2f}-${consolidation_high:.2f} ({consolidation_range_pct:.1f}% range), broke out +{breakout_pct:.1f}% to ${breakout_high:.2f}"
+    if len(bars) < StrategyConfig.MIN_BARS_FOR_PATTERN:
+        return False, "Not enough bars", None, None
     
-    return True, message, consolidation_low, consolidation_high
+    # Look at recent bars (zero-copy view)
+    recent = as_soa(bars).tail(lookback)
+    
+    code, consolidation_low, consolidation_high, consolidation_range_pct, breakout_high, breakout_pct = _detect_breakout_numba(
+        recent.highs, recent.lows, recent.closes, recent.opens,
+        lookback, StrategyConfig.BREAKOUT_MOMENTUM_BARS,
+        StrategyConfig.CONSOLIDATION_LOOKBACK, StrategyConfig.MIN_CONSOLIDATION_BARS,
+        max_range_pct, min_breakout_pct
+    )
+    
+    if code == BREAKOUT_OK:
+        # Hand back Python floats - stop/target prices are derived from these in double precision
+        consolidation_low = float(consolidation_low)
+        consolidation_high = float(consolidation_high)
+        message = _message("Breakout: consolidated ${:.2f}-${:.2f} ({:.1f}% range), broke out +{:.1f}% to ${:.2f}",
+                           consolidation_low, consolidation_high, consolidation_range_pct, breakout_pct, breakout_high)
+        return True, message, consolidation_low, consolidation_high
+    
+    if code == BREAKOUT_INSUFFICIENT_DATA:
+        return False, "Insufficient data", None, None
+    if code == BREAKOUT_SHORT_CONSOLIDATION:
+        return False, "Not enough bars for consolidation", None, None
+    if code == BREAKOUT_RANGE_TOO_WIDE:
+        return False, _message("Consolidation too wide: {:.2f}% (need < {}%)", consolidation_range_pct, max_range_pct), None, None
+    if code == BREAKOUT_NO_BREAKOUT:
+        return False, _message("No breakout: high ${:.2f} <= consolidation ${:.2f}", breakout_high, consolidation_high), None, None
+    if code == BREAKOUT_TOO_WEAK:
+        return False, _message("Breakout too weak: {:.2f}% (need {}%+)", breakout_pct, min_breakout_pct), None, None
+    if code == BREAKOUT_NOT_GREEN:
+        return False, "Last bar not green (weak momentum)", None, None
+    return False, "Current bar retreated from breakout", None, None
 
 
 def check_volume_conditions(bars):
@@ -299,91 +715,123 @@ def check_volume_conditions(bars):
     2. Volume spike on breakout bar (2.5x+ average) - confirms breakout
     
     Parameters:
-    - bars: List of bar dictionaries with 'volume'
+    - bars: BarsSoA or list of bar dictionaries with 'volume'
     
     Returns: (bool, str) - (condition_met, message)
     """
+    # Bind config once (class attribute lookups are slower than locals)
+    min_relative_volume = StrategyConfig.MIN_RELATIVE_VOLUME
+    volume_spike = StrategyConfig.BREAKOUT_VOLUME_SPIKE
+    
     if len(bars) < 5:
         return False, "Not enough bars for volume analysis"
     
-    recent = bars[-StrategyConfig.VOLUME_LOOKBACK_BARS:] if len(bars) >= StrategyConfig.VOLUME_LOOKBACK_BARS else bars
+    recent = as_soa(bars).tail(StrategyConfig.VOLUME_LOOKBACK_BARS).volumes
     
     if len(recent) < 3:
         return False, "Not enough bars for volume analysis"
     
-    last_bar = recent[-1]
+    last_volume = recent[-1]
     
     # Calculate average volume of previous bars (excluding last bar)
-    history_bars = recent[:-1]
-    if len(history_bars) == 0:
+    history_volumes = recent[:-1]
+    if len(history_volumes) == 0:
         return False, "Not enough historical bars for volume analysis"
     
-    avg_volume = sum([bar['volume'] for bar in history_bars]) / len(history_bars)
+    avg_volume = history_volumes.mean()
     
     # Calculate relative volume of last bar
-    relative_volume = last_bar['volume'] / avg_volume if avg_volume > 0 else 0
+    relative_volume = last_volume / avg_volume if avg_volume > 0 else 0
     
     # REQUIREMENT 1: High relative volume on breakout
-    if relative_volume < StrategyConfig.MIN_RELATIVE_VOLUME:
-        return False, f"Low breakout volume: {relative_volume:.2f}x avg (need {StrategyConfig.MIN_RELATIVE_VOLUME}x+)"
+    if relative_volume < min_relative_volume:
+        return False, _message("Low breakout volume: {:.2f}x avg (need {}x+)", relative_volume, min_relative_volume)
     
     # REQUIREMENT 2: Volume spike on breakout bar (even higher requirement)
-    if relative_volume < StrategyConfig.BREAKOUT_VOLUME_SPIKE:
-        return False, f"No volume spike: {relative_volume:.2f}x avg (need {StrategyConfig.BREAKOUT_VOLUME_SPIKE}x+ for strong breakout)"
+    if relative_volume < volume_spike:
+        return False, _message("No volume spike: {:.2f}x avg (need {}x+ for strong breakout)", relative_volume, volume_spike)
     
-    return True, f"Strong breakout volume: {relative_volume:.2f}x avg (last: {last_bar['volume']:.0f} vs avg: {avg_volume:.0f})"
+    return True, _message("Strong breakout volume: {:.2f}x avg (last: {:.0f} vs avg: {:.0f})", relative_volume, last_volume, avg_volume)
 
 
-def check_above_vwap(bars, current_price):
+def check_above_vwap(bars, current_price, vwap=None):
     """
     Check if current price is above VWAP
     Only take long trades when above VWAP
     
     Parameters:
-    - bars: List of bar dictionaries for VWAP calculation
+    - bars: BarsSoA or list of bar dictionaries for VWAP calculation
     - current_price: Current price to compare
+    - vwap: Optional precomputed VWAP (e.g. from a VWAPState) - skips recalculation
     
     Returns: (bool, str) - (condition_met, message)
     """
-    vwap = calculate_vwap(bars)
+    if vwap is None:
+        vwap = calculate_vwap(bars)
     
     if vwap is None:
         return False, "VWAP calculation failed"
     
     if current_price <= vwap:
-        return False, f"Price below VWAP: ${current_price:.4f} <= ${vwap:.4f} (no long entry)"
+        return False, _message("Price below VWAP: ${:.4f} <= ${:.4f} (no long entry)", current_price, vwap)
     
     pct_above = ((current_price - vwap) / vwap) * 100
-    return True, f"Price above VWAP: ${current_price:.4f} > ${vwap:.4f} (+{pct_above:.2f}%)"
+    return True, _message("Price above VWAP: ${:.4f} > ${:.4f} (+{:.2f}%)", current_price, vwap, pct_above)
 
 
-def check_all_entry_conditions(bars_1m, current_price):
+def check_all_entry_conditions(bars_1m, current_price, vwap=None):
     """
     Check ALL entry conditions at once
     
     Parameters:
-    - bars_1m: List of 1-minute bars for pattern/MACD/volume/VWAP
+    - bars_1m: RingBufferSoA, BarsSoA or list of bar dictionaries of 1-minute bars for pattern/MACD/volume/VWAP
     - current_price: Current price
+    - vwap: Optional precomputed session VWAP (e.g. from get_vwap_from_state)
     
     Returns: (bool, dict, float, float) - (all_conditions_met, condition_results, consolidation_low, consolidation_high)
     """
-    # Check each condition
-    pattern_ok, pattern_msg, consolidation_low, consolidation_high = detect_breakout_pattern(bars_1m)
-    macd_ok, macd_msg = check_macd_positive(bars_1m)
-    volume_ok, volume_msg = check_volume_conditions(bars_1m)
-    vwap_ok, vwap_msg = check_above_vwap(bars_1m, current_price)
+    # Ring buffers get their MACD/VWAP from the per-bar cache
+    ring = bars_1m if isinstance(bars_1m, RingBufferSoA) else None
+    
+    # Convert once so every check works on the same column arrays
+    bars_1m = as_soa(bars_1m)
     
-    # Compile results
+    # Checks run cheapest / most-rejective first and stop at the first failure;
+    # conditions that were never evaluated are reported as skipped
+    skipped = {'ok': False, 'msg': "Skipped (earlier condition failed)"}
     results = {
-        'pattern': {'ok': pattern_ok, 'msg': pattern_msg},
-        'macd': {'ok': macd_ok, 'msg': macd_msg},
-        'volume': {'ok': volume_ok, 'msg': volume_msg},
-        'vwap': {'ok': vwap_ok, 'msg': vwap_msg}
+        'pattern': skipped,
+        'macd': skipped,
+        'volume': skipped,
+        'vwap': skipped
     }
     
-    all_ok = pattern_ok and macd_ok and volume_ok and vwap_ok
+    # 1. VWAP - scalar compare once VWAP is known
+    if vwap is None:
+        vwap = calculate_vwap(bars_1m) if ring is None else get_cached_vwap(ring)
+    vwap_ok, vwap_msg = check_above_vwap(bars_1m, current_price, vwap=vwap)
+    results['vwap'] = {'ok': vwap_ok, 'msg': str(vwap_msg)}
+    if not vwap_ok:
+        return False, results, None, None
+    
+    # 2. Volume - one mean and ratio
+    volume_ok, volume_msg = check_volume_conditions(bars_1m)
+    results['volume'] = {'ok': volume_ok, 'msg': str(volume_msg)}
+    if not volume_ok:
+        return False, results, None, None
+    
+    # 3. MACD - EMA passes
+    macd_series = get_cached_macd_series(ring) if ring is not None else None
+    macd_ok, macd_msg = check_macd_positive(bars_1m, macd_series=macd_series)
+    results['macd'] = {'ok': macd_ok, 'msg': str(macd_msg)}
+    if not macd_ok:
+        return False, results, None, None
+    
+    # 4. Breakout pattern
+    pattern_ok, pattern_msg, consolidation_low, consolidation_high = detect_breakout_pattern(bars_1m)
+    results['pattern'] = {'ok': pattern_ok, 'msg': str(pattern_msg)}
     
-    return all_ok, results, consolidation_low, consolidation_high
+    return pattern_ok, results, consolidation_low, consolidation_high
 
 
 # ==================== EXIT CONDITIONS ====================
@@ -406,10 +854,10 @@ def check_dynamic_exit(bars):
     
     # Check if latest bar is red (momentum loss)
     if latest_bar['close'] < latest_bar['open']:
-        message = f"Red candle detected (momentum loss): open ${latest_bar['open']:.2f} > close ${latest_bar['close']:.2f}"
+        message = _message("Red candle detected (momentum loss): open ${:.2f} > close ${:.2f}", latest_bar['open'], latest_bar['close'])
         return True, message
     
-    return False, f"No exit signal: green candle (open ${latest_bar['open']:.2f} < close ${latest_bar['close']:.2f})"
+    return False, _message("No exit signal: green candle (open ${:.2f} < close ${:.2f})", latest_bar['open'], latest_bar['close'])
 
 
 def check_stop_loss_hit(current_bar, stop_price):
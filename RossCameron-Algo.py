@@ -42,21 +42,35 @@ from ibapi.contract import Contract
 from ibapi.order import Order
 from ibapi.order_state import OrderState
 from ibapi.wrapper import *
+import copy
+import itertools
 import time
 import threading
+from collections import deque
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 import numpy as np
 import os
+import sys
 import importlib.util
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 # Import shared strategy logic (handle hyphen in filename)
 _strategy_path = os.path.join(os.path.dirname(__file__), 'RossCameron-Strategy.py')
 _spec = importlib.util.spec_from_file_location("strategy", _strategy_path)
 strategy = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = strategy  # lets numba's kernel cache re-import the module by name
 _spec.loader.exec_module(strategy)
 
 # Import strategy components
 StrategyConfig = strategy.StrategyConfig
+BarsSoA = strategy.BarsSoA
+MACDState = strategy.MACDState
+update_macd_state = strategy.update_macd_state
 check_all_entry_conditions = strategy.check_all_entry_conditions
 check_dynamic_exit = strategy.check_dynamic_exit
 check_stop_loss_hit = strategy.check_stop_loss_hit
@@ -65,223 +79,624 @@ check_end_of_day = strategy.check_end_of_day
 calculate_position_size = strategy.calculate_position_size
 calculate_entry_exit_prices = strategy.calculate_entry_exit_prices
 
+# ==================== LOGGING ====================
+
+class _BlockingQueueHandler(QueueHandler):
+    """QueueHandler that waits for room when the queue is full - order/fill logs are audit records, never dropped"""
+    def enqueue(self, record):
+        self.queue.put(record)
+
+# IBKR callbacks run on the API reader thread - they only enqueue log records and a
+# listener thread does the (blocking) terminal writes. Started/stopped in __main__.
+# The queue bound is backpressure only: a caller waits if the listener falls 10,000 records behind.
+log = logging.getLogger("RossCameron-Algo")
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = queue.Queue(maxsize=10000)
+log.addHandler(_BlockingQueueHandler(_log_queue))
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(logging.Formatter("%(message)s"))
+log_listener = QueueListener(_log_queue, _log_stream)
+
+# ==================== DISPLAY ====================
+
+# Clear the screen with an ANSI escape when stdout is a terminal instead of spawning a shell per refresh
+USE_ANSI = sys.stdout.isatty()
+if USE_ANSI and os.name == 'nt':
+    os.system('')  # enables VT escape processing in the Windows console (once, at startup)
+
+
+_clock_cache = [0, ""]  # [epoch second, formatted HH:MM:SS] shared by every banner timestamp
+
+
+def hhmmss():
+    """Local wall-clock time as HH:MM:SS - formatted at most once per second"""
+    now = int(time.time())
+    cache = _clock_cache
+    if now != cache[0]:
+        cache[1] = time.strftime('%H:%M:%S', time.localtime(now))
+        cache[0] = now
+    return cache[1]
+
+
+# Results table layout - parsed once here, filled per row with format_map
+ROW_FMT = "{symbol:<8} {price:<10} {pattern:<10} {macd:<8} {volume:<10} {vwap:<8} {vwap_value:<10} {status:<20}"
+HEADER_ROW = ROW_FMT.format(symbol='Symbol', price='Price', pattern='Pattern', macd='MACD', volume='Volume',
+                            vwap='VWAP', vwap_value='VWAP $', status='Status')
+TABLE_RULE = '-' * 90
+
+
+def clear_screen(text=""):
+    """Clear the terminal, move the cursor home and write text - a single write on a TTY (cls/clear otherwise)"""
+    if USE_ANSI:
+        sys.stdout.write("\x1b[2J\x1b[H" + text)
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
+        sys.stdout.write(text)
+    sys.stdout.flush()
+
+# Exchange time zone (fixed UTC-5, shared by every clock check)
+EST = timezone(timedelta(hours=-5))
+
+# Unfilled entry orders are cancelled after this many seconds
+PENDING_ENTRY_TIMEOUT = 300
+
+# Length of one StrategyConfig.BAR_SIZE_10SEC bar - 10-sec history is re-requested at most this often
+BAR_10SEC_SECONDS = 10
+
 # PAPER trading port
 port = 7497
 clientId = 3  # different from Order-LOBO.py (changed from 2 to avoid conflict)
 
+@lru_cache(maxsize=64)
+def _day_start_epoch(year, month, day):
+    """Epoch seconds of midnight EST for a calendar day"""
+    return int(datetime(year, month, day, tzinfo=EST).timestamp())
+
+
+@lru_cache(maxsize=8)
+def session_epochs(year, month, day):
+    """
+    VWAP session boundaries for one EST trading day, computed once per day
+    
+    Returns: (premarket_reset_epoch, market_open_epoch, next_day_epoch) - epoch seconds
+    """
+    day_start = _day_start_epoch(year, month, day)
+    premarket_reset = day_start + StrategyConfig.VWAP_PREMARKET_RESET_HOUR * 3600 + StrategyConfig.VWAP_PREMARKET_RESET_MINUTE * 60
+    market_open = day_start + StrategyConfig.MARKET_OPEN_HOUR * 3600 + StrategyConfig.MARKET_OPEN_MINUTE * 60
+    return premarket_reset, market_open, day_start + 86400  # EST is a fixed offset - days are 86400 s
+
+
+def _parse_ib_date(date):
+    """
+    Convert an IBKR bar date to epoch seconds without strptime
+    
+    IBKR returns "20231201 09:30:00" or "20231201  09:30:00" (US/Eastern), optionally
+    followed by a time zone name - fixed-width fields, so slice and int() them.
+    
+    Parameters:
+    - date: bar.date string (a datetime is also accepted)
+    
+    Returns: int - epoch seconds
+    """
+    if isinstance(date, datetime):
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=EST)
+        return int(date.timestamp())
+    
+    try:
+        s = date.strip()
+        clock = s[8:].lstrip()
+        if s[8] != ' ' or clock[2] != ':' or clock[5] != ':':
+            raise ValueError(date)
+        return (_day_start_epoch(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+                + int(clock[0:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:8]))
+    except (ValueError, IndexError):
+        # Fallback: unknown format - stamp with the receive time
+        return int(time.time())
+
+
+def make_contract(symbol):
+    """US stock contract routed through SMART - built once per symbol at startup"""
+    contract = Contract()
+    contract.symbol = symbol
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+    return contract
+
+
+def _order_template(action, order_type, tif, outside_rth=False, oca_type=0):
+    """Order with every field that never changes between trades already set"""
+    order = Order()
+    order.action = action
+    order.orderType = order_type
+    order.tif = tif
+    order.transmit = True
+    order.outsideRth = outside_rth
+    order.ocaType = oca_type
+    order.eTradeOnly = False
+    order.firmQuoteOnly = False
+    return order
+
+
+# Order templates - each trade copies one and fills in only quantity, price, ID and OCA group
+ENTRY_LMT_TEMPLATE = _order_template("BUY", "LMT", "DAY", outside_rth=True)  # entry allowed pre-market/after-hours
+PROFIT_LMT_TEMPLATE = _order_template("SELL", "LMT", "GTC", oca_type=1)  # ocaType 1: cancel the rest of the group on fill
+STOP_STP_TEMPLATE = _order_template("SELL", "STP", "GTC", oca_type=1)
+EXIT_LMT_TEMPLATE = _order_template("SELL", "LMT", "DAY", outside_rth=True)  # pre-market exits at the bid
+EXIT_MKT_TEMPLATE = _order_template("SELL", "MKT", "DAY")
+
+
+def order_from(template, order_id, qty, **fields):
+    """
+    Copy of a template order for one trade
+    
+    The copy is shallow - template list fields (conditions, algoParams) are shared
+    and must never be mutated.
+    
+    Parameters:
+    - template: one of the *_TEMPLATE orders above
+    - order_id: IB order ID
+    - qty: number of shares
+    - fields: per-trade attributes (lmtPrice, auxPrice, ocaGroup, transmit)
+    
+    Returns: Order ready for placeOrder
+    """
+    order = copy.copy(template)
+    order.orderId = order_id
+    order.totalQuantity = qty
+    for name, value in fields.items():
+        setattr(order, name, value)
+    return order
+
+
+class BarBuffer:
+    """
+    Per-symbol bar storage as preallocated column arrays with a write index
+    
+    historicalData writes each bar straight into its slots (no dict per bar);
+    view() hands the filled part to the strategy as a BarsSoA of views.
+    Capacity doubles if a request returns more bars than expected.
+    """
+    __slots__ = ('n', 'opens', 'highs', 'lows', 'closes', 'volumes', 'times')
+    
+    def __init__(self, capacity=1024):
+        self.n = 0
+        self.opens = np.empty(capacity, dtype=np.float64)
+        self.highs = np.empty(capacity, dtype=np.float64)
+        self.lows = np.empty(capacity, dtype=np.float64)
+        self.closes = np.empty(capacity, dtype=np.float64)
+        self.volumes = np.empty(capacity, dtype=np.float64)
+        self.times = np.empty(capacity, dtype=np.int64)  # epoch seconds
+    
+    def _grow(self):
+        capacity = 2 * self.times.shape[0]
+        for name in self.__slots__[1:]:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+    
+    def append(self, t, open_, high, low, close, volume):
+        """Write one bar into the next slot (t = epoch seconds)"""
+        i = self.n
+        if i == self.times.shape[0]:
+            self._grow()
+        self.times[i] = t
+        self.opens[i] = open_
+        self.highs[i] = high
+        self.lows[i] = low
+        self.closes[i] = close
+        self.volumes[i] = volume
+        self.n = i + 1
+    
+    def clear(self):
+        """Drop all bars, keeping the allocated arrays for the next request"""
+        self.n = 0
+    
+    def __len__(self):
+        return self.n
+    
+    def view(self, start=0, stop=None):
+        """Bars [start:stop] (stop defaults to n) as a BarsSoA of views (no copy)"""
+        n = self.n if stop is None else min(stop, self.n)
+        return BarsSoA(self.opens[start:n], self.highs[start:n], self.lows[start:n],
+                       self.closes[start:n], self.volumes[start:n], self.times[start:n])
+    
+    def index_at(self, epoch):
+        """First bar index with time >= epoch (bars arrive in time order, so binary search)"""
+        return int(np.searchsorted(self.times[:self.n], epoch, side='left'))
+
+
+@dataclass(slots=True)
+class SymbolState:
+    """Per-symbol state (trade, quotes, bars) - one lookup in TradingAlgo.state gives every field"""
+    in_position: bool = False
+    pending_entry: bool = False
+    pending_entry_time: float = 0.0  # time.time() when the entry order was placed
+    premarket_entry: bool = False  # position entered during pre-market
+    position: int = 0  # current position size
+    entry_price: float = 0.0  # actual entry fill price
+    stop_price: float = 0.0  # stop loss price
+    profit_target_price: float = 0.0  # profit target price
+    entry_order_id: int = 0  # 0 = no order
+    profit_order_id: int = 0
+    stop_order_id: int = 0
+    oca_group: str = ""
+    profit_order_active: bool = False  # profit order still working
+    stop_order_active: bool = False  # stop order still working
+    entry_timestamp: datetime | None = None  # entry fill time (for trailing stop)
+    highest_high_since_entry: float | None = None  # highest high reached after entry (for trailing stop)
+    last_price: float | None = None  # latest streamed quotes (None until the first tick)
+    ask_price: float | None = None
+    bid_price: float | None = None  # bid price for selling in pre-market
+    tick_by_tick: bool = False  # tick-by-tick bid/ask is streaming - tickPrice then leaves bid/ask alone
+    bars: BarBuffer = field(default_factory=BarBuffer)  # historical 10-sec bars
+    bars_fetched_at: float = 0.0  # time.monotonic() of the last 10-sec bar request
+    bars_1min: BarBuffer = field(default_factory=BarBuffer)  # 1-min bars for pattern/VWAP
+    vwap_sums: list | None = None  # [reset_epoch, last_bar_epoch, sum_pv, sum_volume] over completed session bars
+    vwap_last_update: float = 0.0  # time.time() of last VWAP update
+    macd_state: MACDState = field(default_factory=MACDState)  # MACD EMAs over completed session bars
+    req_ids: tuple = ()  # (market data reqId, 10-sec bars reqId, 1-min bars reqId, tick-by-tick bid/ask reqId)
+    contract: Contract | None = None  # built once at registration, reused by every request/order
+    
+    @property
+    def needs_stop(self):
+        """Filled pre-market position with no stop order yet - gets brackets once regular hours start"""
+        return self.in_position and self.premarket_entry and not self.stop_order_id
+    
+    def reset_trade(self):
+        """Back to flat with no working orders - quotes, bars, VWAP sums, MACD state, request IDs and contract are kept"""
+        self.in_position = False
+        self.pending_entry = False
+        self.pending_entry_time = 0.0
+        self.premarket_entry = False
+        self.position = 0
+        self.entry_price = 0.0
+        self.stop_price = 0.0
+        self.profit_target_price = 0.0
+        self.entry_order_id = 0
+        self.profit_order_id = 0
+        self.stop_order_id = 0
+        self.oca_group = ""
+        self.profit_order_active = False
+        self.stop_order_active = False
+        self.entry_timestamp = None
+        self.highest_high_since_entry = None
+
+
 class TradingAlgo(EClient, EWrapper):
     def __init__(self):
         EClient.__init__(self, self)
-        self.oid = 0
+        self.oid_counter = itertools.count(1)  # reseeded by nextValidId
         self.account_balance = None
-        self.bars = {}  # dictionary: symbol -> list of historical 10-sec bars
-        self.bars_1min = {}  # dictionary: symbol -> list of 1-min bars for VWAP
-        self.last_price = {}
-        self.ask_price = {}
-        self.bid_price = {}  # bid price for selling in pre-market
-        self.position = {}  # current position size per symbol
-        self.entry_order_id = {}  # entry order ID per symbol
-        self.profit_order_id = {}  # profit taker order ID per symbol
-        self.stop_order_id = {}  # stop loss order ID per symbol
-        self.profit_order_active = {}  # track if profit order is still active
-        self.stop_order_active = {}  # track if stop order is still active
-        self.in_position = {}  # bool per symbol
-        self.pending_entry = {}  # bool per symbol
-        self.pending_entry_time = {}  # timestamp when pending entry was set
-        self.premarket_entry = {}  # track if position entered during pre-market (initialized per symbol)
-        self.entry_price = {}  # track actual entry price per symbol
-        self.stop_price = {}  # track stop loss price per symbol
-        self.profit_target_price = {}  # track profit target price per symbol
-        self.brackets_added_at_open = {}  # track if brackets were added at market open for pre-market positions
-        self.current_symbol = None  # track which symbol is being processed
-        self.current_reqid = None  # track which request ID is being processed
-        self.vwap_cache = {}  # cached VWAP value per symbol
-        self.vwap_last_update = {}  # timestamp of last VWAP update per symbol
-        self.entry_timestamp = {}  # track entry timestamp for each symbol (for trailing stop)
-        self.highest_high_since_entry = {}  # track highest high reached after entry (for trailing stop)
+        self.state = {}  # symbol -> SymbolState (position, prices, order IDs, quotes, bars)
+        self.order_status = {}  # order ID -> last (status, filled) logged - repeated callbacks are not logged again
+        self.order_owner = {}  # order ID -> ('entry' | 'profit' | 'stop', symbol) for O(1) lookup in orderStatus
+        self.order_ack = {}  # order ID -> threading.Event set on its first orderStatus (see place_and_confirm)
+        self.pending_expiry = deque()  # (deadline, symbol, entry order ID) in placement order - see expire_pending_entries
+        self.connected = threading.Event()  # set by nextValidId once TWS has accepted the connection
+        self.account_ready = threading.Event()  # set by accountSummaryEnd
+        self.request_done = {}  # reqId -> threading.Event set by historicalDataEnd / error
+        self.first_tick = {}  # (symbol, tickType) -> threading.Event set once the quote stream delivered that tick
+        self.reqid_route = {}  # reqId -> (symbol, '10s' | '1m' | 'mkt') so callbacks never guess the symbol
+        self.bracket_lock = threading.Lock()  # fill callback and main loop may both try to add a position's brackets
+        self.wake = threading.Event()  # set by order callbacks / stop-target bid ticks so the main loop reacts instead of sleeping
         
     def nextValidId(self, orderId: OrderId):
-        self.oid = orderId
+        self.oid_counter = itertools.count(orderId + 1)
+        self.connected.set()
 
     def nextOid(self):
-        self.oid += 1
-        return self.oid
+        # next() on itertools.count is atomic under the GIL, so concurrent scan
+        # threads still get unique IDs without taking a lock in the exit path
+        return next(self.oid_counter)
+
+    def clear_trade(self, symbol):
+        """Forget a closed position or cancelled entry - drop its order IDs from order_owner and reset the trade fields"""
+        st = self.state[symbol]
+        for order_id in (st.entry_order_id, st.profit_order_id, st.stop_order_id):
+            self.order_owner.pop(order_id, None)
+        st.reset_trade()
+
+    def register_symbol(self, symbol, index):
+        """Give a symbol its contract and its own market data / historical request IDs (index = position in scan list)"""
+        mkt_id, hist_10s_id, hist_1m_id, tbt_id = 10 + index, 4001 + 2 * index, 4002 + 2 * index, 20 + index
+        self.state[symbol] = SymbolState(req_ids=(mkt_id, hist_10s_id, hist_1m_id, tbt_id), contract=make_contract(symbol))
+        self.reqid_route[mkt_id] = (symbol, 'mkt')
+        self.reqid_route[tbt_id] = (symbol, 'tbt')
+        self.reqid_route[hist_10s_id] = (symbol, '10s')
+        self.reqid_route[hist_1m_id] = (symbol, '1m')
+        for tick_type in (1, 2, 4):  # BID, ASK, LAST
+            self.first_tick[(symbol, tick_type)] = threading.Event()
 
     def accountSummary(self, reqId: int, account: str, tag: str, value: str, currency: str):
         if tag == "TotalCashValue":
             self.account_balance = float(value)
-            print(f"Account balance: ${self.account_balance:.2f}")
+            log.info(f"Account balance: ${self.account_balance:.2f}")
 
     def accountSummaryEnd(self, reqId: int):
-        pass
+        self.account_ready.set()
 
     def historicalData(self, reqId: int, bar):
         """Receive historical bars - 10-sec for patterns/MACD/volume, 1-min for VWAP"""
-        if self.current_symbol:
-            # Parse bar.date string to datetime object
-            # IBKR returns format: "20231201 09:30:00" or "20231201  09:30:00" (US/Eastern)
-            try:
-                bar_date = datetime.strptime(bar.date.strip(), '%Y%m%d %H:%M:%S')
-            except ValueError:
-                try:
-                    bar_date = datetime.strptime(bar.date.strip(), '%Y%m%d  %H:%M:%S')
-                except ValueError:
-                    # Fallback: already datetime or other format
-                    bar_date = bar.date if isinstance(bar.date, datetime) else datetime.now()
-            
-            # Add timezone info (EST) to bar_date for proper comparison
-            est = timezone(timedelta(hours=-5))
-            if bar_date.tzinfo is None:
-                bar_date = bar_date.replace(tzinfo=est)
-            
-            # reqId 4001 = 10-second bars, reqId 4002 = 1-minute bars
-            if reqId == 4001:
-                if self.current_symbol not in self.bars:
-                    self.bars[self.current_symbol] = []
-                self.bars[self.current_symbol].append({
-                    'date': bar_date,
-                    'open': bar.open,
-                    'high': bar.high,
-                    'low': bar.low,
-                    'close': bar.close,
-                    'volume': bar.volume
-                })
-            elif reqId == 4002:
-                if self.current_symbol not in self.bars_1min:
-                    self.bars_1min[self.current_symbol] = []
-                self.bars_1min[self.current_symbol].append({
-                    'date': bar_date,
-                    'open': bar.open,
-                    'high': bar.high,
-                    'low': bar.low,
-                    'close': bar.close,
-                    'volume': bar.volume
-                })
+        route = self.reqid_route.get(reqId)
+        if route is None:
+            return
+        symbol, kind = route
+        
+        # Parse bar.date string straight to epoch seconds (US/Eastern wall clock)
+        bar_time = _parse_ib_date(bar.date)
+        
+        # 10-second bars and 1-minute bars each have their own reqId per symbol
+        if kind == '10s':
+            buffer = self.state[symbol].bars
+        elif kind == '1m':
+            buffer = self.state[symbol].bars_1min
+        else:
+            return
+        
+        buffer.append(bar_time, bar.open, bar.high, bar.low, bar.close, float(bar.volume))
 
     def historicalDataEnd(self, reqId: int, start: str, end: str):
-        # Data collection complete - suppress messages for cleaner display
-        pass
+        # Data collection complete - wake the waiting request (no message for cleaner display)
+        done = self.request_done.get(reqId)
+        if done is not None:
+            done.set()
 
     def tickPrice(self, reqId: TickerId, tickType: TickType, price: float, attrib: TickAttrib):
-        if self.current_symbol:
+        route = self.reqid_route.get(reqId)
+        if route is not None:
+            symbol = route[0]
+            st = self.state[symbol]
             if tickType == 4:  # LAST price
-                self.last_price[self.current_symbol] = price
+                st.last_price = price
+            elif st.tick_by_tick:
+                pass  # aggregated BID/ASK lag the tick-by-tick quote and must not overwrite it
             elif tickType == 2:  # ASK price
-                self.ask_price[self.current_symbol] = price
+                st.ask_price = price
             elif tickType == 1:  # BID price
-                self.bid_price[self.current_symbol] = price
+                self.update_bid(st, price)
+            
+            ready = self.first_tick.get((symbol, tickType))
+            if ready is not None and not ready.is_set():
+                ready.set()
+
+    def tickByTickBidAsk(self, reqId: int, tickTime: int, bidPrice: float, askPrice: float,
+                         bidSize: Decimal, askSize: Decimal, tickAttribBidAsk):
+        """Raw top-of-book quote - arrives per exchange update, ahead of reqMktData's aggregated BID/ASK ticks"""
+        route = self.reqid_route.get(reqId)
+        if route is not None:
+            symbol = route[0]
+            st = self.state[symbol]
+            st.tick_by_tick = True
+            if askPrice > 0:
+                st.ask_price = askPrice
+                ready = self.first_tick[(symbol, 2)]
+                if not ready.is_set():
+                    ready.set()
+            if bidPrice > 0:
+                self.update_bid(st, bidPrice)
+                ready = self.first_tick[(symbol, 1)]
+                if not ready.is_set():
+                    ready.set()
+
+    def update_bid(self, st, price):
+        """Store a new bid; pre-market positions have no resting stop/target, so wake the main loop the moment the bid crosses one"""
+        st.bid_price = price
+        if (st.in_position and st.premarket_entry and
+                (price <= st.stop_price or 0 < st.profit_target_price <= price)):
+            self.wake.set()
+
+    def request_historical(self, reqId, contract, duration, bar_size, timeout=3):
+        """
+        Request TRADES bars and block until historicalDataEnd arrives (or timeout)
+        
+        Parameters:
+        - reqId: The symbol's 10-sec or 1-min bars request ID (see register_symbol)
+        - contract: Contract to fetch
+        - duration, bar_size: IBKR duration / bar size strings
+        - timeout: Maximum seconds to wait
+        
+        Returns: bool - True if the request completed within timeout
+        """
+        done = self.request_done.get(reqId)
+        if done is None:
+            done = self.request_done[reqId] = threading.Event()
+        done.clear()
+        self.reqHistoricalData(reqId, contract, "", duration, bar_size, "TRADES", 1, 1, False, [])
+        return done.wait(timeout)
+
+    def refresh_10s_bars(self, symbol):
+        """
+        Re-request the symbol's 10-sec bars unless the last fetch is younger than one bar
+        
+        Within one bar interval a new request returns the same history, so the
+        buffer from the previous fetch is reused instead.
+        
+        Returns: bool - True if a request was issued
+        """
+        st = self.state[symbol]
+        now = time.monotonic()
+        if len(st.bars) and now - st.bars_fetched_at < BAR_10SEC_SECONDS:
+            return False
+        
+        st.bars.clear()
+        # Only a completed request counts as fresh - after a timeout the next call fetches again
+        if self.request_historical(st.req_ids[1], st.contract, StrategyConfig.DATA_DURATION_10SEC, StrategyConfig.BAR_SIZE_10SEC):
+            st.bars_fetched_at = now
+        return True
+
+    def subscribe_market_data(self, symbol):
+        """Start the symbol's streaming quotes - kept open for the whole run, tickPrice / tickByTickBidAsk keep the prices current"""
+        st = self.state[symbol]
+        self.reqMktData(st.req_ids[0], st.contract, "", False, False, [])
+        # Tick-by-tick bid/ask for the exit path; if the account lacks it, reqMktData's BID/ASK ticks still apply
+        self.reqTickByTickData(st.req_ids[3], st.contract, "BidAsk", 0, False)
+
+    def wait_for_price(self, symbol, tick_type, timeout=2):
+        """
+        Wait until the quote stream has delivered a first tick of tick_type (no-op afterwards)
+        
+        Parameters:
+        - symbol: Stock symbol (must be subscribed)
+        - tick_type: 1 = BID, 2 = ASK, 4 = LAST
+        - timeout: Maximum seconds to wait
+        
+        Returns: bool - True if a price of that type is available
+        """
+        return self.first_tick[(symbol, tick_type)].wait(timeout)
+
+    def place_and_confirm(self, order, contract, timeout=2):
+        """
+        Place an order and block until TWS reports its first status (or timeout)
+        
+        Parameters:
+        - order: Order with orderId set
+        - contract: Contract to trade
+        - timeout: Maximum seconds to wait
+        
+        Returns: bool - True if TWS acknowledged the order in time
+        """
+        ack = self.order_ack[order.orderId] = threading.Event()
+        self.placeOrder(order.orderId, contract, order)
+        acknowledged = ack.wait(timeout)
+        self.order_ack.pop(order.orderId, None)
+        return acknowledged
+
+    def wait_for_update(self, timeout):
+        """
+        Pause the main loop until a callback reports something actionable or timeout elapses
+        
+        Parameters:
+        - timeout: Maximum seconds to wait
+        
+        Returns: bool - True if woken by a callback
+        """
+        woken = self.wake.wait(timeout)
+        self.wake.clear()
+        return woken
+    
+    def wait_for_brackets_inactive(self, symbol, timeout):
+        """
+        Block until both bracket orders of a symbol are reported Cancelled/Filled/Inactive (or timeout)
+        
+        Parameters:
+        - symbol: Stock symbol whose profit/stop orders were just cancelled
+        - timeout: Maximum seconds to wait
+        
+        Returns: bool - True if neither bracket order is still working
+        """
+        st = self.state[symbol]
+        deadline = time.monotonic() + timeout
+        while st.profit_order_active or st.stop_order_active:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self.wait_for_update(remaining)
+        return True
 
     def openOrder(self, orderId: OrderId, contract: Contract, order: Order, orderState: OrderState):
-        print(f"openOrder. orderId: {orderId}, symbol: {contract.symbol}, action: {order.action}, qty: {order.totalQuantity}, status: {orderState.status}")
+        log.info(f"openOrder. orderId: {orderId}, symbol: {contract.symbol}, action: {order.action}, qty: {order.totalQuantity}, status: {orderState.status}")
 
     def orderStatus(self, orderId: TickerId, status: str, filled: Decimal, remaining: Decimal, avgFillPrice: float, permId: TickerId, parentId: TickerId, lastFillPrice: float, clientId: TickerId, whyHeld: str, mktCapPrice: float):
-        print(f"orderStatus. orderId: {orderId}, status: {status}, filled: {filled}, remaining: {remaining}, avgFillPrice: {avgFillPrice}")
+        if self.order_status.get(orderId) != (status, filled):
+            self.order_status[orderId] = (status, filled)
+            log.info(f"orderStatus. orderId: {orderId}, status: {status}, filled: {filled}, remaining: {remaining}, avgFillPrice: {avgFillPrice}")
+        
+        ack = self.order_ack.get(orderId)
+        if ack is not None:
+            ack.set()
+        
+        owner = self.order_owner.get(orderId)
+        if owner is None:
+            return
+        kind, symbol = owner
+        st = self.state[symbol]
         
         # Track profit/stop order status changes
-        for symbol in list(self.profit_order_id.keys()):
-            if orderId == self.profit_order_id.get(symbol):
-                if status in ["Cancelled", "Filled", "Inactive"]:
-                    self.profit_order_active[symbol] = False
-                    print(f"Profit order {orderId} for {symbol} is now inactive ({status})")
-                elif status in ["Submitted", "PreSubmitted"]:
-                    self.profit_order_active[symbol] = True
-                break
+        if kind == 'profit' and st.profit_order_id == orderId:
+            if status in ["Cancelled", "Filled", "Inactive"]:
+                st.profit_order_active = False
+                log.info(f"Profit order {orderId} for {symbol} is now inactive ({status})")
+                self.wake.set()
+            elif status in ["Submitted", "PreSubmitted"]:
+                st.profit_order_active = True
         
-        for symbol in list(self.stop_order_id.keys()):
-            if orderId == self.stop_order_id.get(symbol):
-                if status in ["Cancelled", "Filled", "Inactive"]:
-                    self.stop_order_active[symbol] = False
-                    print(f"Stop order {orderId} for {symbol} is now inactive ({status})")
-                elif status in ["Submitted", "PreSubmitted"]:
-                    self.stop_order_active[symbol] = True
-                break
+        elif kind == 'stop' and st.stop_order_id == orderId:
+            if status in ["Cancelled", "Filled", "Inactive"]:
+                st.stop_order_active = False
+                log.info(f"Stop order {orderId} for {symbol} is now inactive ({status})")
+                self.wake.set()
+            elif status in ["Submitted", "PreSubmitted"]:
+                st.stop_order_active = True
         
         # Track when entry order is filled
-        for symbol, entry_id in self.entry_order_id.items():
-            if orderId == entry_id:
-                if status == "Filled":
-                    self.in_position[symbol] = True
-                    self.pending_entry[symbol] = False
-                    self.position[symbol] = int(filled)
-                    self.entry_price[symbol] = avgFillPrice
-                    # Track entry time for trailing stop calculation
-                    est = timezone(timedelta(hours=-5))
-                    self.entry_timestamp[symbol] = datetime.now(est)
-                    # Initialize highest high to entry price
-                    self.highest_high_since_entry[symbol] = avgFillPrice
-                    print(f"✓✓✓ ENTRY FILLED ({symbol}): {self.position[symbol]} shares @ ${avgFillPrice}")
+        elif kind == 'entry' and st.entry_order_id == orderId:
+            if status == "Filled":
+                st.in_position = True
+                st.pending_entry = False
+                st.position = int(filled)
+                st.entry_price = avgFillPrice
+                # Track entry time for trailing stop calculation
+                st.entry_timestamp = datetime.now(EST)
+                # Initialize highest high to entry price
+                st.highest_high_since_entry = avgFillPrice
+                log.info(f"✓✓✓ ENTRY FILLED ({symbol}): {st.position} shares @ ${avgFillPrice}")
+                self.wake.set()
+                
+                # If filled during regular hours but was a pre-market order, immediately add stop/profit orders
+                if is_regular_hours() and st.needs_stop:
+                    log.info(f"⚙️  Pre-market order filled in regular hours - adding stop loss for {symbol}")
+                    add_brackets_if_needed(self, symbol)
                     
-                    # If filled during regular hours but was a pre-market order, immediately add stop/profit orders
-                    if (is_regular_hours() and 
-                        symbol in self.premarket_entry and 
-                        self.premarket_entry.get(symbol, False) and
-                        symbol not in self.stop_order_id):
-                        
-                        print(f"⚙️  Pre-market order filled in regular hours - adding stop loss for {symbol}")
-                        
-                        # This will be handled in main loop, but set flag to trigger it
-                        # The main loop will pick this up on next iteration
-                        pass
-                        
-                elif status == "Cancelled":
-                    self.pending_entry[symbol] = False
-                    # Clean up pre-market flag if order was cancelled
-                    if symbol in self.premarket_entry:
-                        self.premarket_entry[symbol] = False
-                    if symbol in self.pending_entry_time:
-                        del self.pending_entry_time[symbol]
-                    print(f"Entry order cancelled ({symbol})")
-                break
+            elif status == "Cancelled":
+                st.pending_entry = False
+                # Clean up pre-market flag if order was cancelled
+                st.premarket_entry = False
+                st.pending_entry_time = 0.0
+                log.info(f"Entry order cancelled ({symbol})")
+                self.wake.set()
 
     def execDetails(self, reqId: int, contract: Contract, execution: Execution):
-        print(f"Execution: {contract.symbol}, {execution.side}, {execution.shares} @ {execution.price}")
+        log.info(f"Execution: {contract.symbol}, {execution.side}, {execution.shares} @ {execution.price}")
         
         # Track exit fills (profit or stop)
         symbol = contract.symbol
-        if execution.side == "SLD" and symbol in self.in_position and self.in_position[symbol]:
-            self.position[symbol] = self.position.get(symbol, 0) - int(execution.shares)
-            if self.position[symbol] <= 0:
-                self.in_position[symbol] = False
-                self.position[symbol] = 0
-                
-                # Clean up all tracking dictionaries for this symbol
-                if symbol in self.entry_order_id:
-                    del self.entry_order_id[symbol]
-                if symbol in self.profit_order_id:
-                    del self.profit_order_id[symbol]
-                if symbol in self.stop_order_id:
-                    del self.stop_order_id[symbol]
-                if symbol in self.premarket_entry:
-                    self.premarket_entry[symbol] = False
-                if symbol in self.entry_price:
-                    del self.entry_price[symbol]
-                if symbol in self.stop_price:
-                    del self.stop_price[symbol]
-                if symbol in self.profit_target_price:
-                    del self.profit_target_price[symbol]
-                if symbol in self.entry_timestamp:
-                    del self.entry_timestamp[symbol]
-                if symbol in self.highest_high_since_entry:
-                    del self.highest_high_since_entry[symbol]
+        st = self.state.get(symbol)
+        if st is not None and execution.side == "SLD" and st.in_position:
+            st.position -= int(execution.shares)
+            if st.position <= 0:
+                # Clean up all tracking for this symbol
+                self.clear_trade(symbol)
                 
-                print(f"✓✓✓ POSITION CLOSED ({symbol}) @ ${execution.price}")
+                log.info(f"✓✓✓ POSITION CLOSED ({symbol}) @ ${execution.price}")
+                self.wake.set()
 
     def error(self, *args):
         try:
             if len(args) == 3:
                 reqId, errorCode, errorString = args
-                print(f"Error. ReqId: {reqId}, Code: {errorCode}, Msg: {errorString}")
+                log.info(f"Error. ReqId: {reqId}, Code: {errorCode}, Msg: {errorString}")
             elif len(args) >= 4:
                 reqId, errorTime, errorCode, errorString = args[:4]
-                print(f"Error. Code: {errorCode}, Msg: {errorString}")
+                log.info(f"Error. Code: {errorCode}, Msg: {errorString}")
+            else:
+                return
+            
+            # A failed historical request never sends historicalDataEnd - stop waiting for it
+            done = self.request_done.get(reqId)
+            if done is not None:
+                done.set()
         except Exception as e:
-            print("Error handler exception:", e, args)
+            log.info("Error handler exception: %s %s", e, args)
 
 
-def is_premarket():
-    """Check if current time is pre-market hours (configured in StrategyConfig)"""
-    est = timezone(timedelta(hours=-5))  # EST is UTC-5
-    now_est = datetime.now(est)
+def is_premarket(now_est=None):
+    """Check if current time (or now_est) is pre-market hours (configured in StrategyConfig)"""
+    if now_est is None:
+        now_est = datetime.now(EST)
     hour = now_est.hour
     minute = now_est.minute
     
@@ -301,10 +716,10 @@ def is_premarket():
     return False
 
 
-def is_regular_hours():
-    """Check if current time is regular market hours (configured in StrategyConfig)"""
-    est = timezone(timedelta(hours=-5))  # EST is UTC-5
-    now_est = datetime.now(est)
+def is_regular_hours(now_est=None):
+    """Check if current time (or now_est) is regular market hours (configured in StrategyConfig)"""
+    if now_est is None:
+        now_est = datetime.now(EST)
     hour = now_est.hour
     minute = now_est.minute
     
@@ -324,155 +739,237 @@ def is_regular_hours():
     return False
 
 
-def is_trading_hours():
-    """Check if current time is within trading hours (pre-market + regular hours from StrategyConfig)"""
-    return is_premarket() or is_regular_hours()
+def is_trading_hours(now_est=None):
+    """Check if current time (or now_est) is within trading hours (pre-market + regular hours from StrategyConfig)"""
+    if now_est is None:
+        now_est = datetime.now(EST)
+    return is_premarket(now_est) or is_regular_hours(now_est)
 
 
-def is_near_close():
+def is_near_close(now_est=None):
     """Check if we're within 5 minutes of market close (wrapper for shared strategy)"""
-    est = timezone(timedelta(hours=-5))
-    now_est = datetime.now(est)
+    if now_est is None:
+        now_est = datetime.now(EST)
     return check_end_of_day(now_est)
 
 
+def expire_pending_entries(app, now=None):
+    """
+    Cancel entry orders still unfilled after PENDING_ENTRY_TIMEOUT
+    
+    Deadlines are queued in placement order, so only the expired front of the
+    queue is touched - entries already filled or cleaned up are just dropped.
+    
+    Parameters:
+    - app: TradingAlgo instance
+    - now: time.time() value (default: current time)
+    """
+    if now is None:
+        now = time.time()
+    
+    queue = app.pending_expiry
+    while queue and queue[0][0] < now:
+        deadline, symbol, order_id = queue.popleft()
+        st = app.state[symbol]
+        if not st.pending_entry or st.entry_order_id != order_id:
+            continue
+        
+        elapsed = now - (st.pending_entry_time or deadline - PENDING_ENTRY_TIMEOUT)
+        log.info(f"[WARNING] Stale pending order for {symbol} ({elapsed:.0f}s old) - cancelling")
+        app.cancelOrder(order_id)
+        app.clear_trade(symbol)
+
+
+def update_session_vwap(app, symbol, session_bars, reset_epoch):
+    """
+    Session VWAP from running sums - only bars newer than the last update are added
+    
+    Completed bars are folded into the symbol's vwap_sums once; the newest bar may still be
+    forming, so it is added on top each time instead of being accumulated.
+    
+    Parameters:
+    - app: TradingAlgo instance
+    - symbol: Stock symbol
+    - session_bars: BarsSoA of today's 1-min bars from the VWAP reset time
+    - reset_epoch: Epoch seconds of the VWAP reset time (new session -> sums restart)
+    
+    Returns: VWAP value or None
+    """
+    if len(session_bars) < 2:
+        return None
+    
+    st = app.state[symbol]
+    state = st.vwap_sums
+    if state is None or state[0] != reset_epoch:
+        state = st.vwap_sums = [reset_epoch, reset_epoch - 1, 0.0, 0.0]
+    
+    # Fold completed bars (all but the last) that are newer than the last update
+    times = session_bars.times
+    completed = len(session_bars) - 1
+    start = int(np.searchsorted(times[:completed], state[1], side='right'))
+    if start < completed:
+        new = slice(start, completed)
+        typical = (session_bars.highs[new] + session_bars.lows[new] + session_bars.closes[new]) / 3
+        state[2] += float(np.dot(typical, session_bars.volumes[new]))
+        state[3] += float(session_bars.volumes[new].sum())
+        state[1] = int(times[completed - 1])
+    st.vwap_last_update = time.time()
+    
+    last = session_bars[-1]
+    total_volume = state[3] + last['volume']
+    if total_volume == 0:
+        return None
+    return (state[2] + (last['high'] + last['low'] + last['close']) / 3 * last['volume']) / total_volume
+
+
+def place_brackets(app, symbol, qty, stop_price, profit_price, oca_group=None):
+    """
+    Place the profit target (LMT) and stop loss (STP) for a position
+    
+    Both orders share one OCA group, so IBKR cancels the other order when either fills.
+    Order IDs are registered before placement so no early orderStatus callback is missed.
+    
+    Parameters:
+    - app: TradingAlgo instance
+    - symbol: Stock symbol
+    - qty: Number of shares
+    - stop_price: Stop loss trigger price
+    - profit_price: Profit target limit price
+    - oca_group: OCA group name (default: OCA_<symbol>_<profit order ID>)
+    
+    Returns: (profit_id, stop_id)
+    """
+    st = app.state[symbol]
+    profit_id = app.nextOid()
+    stop_id = app.nextOid()
+    if oca_group is None:
+        oca_group = f"OCA_{symbol}_{profit_id}"
+    st.oca_group = oca_group
+    
+    profit_taker = order_from(PROFIT_LMT_TEMPLATE, profit_id, qty, lmtPrice=profit_price, ocaGroup=oca_group)
+    stop_loss = order_from(STOP_STP_TEMPLATE, stop_id, qty, auxPrice=stop_price, ocaGroup=oca_group)
+    
+    st.profit_order_id = profit_id
+    app.order_owner[profit_id] = ('profit', symbol)
+    st.stop_order_id = stop_id
+    app.order_owner[stop_id] = ('stop', symbol)
+    st.profit_order_active = True
+    st.stop_order_active = True
+    
+    app.placeOrder(profit_id, st.contract, profit_taker)
+    app.placeOrder(stop_id, st.contract, stop_loss)
+    return profit_id, stop_id
+
+
+def add_brackets_if_needed(app, symbol):
+    """
+    Add profit/stop brackets to a filled pre-market position (call once regular hours have started)
+    
+    Runs from the entry-fill callback and from the main loop - bracket_lock makes the
+    check and the placement one step, so the two paths never both place brackets.
+    
+    Parameters:
+    - app: TradingAlgo instance
+    - symbol: Stock symbol
+    
+    Returns: (profit_id, stop_id) if brackets were placed, else None
+    """
+    st = app.state[symbol]
+    with app.bracket_lock:
+        if not st.needs_stop:
+            return None
+        
+        stop_price = st.stop_price
+        profit_price = st.profit_target_price
+        qty = st.position
+        if stop_price <= 0 or profit_price <= 0 or qty <= 0:
+            return None
+        
+        order_ids = place_brackets(app, symbol, qty, stop_price, profit_price)
+        st.premarket_entry = False
+    
+    log.info(f"Stop loss @ ${stop_price} and profit target @ ${profit_price} added for {symbol}")
+    return order_ids
+
+
 def check_and_trade(app, contract, symbol):
     """Check conditions and place trade if all criteria met"""
     
-    # Initialize symbol tracking if needed
-    if symbol not in app.in_position:
-        app.in_position[symbol] = False
-    if symbol not in app.pending_entry:
-        app.pending_entry[symbol] = False
-    if symbol not in app.position:
-        app.position[symbol] = 0
-    if symbol not in app.premarket_entry:
-        app.premarket_entry[symbol] = False
+    st = app.state[symbol]
+    hist_1m_id = st.req_ids[2]
     
     # CRITICAL: Check in_position FIRST before any data fetching to prevent duplicate orders
     # This prevents race condition where multiple calls enter before first order fills
-    if app.in_position.get(symbol, False):
+    if st.in_position:
         # Get current price for display
-        app.current_symbol = symbol
-        if symbol in app.last_price:
-            del app.last_price[symbol]
-        app.reqMktData(1, contract, "", False, False, [])
-        time.sleep(1)
-        app.cancelMktData(1)
+        app.wait_for_price(symbol, 4, timeout=1)
         
-        current_price = app.last_price.get(symbol, 0)
+        current_price = st.last_price or 0
         
         # Return position details for display
-        entry = app.entry_price.get(symbol, 0)
-        stop = app.stop_price.get(symbol, 0)
-        profit = app.profit_target_price.get(symbol, 0)
-        qty = app.position.get(symbol, 0)
         return {
             "symbol": symbol, 
             "status": "IN POSITION", 
             "skip": True,
             "price": current_price,
-            "entry_price": entry,
-            "stop_price": stop,
-            "profit_price": profit,
-            "quantity": qty
+            "entry_price": st.entry_price,
+            "stop_price": st.stop_price,
+            "profit_price": st.profit_target_price,
+            "quantity": st.position
         }
     
-    # Check for stale pending orders (over 5 minutes old) and cancel them FIRST
-    if app.pending_entry.get(symbol, False):
-        if symbol in app.pending_entry_time:
-            elapsed = time.time() - app.pending_entry_time[symbol]
-            if elapsed > 300:  # 5 minutes
-                print(f"[WARNING] Stale pending order for {symbol} ({elapsed:.0f}s old) - cancelling")
-                if symbol in app.entry_order_id:
-                    app.cancelOrder(app.entry_order_id[symbol])
-                    del app.entry_order_id[symbol]
-                app.pending_entry[symbol] = False
-                if symbol in app.pending_entry_time:
-                    del app.pending_entry_time[symbol]
-                if symbol in app.premarket_entry:
-                    app.premarket_entry[symbol] = False
-                if symbol in app.stop_price:
-                    del app.stop_price[symbol]
-                if symbol in app.profit_target_price:
-                    del app.profit_target_price[symbol]
-                # Continue to check for new entry after cancelling stale order
-            else:
-                # Still within 5 minutes, keep waiting
-                return {"symbol": symbol, "status": "PENDING ENTRY", "skip": True}
-        else:
-            return {"symbol": symbol, "status": "PENDING ENTRY", "skip": True}
-    
-    # Set current symbol for callbacks
-    app.current_symbol = symbol
+    # Stale pending orders (over 5 minutes old) are cancelled by expire_pending_entries in the main loop
+    if st.pending_entry:
+        return {"symbol": symbol, "status": "PENDING ENTRY", "skip": True}
     
-    # Reset bars for fresh data (10-second bars only)
-    if symbol in app.bars:
-        app.bars[symbol] = []
+    # Get historical data - 10 second bars (refetched at most once per bar)
+    app.refresh_10s_bars(symbol)
     
-    # Get historical data - 10 second bars for pattern/MACD/volume (fast refresh)
-    end_time = ""
-    duration = StrategyConfig.DATA_DURATION_10SEC
-    bar_size = StrategyConfig.BAR_SIZE_10SEC
-    app.reqHistoricalData(4001, contract, end_time, duration, bar_size, "TRADES", 1, 1, False, [])
-    time.sleep(3)
-    
-    if symbol not in app.bars or len(app.bars[symbol]) < 10:
-        bars_count = len(app.bars.get(symbol, []))
+    if len(st.bars) < 10:
+        bars_count = len(st.bars)
         return {"symbol": symbol, "status": "INSUFFICIENT DATA", "bars": bars_count, "skip": True}
     
     # CRITICAL: Always refresh VWAP to prevent stale values from allowing trades below VWAP
     # Get 1-minute bars for VWAP on every check
-    if symbol in app.bars_1min:
-        app.bars_1min[symbol] = []
+    st.bars_1min.clear()
     
     duration_1min = StrategyConfig.DATA_DURATION_1MIN
     bar_size_1min = StrategyConfig.BAR_SIZE_1MIN
-    app.reqHistoricalData(4002, contract, end_time, duration_1min, bar_size_1min, "TRADES", 1, 1, False, [])
-    time.sleep(3)
+    app.request_historical(hist_1m_id, contract, duration_1min, bar_size_1min)
     
-    if symbol not in app.bars_1min or len(app.bars_1min[symbol]) < 10:
-        bars_count = len(app.bars_1min.get(symbol, []))
+    if len(st.bars_1min) < 10:
+        bars_count = len(st.bars_1min)
         return {"symbol": symbol, "status": "INSUFFICIENT 1M DATA", "bars": bars_count, "skip": True}
     
     # Get current ask price first for VWAP check
-    if symbol in app.ask_price:
-        del app.ask_price[symbol]
-    app.reqMktData(1, contract, "", False, False, [])
-    time.sleep(2)
-    app.cancelMktData(1)
+    app.wait_for_price(symbol, 2, timeout=2)
     
-    if symbol not in app.ask_price or app.ask_price[symbol] is None:
+    if st.ask_price is None:
         return {"symbol": symbol, "status": "NO PRICE DATA", "skip": True}
     
-    current_price = app.ask_price[symbol]
+    current_price = st.ask_price
     
     # Filter 1-min bars for VWAP calculation with session-specific reset times
-    est = timezone(timedelta(hours=-5))
-    now_est = datetime.now(est)
-    today_date = now_est.date()  # Get today's date only (no time)
-    
-    # Validate bars have datetime objects (should be set in historicalData callback)
-    if not all(isinstance(b.get('date'), datetime) for b in app.bars_1min[symbol]):
-        return {"symbol": symbol, "status": "INVALID BAR DATES", "skip": True}
+    now_est = datetime.now(EST)
     
     # Determine VWAP reset time based on current trading session
     # PREMARKET (5:00 AM - 9:29 AM): VWAP resets at 4:00 AM
     # REGULAR HOURS (9:30 AM - 3:59 PM): VWAP resets at 9:30 AM
-    if is_premarket():
+    premarket_reset_epoch, market_open_epoch, next_day_epoch = session_epochs(now_est.year, now_est.month, now_est.day)
+    in_premarket = is_premarket(now_est)  # one session decision for both the VWAP window and the order type
+    if in_premarket:
         # Premarket: Use bars from 4:00 AM onwards
-        vwap_reset_time = now_est.replace(hour=4, minute=0, second=0, microsecond=0)
+        reset_epoch = premarket_reset_epoch
         session_name = "PREMARKET"
     else:
         # Regular hours: Use bars from 9:30 AM onwards
-        vwap_reset_time = now_est.replace(hour=9, minute=30, second=0, microsecond=0)
+        reset_epoch = market_open_epoch
         session_name = "REGULAR"
     
     # Filter to bars from TODAY only, starting at appropriate reset time
-    filtered_bars_1m = [
-        b for b in app.bars_1min[symbol] 
-        if b['date'].date() == today_date and b['date'] >= vwap_reset_time
-    ]
+    # Times are sorted, so the session is one contiguous slice of views found by binary search
+    bars_1m = st.bars_1min
+    filtered_bars_1m = bars_1m.view(bars_1m.index_at(reset_epoch), bars_1m.index_at(next_day_epoch))
     
     if len(filtered_bars_1m) < 10:
         return {"symbol": symbol, "status": "INSUFFICIENT SESSION DATA", "bars": len(filtered_bars_1m), "skip": True}
@@ -480,7 +977,9 @@ def check_and_trade(app, contract, symbol):
     # Check all entry conditions using shared strategy module (filtered 1-min bars only)
     all_ok, results, pullback_low_price, recent_high_price = check_all_entry_conditions(
         filtered_bars_1m, 
-        current_price
+        current_price,
+        vwap=update_session_vwap(app, symbol, filtered_bars_1m, reset_epoch),
+        macd=update_macd_state(st.macd_state, filtered_bars_1m)
     )
     
     # Extract individual results for display
@@ -520,40 +1019,31 @@ def check_and_trade(app, contract, symbol):
         return result
     
     # All conditions met - prepare for trade!
-    timestamp = datetime.now().strftime('%H:%M:%S')
+    timestamp = hhmmss()
     
-    print(f"\n{'='*70}")
-    print(f"[{timestamp}] ✓✓✓ TRADE SIGNAL - {symbol} ✓✓✓")
-    print(f"{'='*70}")
-    print(f"Pattern: {pattern_msg}")
-    print(f"MACD: {macd_msg}")
-    print(f"Volume: {volume_msg}")
-    print(f"VWAP: {vwap_msg}\n")
+    log.info(f"\n{'='*70}")
+    log.info(f"[{timestamp}] ✓✓✓ TRADE SIGNAL - {symbol} ✓✓✓")
+    log.info(f"{'='*70}")
+    log.info(f"Pattern: {pattern_msg}")
+    log.info(f"MACD: {macd_msg}")
+    log.info(f"Volume: {volume_msg}")
+    log.info(f"VWAP: {vwap_msg}\n")
     
     # Get current price (use ASK for buying)
-    if symbol in app.ask_price:
-        del app.ask_price[symbol]
-    app.reqMktData(1, contract, "", False, False, [])
-    time.sleep(2)
-    app.cancelMktData(1)
-    
-    if symbol not in app.ask_price or app.ask_price[symbol] is None:
-        print(f"Could not get current ask price for {symbol}. Skipping trade.")
+    app.wait_for_price(symbol, 2, timeout=2)
+    
+    if st.ask_price is None:
+        log.info(f"Could not get current ask price for {symbol}. Skipping trade.")
         result["status"] = "PRICE ERROR"
         result["skip"] = True
         return result
     
-    # Check if pre-market hours (needed for entry price calculation)
-    in_premarket = is_premarket()
-    
-    # Get current EST time for debugging
-    est = timezone(timedelta(hours=-5))
-    now_est = datetime.now(est)
+    # Get current EST time for debugging (in_premarket from the session check above drives entry pricing)
     current_time_str = now_est.strftime('%H:%M:%S')
     
     # Calculate entry/exit prices using shared strategy module
     # In pre-market, use ASK directly (no spread) to ensure fill with limit order
-    current_price_for_calc = app.ask_price[symbol]
+    current_price_for_calc = st.ask_price
     
     if in_premarket:
         # Pre-market: use ASK directly (no spread) with outsideRth enabled
@@ -575,7 +1065,7 @@ def check_and_trade(app, contract, symbol):
     
     # Validate that we got valid prices
     if entry_price is None or stop_price is None or profit_price is None:
-        print(f"Invalid entry/exit prices. Stop may be too close (<2%) or invalid. Skipping trade.")
+        log.info(f"Invalid entry/exit prices. Stop may be too close (<2%) or invalid. Skipping trade.")
         result["status"] = "INVALID PRICES"
         result["skip"] = True
         return result
@@ -583,7 +1073,7 @@ def check_and_trade(app, contract, symbol):
     # Calculate actual risk percentage
     risk_per_share = entry_price - stop_price
     if risk_per_share <= 0:
-        print(f"Invalid stop loss: stop ${stop_price} >= entry ${entry_price}. Skipping trade.")
+        log.info(f"Invalid stop loss: stop ${stop_price} >= entry ${entry_price}. Skipping trade.")
         result["status"] = "INVALID STOP"
         result["skip"] = True
         return result
@@ -595,7 +1085,7 @@ def check_and_trade(app, contract, symbol):
     
     # Validate position size
     if qty <= 0:
-        print(f"Invalid position size: {qty} shares. Skipping trade.")
+        log.info(f"Invalid position size: {qty} shares. Skipping trade.")
         result["status"] = "INVALID SIZE"
         result["skip"] = True
         return result
@@ -608,116 +1098,54 @@ def check_and_trade(app, contract, symbol):
     breakout_pct = ((entry_price - recent_high_price) / recent_high_price) * 100 if recent_high_price else 0
     stop_type = "recent high" if breakout_pct > 10.0 else "pullback low"
     
-    print(f"Trade Plan:")
-    print(f"  Entry: ${entry_price} | Stop: ${stop_price} ({stop_type}, -{stop_pct_actual:.1f}%) | Target: ${profit_price} (+{StrategyConfig.PROFIT_TARGET_PCT*100:.0f}%)")
-    print(f"  Quantity: {qty} shares | Notional: ${notional:.2f} | Risk: ${risk_dollars:.2f} ({risk_pct_actual:.1f}%)\n")
+    log.info(f"Trade Plan:")
+    log.info(f"  Entry: ${entry_price} | Stop: ${stop_price} ({stop_type}, -{stop_pct_actual:.1f}%) | Target: ${profit_price} (+{StrategyConfig.PROFIT_TARGET_PCT*100:.0f}%)")
+    log.info(f"  Quantity: {qty} shares | Notional: ${notional:.2f} | Risk: ${risk_dollars:.2f} ({risk_pct_actual:.1f}%)\n")
     
     # CRITICAL: Final defensive check before placing order (race condition protection)
     # Check again if we entered position during data fetching/validation
-    if app.in_position.get(symbol, False) or app.pending_entry.get(symbol, False):
+    if st.in_position or st.pending_entry:
         result["status"] = "RACE CONDITION PREVENTED"
         result["skip"] = True
         return result
     
     # CRITICAL: Set pending_entry flag NOW after all validation passes, right before building orders
     # This prevents race condition where second call enters before first completes order placement
-    app.pending_entry[symbol] = True
-    app.pending_entry_time[symbol] = time.time()
+    st.pending_entry = True
+    st.pending_entry_time = time.time()
     
     if in_premarket:
-        print(f"⚠️  PRE-MARKET MODE: Entry at ASK ${entry_price}, stop loss monitored manually\n")
-    
-    # Build bracket orders
-    parent = Order()
-    parent.action = "BUY"
-    parent.orderType = "LMT"
-    parent.lmtPrice = entry_price
-    parent.totalQuantity = qty
-    parent.tif = "DAY"
-    parent.transmit = True  # Always transmit entry order
-    parent.outsideRth = True  # CRITICAL: Allow premarket/afterhours trading
-    try:
-        parent.eTradeOnly = False
-        parent.firmQuoteOnly = False
-    except Exception:
-        pass
+        log.info(f"⚠️  PRE-MARKET MODE: Entry at ASK ${entry_price}, stop loss monitored manually\n")
     
-    # Assign order IDs
+    # Build entry order - always transmitted and allowed outside regular hours
     parent_id = app.nextOid()
+    parent = order_from(ENTRY_LMT_TEMPLATE, parent_id, qty, lmtPrice=entry_price)
     
     # Store prices for pre-market monitoring
-    app.stop_price[symbol] = stop_price
-    app.profit_target_price[symbol] = profit_price
-    
-    if not in_premarket:
-        # Regular hours: place full bracket order with stop loss
-        # Use OCA (One-Cancels-All) group so IBKR automatically cancels other orders when one fills
-        oca_group_name = f"OCA_{symbol}_{parent_id}"
-        app.oca_group[symbol] = oca_group_name
-        
-        profit_taker = Order()
-        profit_taker.action = "SELL"
-        profit_taker.orderType = "LMT"
-        profit_taker.lmtPrice = profit_price
-        profit_taker.totalQuantity = qty
-        profit_taker.tif = "GTC"
-        profit_taker.transmit = True  # Must transmit to exchange
-        profit_taker.ocaGroup = oca_group_name  # Set OCA group
-        profit_taker.ocaType = 1  # Cancel all remaining orders on fill
-        try:
-            profit_taker.eTradeOnly = False
-            profit_taker.firmQuoteOnly = False
-        except Exception:
-            pass
-        
-        stop_loss = Order()
-        stop_loss.action = "SELL"
-        stop_loss.orderType = "STP"
-        stop_loss.auxPrice = stop_price
-        stop_loss.totalQuantity = qty
-        stop_loss.tif = "GTC"
-        stop_loss.transmit = True  # Must transmit to exchange
-        stop_loss.ocaGroup = oca_group_name  # Set OCA group
-        stop_loss.ocaType = 1  # Cancel all remaining orders on fill
-        try:
-            stop_loss.eTradeOnly = False
-            stop_loss.firmQuoteOnly = False
-        except Exception:
-            pass
-        
-        profit_id = app.nextOid()
-        stop_id = app.nextOid()
-        
-        profit_taker.orderId = profit_id
-        # Don't use parentId - let OCA group handle order relationships
-        # profit_taker.parentId = parent_id  # REMOVED: causes \"parent being cancelled\" errors
-        stop_loss.orderId = stop_id
-        # stop_loss.parentId = parent_id     # REMOVED: OCA group handles this instead
-        
-        app.profit_order_id[symbol] = profit_id
-        app.stop_order_id[symbol] = stop_id
-        app.profit_order_active[symbol] = True  # Mark as active when placed
-        app.stop_order_active[symbol] = True    # Mark as active when placed
-    
-    parent.orderId = parent_id
+    st.stop_price = stop_price
+    st.profit_target_price = profit_price
     
     # Set entry order tracking (pending_entry already set at top of trade logic)
-    app.entry_order_id[symbol] = parent_id
+    st.entry_order_id = parent_id
+    app.order_owner[parent_id] = ('entry', symbol)
+    app.pending_expiry.append((st.pending_entry_time + PENDING_ENTRY_TIMEOUT, symbol, parent_id))
     
     if in_premarket:
-        app.premarket_entry[symbol] = True
+        st.premarket_entry = True
     
     # Place orders
     if in_premarket:
-        print(f"Placing entry order for {symbol}: parent={parent_id} (pre-market mode)")
+        log.info(f"Placing entry order for {symbol}: parent={parent_id} (pre-market mode)")
         app.placeOrder(parent.orderId, contract, parent)
-        print(f"✓ Entry order placed! Stop/profit will be added after 9:30 AM or monitored manually.\n")
+        log.info(f"✓ Entry order placed! Stop/profit will be added after 9:30 AM or monitored manually.\n")
     else:
-        print(f"Placing bracket order for {symbol}: parent={parent_id}, profit={profit_id}, stop={stop_id}")
+        # Regular hours: place full bracket order with stop loss
+        # Use OCA (One-Cancels-All) group so IBKR automatically cancels other orders when one fills
+        # Don't use parentId - it caused "parent being cancelled" errors
+        log.info(f"Placing bracket order for {symbol}: parent={parent_id}")
         app.placeOrder(parent.orderId, contract, parent)
-        app.placeOrder(profit_taker.orderId, contract, profit_taker)
-        app.placeOrder(stop_loss.orderId, contract, stop_loss)
-        print(f"✓ Orders placed!\n")
+        profit_id, stop_id = place_brackets(app, symbol, qty, stop_price, profit_price, oca_group=f"OCA_{symbol}_{parent_id}")
+        log.info(f"✓ Orders placed! profit={profit_id}, stop={stop_id}\n")
     
     result["status"] = "ORDER PLACED"
     return result
@@ -729,7 +1157,8 @@ if __name__ == "__main__":
         print("No symbols entered. Exiting.")
         exit(1)
     
-    symbols = [s.strip() for s in symbols_input.split(',')][:3]  # Max 3 symbols
+    # Interned so every per-symbol dict lookup in the loop hits on identity before comparing characters
+    symbols = [sys.intern(s.strip()) for s in symbols_input.split(',')][:3]  # Max 3 symbols
     if len(symbols) == 0:
         print("No valid symbols entered. Exiting.")
         exit(1)
@@ -741,30 +1170,16 @@ if __name__ == "__main__":
     print(f"Press Ctrl+C to stop")
     print(f"{'='*60}\n")
     
-    # Create contracts for all symbols
-    contracts = {}
-    for symbol in symbols:
-        contract = Contract()
-        contract.symbol = symbol
-        contract.secType = "STK"
-        contract.exchange = "SMART"
-        contract.currency = "USD"
-        contracts[symbol] = contract
-    
     # Connect to TWS
+    log_listener.start()
     app = TradingAlgo()
+    for index, symbol in enumerate(symbols):
+        app.register_symbol(symbol, index)
     app.connect("127.0.0.1", port, clientId)
     threading.Thread(target=app.run, daemon=True).start()
-    time.sleep(1)
-    
-    # Wait for connection
-    timeout = 5.0
-    waited = 0.0
-    while app.oid == 0 and waited < timeout:
-        time.sleep(0.1)
-        waited += 0.1
     
-    if app.oid == 0:
+    # Wait for connection (nextValidId wakes us as soon as TWS answers)
+    if not app.connected.wait(6.0):
         print("Failed to connect to TWS/Gateway. Exiting.")
         exit(1)
     
@@ -773,7 +1188,7 @@ if __name__ == "__main__":
     # Get initial account balance
     print("Fetching account balance...")
     app.reqAccountSummary(9001, "All", "TotalCashValue")
-    time.sleep(2)
+    app.account_ready.wait(2.0)
     app.cancelAccountSummary(9001)
     
     if app.account_balance is None:
@@ -782,8 +1197,15 @@ if __name__ == "__main__":
     else:
         print(f"Account balance: ${app.account_balance:.2f}\n")
     
+    # Stream quotes for every symbol once - scans read the latest tick instead of re-requesting
+    for symbol in symbols:
+        app.subscribe_market_data(symbol)
+    
     print("Starting continuous monitoring...\n")
     
+    # Symbols are scanned concurrently - each check is mostly waiting on IBKR round-trips
+    scan_pool = ThreadPoolExecutor(max_workers=len(symbols))
+    
     # Continuous monitoring loop
     try:
         scan_count = 0
@@ -791,140 +1213,110 @@ if __name__ == "__main__":
         last_display_time = 0
         while True:
             scan_count += 1
+            now_est = datetime.now(EST)  # One clock read shared by this iteration's time-window checks
+            
+            # Cancel entry orders that have been pending too long (5 minutes)
+            expire_pending_entries(app)
             
             # Check if near market close - close all positions AND cancel pending orders
-            if is_near_close():
-                est = timezone(timedelta(hours=-5))
-                now_est = datetime.now(est)
-                has_positions = False
-                has_pending = False
+            if is_near_close(now_est):
+                close_time_str = now_est.strftime('%H:%M:%S')
+                closing = [symbol for symbol in symbols if app.state[symbol].in_position and app.state[symbol].position > 0]
+                cancelling = [symbol for symbol in symbols if symbol not in closing and app.state[symbol].pending_entry]
                 
-                for symbol in symbols:
-                    # Close filled positions
-                    if symbol in app.in_position and app.in_position[symbol] and app.position.get(symbol, 0) > 0:
-                        has_positions = True
-                        print(f"\n[{now_est.strftime('%H:%M:%S')}] Near market close - closing {symbol} position...")
-                        
-                        # Cancel existing profit and stop orders first
-                        if symbol in app.profit_order_id:
-                            app.cancelOrder(app.profit_order_id[symbol])
-                        if symbol in app.stop_order_id:
-                            app.cancelOrder(app.stop_order_id[symbol])
-                        
-                        # Place market order to close position
-                        close_order = Order()
-                        close_order.action = "SELL"
-                        close_order.orderType = "MKT"
-                        close_order.totalQuantity = app.position[symbol]
-                        close_order.tif = "DAY"
-                        
-                        close_id = app.nextOid()
-                        close_order.orderId = close_id
-                        app.placeOrder(close_order.orderId, contracts[symbol], close_order)
-                        print(f"Market close order placed for {symbol}: {app.position[symbol]} shares @ MKT\n")
-                        
-                        # Clean up all tracking
-                        app.in_position[symbol] = False
-                        app.position[symbol] = 0
-                        if symbol in app.entry_order_id:
-                            del app.entry_order_id[symbol]
-                        if symbol in app.profit_order_id:
-                            del app.profit_order_id[symbol]
-                        if symbol in app.stop_order_id:
-                            del app.stop_order_id[symbol]
-                        if symbol in app.premarket_entry:
-                            app.premarket_entry[symbol] = False
-                        if symbol in app.entry_price:
-                            del app.entry_price[symbol]
-                        if symbol in app.stop_price:
-                            del app.stop_price[symbol]
-                        if symbol in app.profit_target_price:
-                            del app.profit_target_price[symbol]
-                        time.sleep(2)
+                # Phase 1: cancel every working order back to back - brackets of open positions, then pending entries
+                for symbol in closing:
+                    st = app.state[symbol]
+                    log.info(f"\n[{close_time_str}] Near market close - closing {symbol} position...")
+                    if st.profit_order_id:
+                        app.cancelOrder(st.profit_order_id)
+                    if st.stop_order_id:
+                        app.cancelOrder(st.stop_order_id)
+                
+                for symbol in cancelling:
+                    st = app.state[symbol]
+                    log.info(f"\n[{close_time_str}] Near market close - cancelling pending entry order for {symbol}...")
+                    if st.entry_order_id:
+                        app.cancelOrder(st.entry_order_id)
+                        log.info(f"Entry order {st.entry_order_id} cancelled")
                     
-                    # Cancel pending entry orders
-                    elif symbol in app.pending_entry and app.pending_entry[symbol]:
-                        has_pending = True
-                        print(f"\n[{now_est.strftime('%H:%M:%S')}] Near market close - cancelling pending entry order for {symbol}...")
-                        
-                        if symbol in app.entry_order_id:
-                            app.cancelOrder(app.entry_order_id[symbol])
-                            print(f"Entry order {app.entry_order_id[symbol]} cancelled")
-                        
-                        # Clean up tracking
-                        app.pending_entry[symbol] = False
-                        if symbol in app.entry_order_id:
-                            del app.entry_order_id[symbol]
-                        if symbol in app.premarket_entry:
-                            app.premarket_entry[symbol] = False
-                        if symbol in app.stop_price:
-                            del app.stop_price[symbol]
-                        if symbol in app.profit_target_price:
-                            del app.profit_target_price[symbol]
-                        time.sleep(1)
+                    # Clean up tracking
+                    app.clear_trade(symbol)
+                
+                # Phase 2: market close orders for all open positions in one burst
+                for symbol in closing:
+                    st = app.state[symbol]
+                    close_id = app.nextOid()
+                    close_order = order_from(EXIT_MKT_TEMPLATE, close_id, st.position)
+                    app.placeOrder(close_order.orderId, st.contract, close_order)
+                    log.info(f"Market close order placed for {symbol}: {st.position} shares @ MKT\n")
+                    
+                    # Clean up all tracking
+                    app.clear_trade(symbol)
                 
-                if not has_positions and not has_pending:
-                    time.sleep(60)
+                # Phase 3: one pause for TWS to process the whole batch
+                if closing or cancelling:
+                    time.sleep(2)
+                else:
+                    app.wait_for_update(60)
                 continue
             
             # Check time window and show current time
-            est = timezone(timedelta(hours=-5))
-            now_est = datetime.now(est)
             current_time_str = now_est.strftime('%H:%M:%S')
             current_time = time.time()
             
             # Check if within trading hours (5:00 AM - 3:50 PM EST)
-            if not is_trading_hours():
+            if not is_trading_hours(now_est):
                 if current_time - last_display_time > 60:  # Update every 60 seconds when outside hours
-                    os.system('cls' if os.name == 'nt' else 'clear')
-                    print(f"\n[{current_time_str}] Outside trading hours (5:00 AM - 3:50 PM EST). Waiting...")
+                    clear_screen(f"\n[{current_time_str}] Outside trading hours (5:00 AM - 3:50 PM EST). Waiting...\n")
                     last_display_time = current_time
-                time.sleep(60)  # check every minute
+                app.wait_for_update(60)  # check every minute (sooner if a pending order fills)
                 continue
             
-            # Check conditions and trade for each symbol (silently)
-            results = []
-            for symbol in symbols:
-                result = check_and_trade(app, contracts[symbol], symbol)
-                if result:
-                    results.append(result)
+            # Check conditions and trade for each symbol (silently, all symbols in parallel)
+            results = [
+                result for result in scan_pool.map(lambda symbol: check_and_trade(app, app.state[symbol].contract, symbol), symbols)
+                if result
+            ]
             
-            # Detect if anything changed
+            # Detect if anything changed (tuples compare field by field - no per-scan string building)
             results_changed = False
             current_results_hash = {}
             for r in results:
                 if not r.get('skip'):
                     key = r['symbol']
-                    status = "SIGNAL" if r.get('all_pass') else "WAITING"
-                    pos_status = "IN_POS" if app.in_position.get(key, False) else "NO_POS"
-                    pending_status = "PENDING" if app.pending_entry.get(key, False) else "NO_PENDING"
-                    current_results_hash[key] = f"{status}|{pos_status}|{pending_status}|{r.get('pattern')}|{r.get('macd')}|{r.get('volume')}|{r.get('vwap')}"
+                    st = app.state[key]
+                    current_results_hash[key] = (bool(r.get('all_pass')), st.in_position, st.pending_entry,
+                                                 r.get('pattern'), r.get('macd'), r.get('volume'), r.get('vwap'))
                     
-                    if key not in previous_results or previous_results[key] != current_results_hash[key]:
+                    if previous_results.get(key) != current_results_hash[key]:
                         results_changed = True
             
+            # Scanning takes a while, so read the clock again - shared by the display and the position checks below
+            now_est = datetime.now(EST)
+            in_premarket = is_premarket(now_est)
+            in_regular_hours = is_regular_hours(now_est)
+            
             # Only update display if something changed or every 30 seconds
             if results_changed or (current_time - last_display_time > 30):
                 # Get update timestamp
-                est = timezone(timedelta(hours=-5))
-                now_est = datetime.now(est)
                 update_time_str = now_est.strftime('%H:%M:%S')
                 
-                # Clear screen and print header
-                os.system('cls' if os.name == 'nt' else 'clear')
-                print(f"{'='*70}")
-                print(f"  ROSS CAMERON MOMENTUM SCANNER  |  Scan #{scan_count}  |  {update_time_str} EST")
-                print(f"{'='*70}")
-                print(f"  Account: ${app.account_balance:.2f} ")
-                print(f"{'='*70}\n")
+                # Build the whole screen in memory, then clear and write it with one call
+                out = []
+                out.append(f"{'='*70}")
+                out.append(f"  ROSS CAMERON MOMENTUM SCANNER  |  Scan #{scan_count}  |  {update_time_str} EST")
+                out.append(f"{'='*70}")
+                out.append(f"  Account: ${app.account_balance:.2f} ")
+                out.append(f"{'='*70}\n")
                 
                 previous_results = current_results_hash
                 last_display_time = current_time
                 
                 # Display results table
                 if results:
-                    print(f"{'Symbol':<8} {'Price':<10} {'Pattern':<10} {'MACD':<8} {'Volume':<10} {'VWAP':<8} {'VWAP $':<10} {'Status':<20}")
-                    print(f"{'-'*90}")
+                    out.append(HEADER_ROW)
+                    out.append(TABLE_RULE)
                     
                     for r in results:
                         if r.get('skip'):
@@ -942,438 +1334,207 @@ if __name__ == "__main__":
                                 pnl_pct = ((current - entry) / entry * 100) if entry > 0 and current > 0 else 0
                                 pnl_str = f"+${pnl:.2f} (+{pnl_pct:.1f}%)" if pnl >= 0 else f"-${abs(pnl):.2f} ({pnl_pct:.1f}%)"
                                 
-                                print(f"{r['symbol']:<8} IN POSITION - Last:${current:.2f} {pnl_str}")
-                                print(f"         Entry:${entry:.2f} | Stop:${stop:.2f} | Target:${profit:.2f} | Qty:{qty}")
+                                out.append(f"{r['symbol']:<8} IN POSITION - Last:${current:.2f} {pnl_str}")
+                                out.append(f"         Entry:${entry:.2f} | Stop:${stop:.2f} | Target:${profit:.2f} | Qty:{qty}")
                             else:
-                                print(f"{r['symbol']:<8} {'-':<10} {'-':<10} {'-':<8} {'-':<10} {'-':<8} {'-':<10} {status:<20}")
+                                out.append(ROW_FMT.format_map({
+                                    'symbol': r['symbol'], 'price': '-', 'pattern': '-', 'macd': '-',
+                                    'volume': '-', 'vwap': '-', 'vwap_value': '-', 'status': status,
+                                }))
                         else:
-                            price_str = f"${r.get('price', 0):.2f}"
                             vwap_val = r.get('vwap_value', 0)
-                            vwap_str = f"${vwap_val:.2f}" if vwap_val > 0 else "-"
-                            status = "✓ SIGNAL!" if r.get('all_pass') else "Waiting..."
-                            print(f"{r['symbol']:<8} {price_str:<10} {r.get('pattern', '-'):<10} {r.get('macd', '-'):<8} {r.get('volume', '-'):<10} {r.get('vwap', '-'):<8} {vwap_str:<10} {status:<20}")
+                            out.append(ROW_FMT.format_map({
+                                'symbol': r['symbol'],
+                                'price': f"${r.get('price', 0):.2f}",
+                                'pattern': r.get('pattern', '-'),
+                                'macd': r.get('macd', '-'),
+                                'volume': r.get('volume', '-'),
+                                'vwap': r.get('vwap', '-'),
+                                'vwap_value': f"${vwap_val:.2f}" if vwap_val > 0 else "-",
+                                'status': "✓ SIGNAL!" if r.get('all_pass') else "Waiting...",
+                            }))
                     
-                    print(f"\n{'='*70}")
-                    print(f"Monitoring... (updates on change, Ctrl+C to stop)")
+                    out.append(f"\n{'='*70}")
+                    out.append(f"Monitoring... (updates on change, Ctrl+C to stop)")
+                
+                clear_screen("\n".join(out) + "\n")
             
             # TRANSITION: Add stop loss orders for pre-market positions when regular hours begin
-            if is_regular_hours():
+            if in_regular_hours:
+                # Fills during regular hours are bracketed from the callback already - this catches
+                # pre-market positions still open when the session changes
                 for symbol in symbols:
-                    if (symbol in app.in_position and app.in_position[symbol] and 
-                        symbol in app.premarket_entry and app.premarket_entry.get(symbol, False) and
-                        symbol not in app.stop_order_id):
-                        
-                        timestamp = datetime.now().strftime('%H:%M:%S')
-                        print(f"\n{'='*70}")
-                        print(f"[{timestamp}] ⚙️  ADDING STOP LOSS - {symbol} (regular hours)")
-                        print(f"{'='*70}")
-                        
-                        # Add profit taker and stop loss orders
-                        stop_price = app.stop_price.get(symbol, 0)
-                        profit_price = app.profit_target_price.get(symbol, 0)
-                        qty = app.position[symbol]
-                        
-                        if stop_price > 0 and profit_price > 0 and qty > 0:
-                            # Profit taker
-                            profit_taker = Order()
-                            profit_taker.action = "SELL"
-                            profit_taker.orderType = "LMT"
-                            profit_taker.lmtPrice = profit_price
-                            profit_taker.totalQuantity = qty
-                            profit_taker.tif = "GTC"
-                            profit_taker.transmit = False
-                            
-                            # Stop loss
-                            stop_loss = Order()
-                            stop_loss.action = "SELL"
-                            stop_loss.orderType = "STP"
-                            stop_loss.auxPrice = stop_price
-                            stop_loss.totalQuantity = qty
-                            stop_loss.tif = "GTC"
-                            stop_loss.transmit = True
-                            
-                            profit_id = app.nextOid()
-                            stop_id = app.nextOid()
-                            
-                            profit_taker.orderId = profit_id
-                            stop_loss.orderId = stop_id
-                            
-                            app.placeOrder(profit_id, contracts[symbol], profit_taker)
-                            app.placeOrder(stop_id, contracts[symbol], stop_loss)
-                            
-                            app.profit_order_id[symbol] = profit_id
-                            app.stop_order_id[symbol] = stop_id
-                            app.profit_order_active[symbol] = True
-                            app.stop_order_active[symbol] = True
-                            app.premarket_entry[symbol] = False
-                            
-                            print(f"Stop loss @ ${stop_price} and profit target @ ${profit_price} added")
-                            print(f"{'='*70}\n")
-                            time.sleep(1)
+                    if add_brackets_if_needed(app, symbol):
+                        log.info(f"\n{'='*70}")
+                        log.info(f"[{hhmmss()}] ⚙️  STOP LOSS ADDED - {symbol} (regular hours)")
+                        log.info(f"{'='*70}\n")
             
             # Monitor active positions for dynamic exit (Candle Under Candle)
             for symbol in symbols:
+                st = app.state[symbol]
                 # CRITICAL: Check if position still exists before starting exit monitoring
                 # If bracket orders already filled, skip entire exit monitoring loop
-                if not app.in_position.get(symbol, False) or app.position.get(symbol, 0) <= 0:
+                if not st.in_position or st.position <= 0:
                     continue
                 
-                if symbol in app.in_position and app.in_position[symbol]:
+                if st.in_position:
                     
-                    # CRITICAL: Check if this is a pre-market position that needs stop loss added NOW
-                    # (handles case where pre-market order filled during regular hours)
-                    if (is_regular_hours() and 
-                        symbol in app.premarket_entry and 
-                        app.premarket_entry.get(symbol, False) and
-                        symbol not in app.stop_order_id):
-                        
-                        timestamp = datetime.now().strftime('%H:%M:%S')
-                        print(f"\n{'='*70}")
-                        print(f"[{timestamp}] ⚙️  ADDING STOP LOSS (IMMEDIATE) - {symbol}")
-                        print(f"{'='*70}")
-                        
-                        stop_price = app.stop_price.get(symbol, 0)
-                        profit_price = app.profit_target_price.get(symbol, 0)
-                        qty = app.position[symbol]
-                        
-                        if stop_price > 0 and profit_price > 0 and qty > 0:
-                            # Profit taker
-                            profit_taker = Order()
-                            profit_taker.action = "SELL"
-                            profit_taker.orderType = "LMT"
-                            profit_taker.lmtPrice = profit_price
-                            profit_taker.totalQuantity = qty
-                            profit_taker.tif = "GTC"
-                            
-                            # Stop loss
-                            stop_loss = Order()
-                            stop_loss.action = "SELL"
-                            stop_loss.orderType = "STP"
-                            stop_loss.auxPrice = stop_price
-                            stop_loss.totalQuantity = qty
-                            stop_loss.tif = "GTC"
-                            
-                            profit_id = app.nextOid()
-                            stop_id = app.nextOid()
-                            
-                            profit_taker.orderId = profit_id
-                            stop_loss.orderId = stop_id
-                            
-                            app.placeOrder(profit_id, contracts[symbol], profit_taker)
-                            app.placeOrder(stop_id, contracts[symbol], stop_loss)
-                            
-                            app.profit_order_id[symbol] = profit_id
-                            app.stop_order_id[symbol] = stop_id
-                            app.profit_order_active[symbol] = True
-                            app.stop_order_active[symbol] = True
-                            app.premarket_entry[symbol] = False
-                            
-                            print(f"Stop loss @ ${stop_price} and profit target @ ${profit_price} added")
-                            print(f"{'='*70}\n")
-                            time.sleep(1)
-                    
-                    # Request fresh 10-second bar data for exit monitoring (faster response than 1-min)
-                    app.current_symbol = symbol
-                    
-                    # Get fresh 10-second bars for exit monitoring
-                    if symbol in app.bars:
-                        app.bars[symbol] = []
-                    
-                    end_time = ""
-                    duration = StrategyConfig.DATA_DURATION_10SEC
-                    bar_size = StrategyConfig.BAR_SIZE_10SEC
-                    app.reqHistoricalData(4001, contracts[symbol], end_time, duration, bar_size, "TRADES", 1, 1, False, [])
-                    time.sleep(3)
+                    # Get fresh 10-second bars for exit monitoring (faster response than 1-min, refetched once per bar)
+                    app.refresh_10s_bars(symbol)
                     
                     # Check how many bars we received
-                    bar_count = len(app.bars.get(symbol, []))
+                    bar_count = len(st.bars)
                     if bar_count < 2:
                         continue
                     
                     # Filter to bars AFTER entry timestamp for trailing stop calculation
-                    entry_time = app.entry_timestamp.get(symbol)
+                    entry_time = st.entry_timestamp
+                    bars_10s = st.bars.view()
                     if entry_time:
-                        bars_since_entry = [
-                            b for b in app.bars[symbol]
-                            if b['date'] >= entry_time
-                        ]
+                        bars_since_entry = bars_10s[st.bars.index_at(int(entry_time.timestamp())):]
                     else:
                         # Fallback if no entry timestamp
-                        bars_since_entry = app.bars[symbol]
+                        bars_since_entry = bars_10s
                     
                     # Update highest high reached since entry (for trailing stop)
                     if len(bars_since_entry) > 0:
-                        current_highest = max(b['high'] for b in bars_since_entry)
-                        previous_highest = app.highest_high_since_entry.get(symbol, app.entry_price.get(symbol, 0))
+                        current_highest = float(bars_since_entry.highs.max())
+                        previous_highest = st.highest_high_since_entry if st.highest_high_since_entry is not None else st.entry_price
                         if current_highest > previous_highest:
-                            app.highest_high_since_entry[symbol] = current_highest
+                            st.highest_high_since_entry = current_highest
                     
                     # PRE-MARKET: Monitor stop loss and profit target with limit orders
-                    if is_premarket() and symbol in app.premarket_entry and app.premarket_entry.get(symbol, False):
+                    if in_premarket and st.premarket_entry:
                         # Get current bid price for selling
-                        if symbol in app.bid_price:
-                            del app.bid_price[symbol]
-                        app.reqMktData(1, contracts[symbol], "", False, False, [])
-                        time.sleep(2)
-                        app.cancelMktData(1)
+                        app.wait_for_price(symbol, 1, timeout=2)
                         
-                        if symbol in app.bid_price and app.bid_price[symbol] is not None:
-                            current_bid = app.bid_price[symbol]
-                            stop_price = app.stop_price.get(symbol, 0)
-                            profit_price = app.profit_target_price.get(symbol, 0)
+                        # Bind once - the reader thread keeps updating the bid while we decide
+                        current_bid = st.bid_price
+                        if current_bid is not None:
+                            stop_price = st.stop_price
+                            profit_price = st.profit_target_price
+                            qty = st.position
                             
                             # Check if stop loss triggered (bid at or below stop price)
                             if current_bid <= stop_price:
-                                timestamp = datetime.now().strftime('%H:%M:%S')
-                                print(f"\n{'='*70}")
-                                print(f"[{timestamp}] 🛑 PRE-MARKET STOP LOSS - {symbol}")
-                                print(f"{'='*70}")
-                                print(f"Bid ${current_bid:.2f} <= Stop ${stop_price:.2f}")
-                                print(f"Placing limit sell order at bid price...")
+                                timestamp = hhmmss()
+                                log.info(f"\n{'='*70}")
+                                log.info(f"[{timestamp}] 🛑 PRE-MARKET STOP LOSS - {symbol}")
+                                log.info(f"{'='*70}")
+                                log.info(f"Bid ${current_bid:.2f} <= Stop ${stop_price:.2f}")
+                                log.info(f"Placing limit sell order at bid price...")
                                 
                                 # Place limit order at current bid to ensure fill
-                                stop_order = Order()
-                                stop_order.action = "SELL"
-                                stop_order.orderType = "LMT"
-                                stop_order.lmtPrice = current_bid
-                                stop_order.totalQuantity = app.position[symbol]
-                                stop_order.tif = "DAY"
-                                stop_order.outsideRth = True  # Allow premarket trading
-                                
                                 stop_id = app.nextOid()
-                                stop_order.orderId = stop_id
-                                app.placeOrder(stop_order.orderId, contracts[symbol], stop_order)
-                                print(f"Limit sell order placed: {app.position[symbol]} shares @ ${current_bid}")
-                                print(f"{'='*70}\n")
+                                stop_order = order_from(EXIT_LMT_TEMPLATE, stop_id, qty, lmtPrice=current_bid)
+                                app.place_and_confirm(stop_order, st.contract)
+                                log.info(f"Limit sell order placed: {qty} shares @ ${current_bid}")
+                                log.info(f"{'='*70}\n")
                                 
                                 # Clean up all tracking
-                                app.in_position[symbol] = False
-                                app.position[symbol] = 0
-                                app.premarket_entry[symbol] = False
-                                if symbol in app.entry_order_id:
-                                    del app.entry_order_id[symbol]
-                                if symbol in app.entry_price:
-                                    del app.entry_price[symbol]
-                                if symbol in app.stop_price:
-                                    del app.stop_price[symbol]
-                                if symbol in app.profit_target_price:
-                                    del app.profit_target_price[symbol]
-                                time.sleep(2)
+                                app.clear_trade(symbol)
                                 continue
                             
                             # Check if profit target hit (bid at or above profit price)
                             elif current_bid >= profit_price:
-                                timestamp = datetime.now().strftime('%H:%M:%S')
-                                print(f"\n{'='*70}")
-                                print(f"[{timestamp}] 💰 PRE-MARKET PROFIT TARGET - {symbol}")
-                                print(f"{'='*70}")
-                                print(f"Bid ${current_bid:.2f} >= Target ${profit_price:.2f}")
-                                print(f"Placing limit sell order at bid price...")
+                                timestamp = hhmmss()
+                                log.info(f"\n{'='*70}")
+                                log.info(f"[{timestamp}] 💰 PRE-MARKET PROFIT TARGET - {symbol}")
+                                log.info(f"{'='*70}")
+                                log.info(f"Bid ${current_bid:.2f} >= Target ${profit_price:.2f}")
+                                log.info(f"Placing limit sell order at bid price...")
                                 
                                 # Place limit order at current bid to ensure fill
-                                profit_order = Order()
-                                profit_order.action = "SELL"
-                                profit_order.orderType = "LMT"
-                                profit_order.lmtPrice = current_bid
-                                profit_order.totalQuantity = app.position[symbol]
-                                profit_order.tif = "DAY"
-                                profit_order.outsideRth = True  # Allow premarket trading
-                                
                                 profit_id = app.nextOid()
-                                profit_order.orderId = profit_id
-                                app.placeOrder(profit_order.orderId, contracts[symbol], profit_order)
-                                print(f"Limit sell order placed: {app.position[symbol]} shares @ ${current_bid}")
-                                print(f"{'='*70}\n")
+                                profit_order = order_from(EXIT_LMT_TEMPLATE, profit_id, qty, lmtPrice=current_bid)
+                                app.place_and_confirm(profit_order, st.contract)
+                                log.info(f"Limit sell order placed: {qty} shares @ ${current_bid}")
+                                log.info(f"{'='*70}\n")
                                 
                                 # Clean up all tracking
-                                app.in_position[symbol] = False
-                                app.position[symbol] = 0
-                                app.premarket_entry[symbol] = False
-                                if symbol in app.entry_order_id:
-                                    del app.entry_order_id[symbol]
-                                if symbol in app.entry_price:
-                                    del app.entry_price[symbol]
-                                if symbol in app.stop_price:
-                                    del app.stop_price[symbol]
-                                if symbol in app.profit_target_price:
-                                    del app.profit_target_price[symbol]
-                                time.sleep(2)
+                                app.clear_trade(symbol)
                                 continue
                     
-                    # CRITICAL: Add bracket orders at market open for pre-market positions
-                    # This provides stop loss protection once regular hours begin
-                    if is_regular_hours() and app.premarket_entry.get(symbol, False) and not app.brackets_added_at_open.get(symbol, False):
-                        # Pre-market position without brackets - add them now!
-                        timestamp = datetime.now().strftime('%H:%M:%S')
-                        print(f"\n{'='*70}")
-                        print(f"[{timestamp}] 🛡️  ADDING BRACKETS AT MARKET OPEN - {symbol}")
-                        print(f"{'='*70}")
-                        print(f"Pre-market position detected without bracket orders")
-                        print(f"Entry: ${app.entry_price.get(symbol, 0):.2f}")
-                        print(f"Adding stop loss (${app.stop_price.get(symbol, 0):.2f}) and profit target (${app.profit_target_price.get(symbol, 0):.2f})...")
-                        
-                        # Profit target order
-                        profit_taker = Order()
-                        profit_taker.action = "SELL"
-                        profit_taker.orderType = "LMT"
-                        profit_taker.lmtPrice = app.profit_target_price[symbol]
-                        profit_taker.totalQuantity = app.position[symbol]
-                        profit_taker.tif = "GTC"
-                        profit_taker.transmit = False
-                        try:
-                            profit_taker.eTradeOnly = False
-                            profit_taker.firmQuoteOnly = False
-                        except Exception:
-                            pass
-                        
-                        # Stop loss order
-                        stop_loss = Order()
-                        stop_loss.action = "SELL"
-                        stop_loss.orderType = "STP"
-                        stop_loss.auxPrice = app.stop_price[symbol]
-                        stop_loss.totalQuantity = app.position[symbol]
-                        stop_loss.tif = "GTC"
-                        stop_loss.transmit = True
-                        try:
-                            stop_loss.eTradeOnly = False
-                            stop_loss.firmQuoteOnly = False
-                        except Exception:
-                            pass
-                        
-                        profit_id = app.nextOid()
-                        stop_id = app.nextOid()
-                        
-                        profit_taker.orderId = profit_id
-                        stop_loss.orderId = stop_id
-                        
-                        # Place orders
-                        app.placeOrder(profit_taker.orderId, contracts[symbol], profit_taker)
-                        app.placeOrder(stop_loss.orderId, contracts[symbol], stop_loss)
-                        
-                        # Track order IDs and mark brackets as added
-                        app.profit_order_id[symbol] = profit_id
-                        app.stop_order_id[symbol] = stop_id
-                        app.profit_order_active[symbol] = True
-                        app.stop_order_active[symbol] = True
-                        app.brackets_added_at_open[symbol] = True
-                        
-                        print(f"✓ Bracket orders placed (inherent OCA)")
-                        print(f"  Profit order ID: {profit_id}")
-                        print(f"  Stop order ID: {stop_id}")
-                        print(f"{'='*70}\n")
-                        time.sleep(1)
-                    
                     # Check for dynamic exit signal (Candle Under Candle)
-                    bars_for_check = bars_since_entry if len(bars_since_entry) >= 2 else app.bars.get(symbol, [])
+                    bars_for_check = bars_since_entry if len(bars_since_entry) >= 2 else bars_10s
                     
                     if len(bars_for_check) < 2:
                         continue
                     
                     should_exit, exit_msg = check_dynamic_exit(bars_for_check)
                     
-                    if should_exit and app.position.get(symbol, 0) > 0:
+                    if should_exit and st.position > 0:
                         # TRAILING STOP: Only exit if we've made at least 5% peak gain
                         # This locks in profits after reaching 5% gain, prevents early exits on noise
-                        entry_price = app.entry_price.get(symbol, 0)
-                        highest_high = app.highest_high_since_entry.get(symbol, entry_price)
+                        entry_price = st.entry_price
+                        highest_high = st.highest_high_since_entry if st.highest_high_since_entry is not None else entry_price
                         peak_gain_pct = ((highest_high - entry_price) / entry_price * 100) if entry_price > 0 else 0
                         
                         # Require at least 5% peak gain before triggering trailing stop
-                        if peak_gain_pct < 5.0:
+                        if peak_gain_pct < StrategyConfig.TRAILING_MIN_GAIN_PCT:
                             continue
                         
-                        timestamp = datetime.now().strftime('%H:%M:%S')
-                        print(f"\n{'='*70}")
-                        print(f"[{timestamp}] 🔴 TRAILING STOP EXIT - {symbol}")
-                        print(f"{'='*70}")
-                        print(f"Peak gain: +{peak_gain_pct:.1f}% | {exit_msg}")
+                        timestamp = hhmmss()
+                        log.info(f"\n{'='*70}")
+                        log.info(f"[{timestamp}] 🔴 TRAILING STOP EXIT - {symbol}")
+                        log.info(f"{'='*70}")
+                        log.info(f"Peak gain: +{peak_gain_pct:.1f}% | {exit_msg}")
                         
                         # CRITICAL: Cancel existing bracket orders FIRST to prevent race condition
                         # If we don't cancel them, they might fill while we're placing dynamic exit
-                        if symbol in app.profit_order_id:
-                            app.cancelOrder(app.profit_order_id[symbol])
-                            print(f"Cancelled profit order {app.profit_order_id[symbol]}")
-                        if symbol in app.stop_order_id:
-                            app.cancelOrder(app.stop_order_id[symbol])
-                            print(f"Cancelled stop order {app.stop_order_id[symbol]}")
-                        time.sleep(0.5)  # Brief pause for cancellations to process
+                        if st.profit_order_id:
+                            app.cancelOrder(st.profit_order_id)
+                            log.info(f"Cancelled profit order {st.profit_order_id}")
+                        if st.stop_order_id:
+                            app.cancelOrder(st.stop_order_id)
+                            log.info(f"Cancelled stop order {st.stop_order_id}")
+                        app.wait_for_brackets_inactive(symbol, 0.5)  # orderStatus flips the active flags as each cancel lands
                         
                         # Place exit order (limit in premarket, market in regular hours)
-                        if is_premarket():
+                        qty = st.position  # read after the cancels - a bracket may have partly filled meanwhile
+                        if qty <= 0:
+                            # A bracket filled during the pause and execDetails already cleared the trade
+                            log.info(f"Position already closed by bracket order - no exit needed")
+                            log.info(f"{'='*70}\n")
+                            continue
+                        if in_premarket:
                             # Get current bid
-                            if symbol in app.bid_price:
-                                del app.bid_price[symbol]
-                            app.reqMktData(1, contracts[symbol], "", False, False, [])
-                            time.sleep(2)
-                            app.cancelMktData(1)
+                            app.wait_for_price(symbol, 1, timeout=2)
                             
-                            if symbol in app.bid_price and app.bid_price[symbol] is not None:
-                                exit_order = Order()
-                                exit_order.action = "SELL"
-                                exit_order.orderType = "LMT"
-                                exit_order.lmtPrice = app.bid_price[symbol]
-                                exit_order.totalQuantity = app.position[symbol]
-                                exit_order.tif = "DAY"
-                                exit_order.outsideRth = True
-                                exit_order.transmit = True
-                                
+                            bid = st.bid_price
+                            if bid is not None:
                                 exit_id = app.nextOid()
-                                exit_order.orderId = exit_id
-                                app.placeOrder(exit_order.orderId, contracts[symbol], exit_order)
-                                print(f"Exit order placed: LIMIT SELL {app.position[symbol]} shares @ ${app.bid_price[symbol]}")
+                                exit_order = order_from(EXIT_LMT_TEMPLATE, exit_id, qty, lmtPrice=bid)
+                                app.place_and_confirm(exit_order, st.contract)
+                                log.info(f"Exit order placed: LIMIT SELL {qty} shares @ ${bid}")
                         else:
                             # Regular hours: Market order
-                            exit_order = Order()
-                            exit_order.action = "SELL"
-                            exit_order.orderType = "MKT"
-                            exit_order.totalQuantity = app.position[symbol]
-                            exit_order.tif = "DAY"
-                            exit_order.transmit = True
-                            
                             exit_id = app.nextOid()
-                            exit_order.orderId = exit_id
-                            app.placeOrder(exit_order.orderId, contracts[symbol], exit_order)
-                            print(f"Exit order placed: MARKET SELL {app.position[symbol]} shares")
+                            exit_order = order_from(EXIT_MKT_TEMPLATE, exit_id, qty)
+                            app.place_and_confirm(exit_order, st.contract)
+                            log.info(f"Exit order placed: MARKET SELL {qty} shares")
                         
-                        print(f"{'='*70}\n")
+                        log.info(f"{'='*70}\n")
                         
-                        # Update position tracking AFTER order is placed
-                        app.in_position[symbol] = False
-                        app.position[symbol] = 0
-                        # Clean up all tracking
-                        if symbol in app.entry_order_id:
-                            del app.entry_order_id[symbol]
-                        if symbol in app.profit_order_id:
-                            del app.profit_order_id[symbol]
-                        if symbol in app.stop_order_id:
-                            del app.stop_order_id[symbol]
-                        if symbol in app.premarket_entry:
-                            app.premarket_entry[symbol] = False
-                        if symbol in app.entry_price:
-                            del app.entry_price[symbol]
-                        if symbol in app.stop_price:
-                            del app.stop_price[symbol]
-                        if symbol in app.profit_target_price:
-                            del app.profit_target_price[symbol]
-                        if symbol in app.entry_timestamp:
-                            del app.entry_timestamp[symbol]
-                        if symbol in app.highest_high_since_entry:
-                            del app.highest_high_since_entry[symbol]
-                        time.sleep(2)
+                        # Update position tracking AFTER order is acknowledged - clean up all tracking
+                        app.clear_trade(symbol)
             
-            # Wait 3 seconds before next check
-            time.sleep(3)
+            # Wait up to 3 seconds before next check - a fill or cancel wakes the loop immediately
+            app.wait_for_update(3)
             
     except KeyboardInterrupt:
         print("\n\nStopping algorithm...")
         for symbol in symbols:
-            pos = app.position.get(symbol, 0)
-            in_pos = app.in_position.get(symbol, False)
+            st = app.state[symbol]
+            pos = st.position
+            in_pos = st.in_position
             print(f"{symbol}: Position={pos} shares, In position={in_pos}")
         
+        scan_pool.shutdown(wait=False, cancel_futures=True)
         try:
             app.disconnect()
         except Exception:
             pass
         
         print("Disconnected. Check TWS for any open positions/orders.")
+        log_listener.stop()
@@ -61,29 +61,43 @@ Example:
 
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
+import contextlib
+import io
+import itertools
 import time
 from ibapi.client import EClient
 from ibapi.wrapper import EWrapper
 from ibapi.contract import Contract
 import threading
-import pytz
 import importlib.util
 import os
+import sys
+
+try:
+    import pyarrow  # noqa: F401 - parquet engine for the bar cache
+    CACHE_EXT = "parquet"
+except ImportError:  # pyarrow is optional - the bar cache falls back to pickle files
+    CACHE_EXT = "pkl"
 
 # Import shared strategy logic (handle hyphen in filename)
 _strategy_path = os.path.join(os.path.dirname(__file__), 'RossCameron-Strategy.py')
 _spec = importlib.util.spec_from_file_location("strategy", _strategy_path)
 strategy = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = strategy  # lets numba's kernel cache re-import the module by name
 _spec.loader.exec_module(strategy)
 
 # Import strategy components
 StrategyConfig = strategy.StrategyConfig
-check_all_entry_conditions = strategy.check_all_entry_conditions
-check_dynamic_exit = strategy.check_dynamic_exit
-check_stop_loss_hit = strategy.check_stop_loss_hit
-check_profit_target_hit = strategy.check_profit_target_hit
-check_end_of_day = strategy.check_end_of_day
+BarsSoA = strategy.BarsSoA
+evaluate_entry = strategy.evaluate_entry
+calculate_macd_series = strategy.calculate_macd_series
+entry_signals = strategy.entry_signals
+find_exit_bar = strategy.find_exit_bar
+EXIT_STOP_LOSS = strategy.EXIT_STOP_LOSS
+EXIT_PROFIT_TARGET = strategy.EXIT_PROFIT_TARGET
+EXIT_DYNAMIC = strategy.EXIT_DYNAMIC
 calculate_position_size = strategy.calculate_position_size
 calculate_entry_exit_prices = strategy.calculate_entry_exit_prices
 calculate_commission = strategy.calculate_commission
@@ -93,55 +107,145 @@ get_strategy_summary = strategy.get_strategy_summary
 port = 7497
 clientId = 10  # Different from live trading
 
+# Fetched bars are cached here per (symbol, dates, bar size) - delete the folder to refetch
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_cache")
+
+# Session boundaries as minutes after midnight EST, read from StrategyConfig once at import
+PREMARKET_START = StrategyConfig.PREMARKET_START_HOUR * 60 + StrategyConfig.PREMARKET_START_MINUTE
+MARKET_OPEN = StrategyConfig.MARKET_OPEN_HOUR * 60 + StrategyConfig.MARKET_OPEN_MINUTE
+MARKET_CLOSE = StrategyConfig.MARKET_CLOSE_HOUR * 60 + StrategyConfig.MARKET_CLOSE_MINUTE
+END_OF_DAY = StrategyConfig.END_OF_DAY_HOUR * 60 + StrategyConfig.END_OF_DAY_MINUTE
+
 
 class DataFetcher(EWrapper, EClient):
-    """Fetch historical data from IBKR"""
+    """Fetch historical data from IBKR - one connection shared by all symbols, several requests in flight"""
     def __init__(self):
         EClient.__init__(self, self)
-        self.bars = []
-        self.data_ready = False
+        self.bars = {}  # reqId -> one list per field (column layout), the DataFrame is built straight from the columns
+        self.data_ready = {}  # reqId -> threading.Event set by historicalDataEnd / error
+        self.req_ids = itertools.count(1)  # reqIds stay unique across symbols on the shared connection
+        self.connected = threading.Event()  # set by nextValidId once TWS has accepted the connection
+        
+    def nextValidId(self, orderId):
+        self.connected.set()
+        
+    def ensure_connected(self, timeout=5):
+        """Connect on first use - later fetches reuse the same session"""
+        if self.isConnected():
+            return
+        self.connected.clear()
+        self.connect("127.0.0.1", port, clientId)
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        self.connected.wait(timeout)
+        
+    def request_bars(self, contract, end_datetime, duration, bar_size):
+        """Start a historical TRADES request - returns the reqId its bars are collected under"""
+        reqId = next(self.req_ids)
+        self.bars[reqId] = {'date': [], 'open': [], 'high': [], 'low': [], 'close': [], 'volume': []}
+        self.data_ready[reqId] = threading.Event()
+        # Use RTH=0 to include pre-market and after-hours data
+        self.reqHistoricalData(reqId, contract, end_datetime, duration, bar_size, "TRADES", 0, 1, False, [])
+        return reqId
         
     def historicalData(self, reqId, bar):
-        self.bars.append({
-            'date': bar.date,
-            'open': bar.open,
-            'high': bar.high,
-            'low': bar.low,
-            'close': bar.close,
-            'volume': bar.volume
-        })
+        bars = self.bars.get(reqId)
+        if bars is None:  # request already timed out and was collected
+            return
+        bars['date'].append(bar.date)
+        bars['open'].append(bar.open)
+        bars['high'].append(bar.high)
+        bars['low'].append(bar.low)
+        bars['close'].append(bar.close)
+        bars['volume'].append(bar.volume)
     
     def historicalDataEnd(self, reqId, start, end):
-        self.data_ready = True
-        print(f"Data received: {len(self.bars)} bars")
+        bars = self.bars.get(reqId)
+        if bars is None:
+            return
+        print(f"Data received: {len(bars['date'])} bars")
+        self.data_ready[reqId].set()
     
     def error(self, *args):
         if len(args) >= 3:
             reqId, errorCode, errorString = args[0], args[1], args[2]
             if errorCode != 2104 and errorCode != 2106 and errorCode != 2158:
                 print(f"Error {errorCode}: {errorString}")
+                # A failed historical request never sends historicalDataEnd - stop waiting for it
+                ready = self.data_ready.get(reqId)
+                if ready is not None:
+                    ready.set()
+
 
+def cache_path(symbol, start_date, end_date, bar_size):
+    """Bar cache file for one symbol / date range / bar size"""
+    return os.path.join(CACHE_DIR, f"{symbol}_{start_date}_{end_date}_{bar_size.replace(' ', '')}.{CACHE_EXT}")
 
-def fetch_historical_data_ibkr(symbol, start_date, end_date, bar_size="10 secs"):
+
+def fetch_historical_data_ibkr(symbol, start_date, end_date, bar_sizes=("10 secs", "1 min"), app=None):
     """
-    Fetch historical data from IBKR
+    Fetch historical data - from the disk cache when available, otherwise from IBKR
+    
+    Completed days are cached after a successful fetch; ranges reaching today are
+    always refetched since their bars are still being written.
     
     Parameters:
     - symbol: Stock ticker (e.g., "AAPL")
     - start_date: Start date (YYYY-MM-DD)
     - end_date: End date (YYYY-MM-DD)
-    - bar_size: "10 secs" or "1 min"
+    - bar_sizes: Bar sizes to fetch ("10 secs" and/or "1 min")
+    - app: Shared DataFetcher (connected on first use, caller disconnects); None = one-off connection
     
-    Returns: pandas DataFrame with OHLCV data
+    Returns: tuple of pandas DataFrames with OHLCV data, one per bar size (empty if no data)
     """
-    print(f"\nFetching {bar_size} bars for {symbol} from {start_date} to {end_date}...")
+    frames = {}
+    for bar_size in bar_sizes:
+        path = cache_path(symbol, start_date, end_date, bar_size)
+        if os.path.exists(path):
+            frames[bar_size] = pd.read_parquet(path) if CACHE_EXT == "parquet" else pd.read_pickle(path)
+            print(f"✓ Loaded {len(frames[bar_size])} {bar_size} bars for {symbol} from cache")
+    
+    missing = tuple(bar_size for bar_size in bar_sizes if bar_size not in frames)
+    if missing:
+        cacheable = datetime.strptime(end_date, "%Y-%m-%d").date() < datetime.now().date()
+        one_off = app is None
+        if one_off:
+            app = DataFetcher()
+        try:
+            fetched = request_historical_data_ibkr(app, symbol, start_date, end_date, missing)
+        finally:
+            if one_off and app.isConnected():
+                app.disconnect()
+        
+        for bar_size, df in zip(missing, fetched):
+            frames[bar_size] = df
+            if cacheable and not df.empty:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                path = cache_path(symbol, start_date, end_date, bar_size)
+                if CACHE_EXT == "parquet":
+                    df.to_parquet(path, compression='zstd')
+                else:
+                    df.to_pickle(path)
+    
+    return tuple(frames[bar_size] for bar_size in bar_sizes)
+
+
+def request_historical_data_ibkr(app, symbol, start_date, end_date, bar_sizes):
+    """
+    Fetch historical data from IBKR - all bar sizes requested at once on one connection
     
-    app = DataFetcher()
-    app.connect("127.0.0.1", port, clientId)
+    Parameters:
+    - app: DataFetcher to request on (connected here if it is not yet)
+    - symbol: Stock ticker (e.g., "AAPL")
+    - start_date: Start date (YYYY-MM-DD)
+    - end_date: End date (YYYY-MM-DD)
+    - bar_sizes: Bar sizes to fetch ("10 secs" and/or "1 min")
+    
+    Returns: tuple of pandas DataFrames with OHLCV data, one per bar size (empty if no data)
+    """
+    print(f"\nFetching {' + '.join(bar_sizes)} bars for {symbol} from {start_date} to {end_date}...")
     
-    thread = threading.Thread(target=app.run, daemon=True)
-    thread.start()
-    time.sleep(2)
+    app.ensure_connected()
     
     # Create contract
     contract = Contract()
@@ -155,78 +259,97 @@ def fetch_historical_data_ibkr(symbol, start_date, end_date, bar_size="10 secs")
     end = datetime.strptime(end_date, "%Y-%m-%d")
     days = (end - start).days + 1
     
-    # Request data
-    if bar_size == "10 secs":
-        duration = f"{min(days * 86400, 86400)} S"  # Max 1 day for 10-sec bars
-    else:
-        duration = f"{days} D"
-    
     # Format end datetime with Eastern timezone (YYYYMMDD HH:MM:SS TZ format with spaces)
     end_datetime = end.strftime("%Y%m%d 23:59:59 US/Eastern")
-    # Use RTH=0 to include pre-market and after-hours data
-    app.reqHistoricalData(1, contract, end_datetime, duration, bar_size, "TRADES", 0, 1, False, [])
     
-    # Wait for data
-    timeout = 30
-    waited = 0
-    while not app.data_ready and waited < timeout:
-        time.sleep(0.5)
-        waited += 0.5
+    # Request data
+    req_ids = []
+    for bar_size in bar_sizes:
+        if bar_size == "10 secs":
+            duration = f"{min(days * 86400, 86400)} S"  # Max 1 day for 10-sec bars
+        else:
+            duration = f"{days} D"
+        req_ids.append(app.request_bars(contract, end_datetime, duration, bar_size))
+    
+    # Wait for data - woken by historicalDataEnd, no polling
+    deadline = time.monotonic() + 30
+    for reqId in req_ids:
+        app.data_ready[reqId].wait(max(deadline - time.monotonic(), 0))
+    
+    frames = []
+    for reqId, bar_size in zip(req_ids, bar_sizes):
+        bars = app.bars.pop(reqId)
+        app.data_ready.pop(reqId)
+        if len(bars['date']) == 0:
+            print(f"WARNING: No {bar_size} data received for {symbol}")
+            frames.append(pd.DataFrame())
+            continue
+        
+        df = pd.DataFrame(bars)
+        df['date'] = pd.to_datetime(df['date'])
+        df = df.sort_values('date').reset_index(drop=True)
+        
+        print(f"✓ Fetched {len(df)} {bar_size} bars")
+        frames.append(df)
+    return tuple(frames)
+
+
+def localize_dates(df):
+    """
+    Parse a bar DataFrame's 'date' column and localize naive timestamps to US/Eastern
+    (one vectorized call for the whole column; already tz-aware dates are kept as-is)
     
-    app.disconnect()
+    Parameters:
+    - df: DataFrame with a 'date' column
     
-    if len(app.bars) == 0:
-        print(f"WARNING: No data received for {symbol}")
-        return pd.DataFrame()
+    Returns: DataFrame with tz-aware 'date' column
+    """
+    dates = pd.to_datetime(df['date'])
+    if dates.dt.tz is None:
+        # ambiguous=False matches pytz localize()'s default (standard time on the fall-back hour)
+        dates = dates.dt.tz_localize('US/Eastern', ambiguous=False, nonexistent='shift_forward')
+    return df.assign(date=dates)
+
+
+def frame_to_soa(df):
+    """
+    Build a BarsSoA straight from a bar DataFrame's columns (no per-row records)
     
-    df = pd.DataFrame(app.bars)
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date').reset_index(drop=True)
+    Parameters:
+    - df: DataFrame with 'open', 'high', 'low', 'close', 'volume' and tz-aware 'date' columns
     
-    print(f"✓ Fetched {len(df)} bars")
-    return df
+    Returns: BarsSoA with 'times' as epoch seconds
+    """
+    times = ((df['date'] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+    return BarsSoA(df['open'].to_numpy(dtype=np.float64), df['high'].to_numpy(dtype=np.float64),
+                   df['low'].to_numpy(dtype=np.float64), df['close'].to_numpy(dtype=np.float64),
+                   df['volume'].to_numpy(dtype=np.float64), times)
 
 
 def is_premarket(dt):
     """Check if given datetime is pre-market hours (5:00 AM - 9:30 AM EST)"""
-    hour = dt.hour
-    minute = dt.minute
-    
-    # Use StrategyConfig for trading hours
-    start_hour = StrategyConfig.PREMARKET_START_HOUR
-    start_min = StrategyConfig.PREMARKET_START_MINUTE
-    open_hour = StrategyConfig.MARKET_OPEN_HOUR
-    open_min = StrategyConfig.MARKET_OPEN_MINUTE
-    
-    # Check if in pre-market window
-    if hour > start_hour and hour < open_hour:
-        return True
-    elif hour == start_hour and minute >= start_min:
-        return True
-    elif hour == open_hour and minute < open_min:
-        return True
-    return False
+    minute_of_day = dt.hour * 60 + dt.minute
+    return PREMARKET_START <= minute_of_day < MARKET_OPEN
 
 
 def is_regular_hours(dt):
     """Check if given datetime is regular market hours (9:30 AM - 3:50 PM EST)"""
-    hour = dt.hour
-    minute = dt.minute
+    minute_of_day = dt.hour * 60 + dt.minute
+    return MARKET_OPEN <= minute_of_day <= MARKET_CLOSE
+
+
+def trading_hours_masks(minute_of_day):
+    """
+    Vectorized is_premarket / is_regular_hours over a whole bar series
     
-    # Use StrategyConfig for trading hours
-    open_hour = StrategyConfig.MARKET_OPEN_HOUR
-    open_min = StrategyConfig.MARKET_OPEN_MINUTE
-    close_hour = StrategyConfig.MARKET_CLOSE_HOUR
-    close_min = StrategyConfig.MARKET_CLOSE_MINUTE
+    Parameters:
+    - minute_of_day: int array of hour * 60 + minute (EST) per bar
     
-    # Market open to close
-    if hour > open_hour and hour < close_hour:
-        return True
-    elif hour == open_hour and minute >= open_min:
-        return True
-    elif hour == close_hour and minute <= close_min:
-        return True
-    return False
+    Returns: (premarket_mask, regular_hours_mask) - boolean arrays
+    """
+    premarket_mask = (minute_of_day >= PREMARKET_START) & (minute_of_day < MARKET_OPEN)
+    regular_hours_mask = (minute_of_day >= MARKET_OPEN) & (minute_of_day <= MARKET_CLOSE)
+    return premarket_mask, regular_hours_mask
 
 
 class BacktestEngine:
@@ -241,9 +364,11 @@ class BacktestEngine:
         self.trading_halted_today = False  # Flag to prevent entries after END OF DAY exit
         self.current_trading_date = None  # Track current trading date
         
-    def check_entry_conditions(self, bars_10s, bars_1m, current_bar_idx):
+    def check_entry_conditions(self, bars_10s, bars_1m, current_bar_idx, vwap=None, macd=None):
         """
         Check if all entry conditions are met using shared strategy logic
+        bars_10s: All 10-sec bars (BarsSoA) - current_bar_idx is the bar being simulated
+        vwap / macd: Precomputed indicators over bars_1m (see run_backtest), None to compute here
         Returns: (should_enter, entry_price, stop_price, profit_price, shares)
         """
         # Need sufficient data
@@ -251,12 +376,12 @@ class BacktestEngine:
             return False, None, None, None, None
         
         # Get current price (use close of current 10-sec bar as "current price")
-        current_price = bars_10s[-1]['close']
+        current_price = bars_10s.closes[current_bar_idx]
         
-        # Check all conditions using 1-min bars for pattern detection
-        all_ok, results, pullback_low, recent_high = check_all_entry_conditions(bars_1m, current_price)
+        # Check all conditions using 1-min bars for pattern detection (no per-check messages needed here)
+        all_ok, pullback_low, recent_high = evaluate_entry(bars_1m, current_price, vwap, macd)
         
-        if not all_ok or pullback_low is None:
+        if not all_ok:
             return False, None, None, None, None
         
         # Calculate entry parameters using shared strategy module
@@ -339,38 +464,26 @@ class BacktestEngine:
         
         self.position = None
     
-    def check_exit_conditions(self, bars_10s, current_bar_idx, current_time):
+    def check_exit_conditions(self, bars_10s, current_bar_idx):
         """
         Check if any exit conditions are met using shared strategy logic
+        The exit bar is located once at entry (find_exit_bar) - per bar this is one index compare
+        bars_10s: All 10-sec bars (BarsSoA) - current_bar_idx is the bar being simulated
         Returns: (should_exit, exit_price, exit_reason)
         """
-        if self.position is None:
+        if self.position is None or current_bar_idx != self.position['exit_bar_idx']:
             return False, None, None
         
-        current_bar = bars_10s[-1]
-        current_price = current_bar['close']
-        
-        # Check stop loss using shared strategy module
-        if check_stop_loss_hit(current_bar, self.position['stop_price']):
+        exit_code = self.position['exit_code']
+        if exit_code == EXIT_STOP_LOSS:
             return True, self.position['stop_price'], "STOP LOSS"
-        
-        # Check profit target using shared strategy module
-        if check_profit_target_hit(current_bar, self.position['profit_price']):
+        if exit_code == EXIT_PROFIT_TARGET:
             return True, self.position['profit_price'], "PROFIT TARGET"
         
-        # Check dynamic exit (Candle Under Candle) using shared strategy module
-        # Only check bars since entry
-        bars_since_entry = bars_10s[self.position['entry_bar_idx']:]
-        if len(bars_since_entry) >= 2:
-            should_exit, msg = check_dynamic_exit(bars_since_entry)
-            if should_exit:
-                return True, current_price, "DYNAMIC EXIT"
-        
-        # Check end of day using shared strategy module
-        if check_end_of_day(current_time):
-            return True, current_price, "END OF DAY"
-        
-        return False, None, None
+        current_price = bars_10s.closes[current_bar_idx]
+        if exit_code == EXIT_DYNAMIC:
+            return True, current_price, "DYNAMIC EXIT"
+        return True, current_price, "END OF DAY"
     
     def run_backtest(self, df_10s, df_1m, symbol, start_date, end_date):
         """
@@ -389,31 +502,43 @@ class BacktestEngine:
         print(f"Initial Capital: ${self.initial_capital:.2f}")
         print(f"{'='*70}\n")
         
-        # Convert to list of dicts for compatibility with existing functions
-        bars_10s_list = df_10s.to_dict('records')
-        bars_1m_list = df_1m.to_dict('records')
-        
-        # Ensure dates are datetime objects with timezone
-        est = pytz.timezone('US/Eastern')
-        for bar in bars_10s_list:
-            if not isinstance(bar['date'], datetime):
-                bar['date'] = pd.to_datetime(bar['date'])
-            if bar['date'].tzinfo is None:
-                bar['date'] = est.localize(bar['date'])
-        
-        for bar in bars_1m_list:
-            if not isinstance(bar['date'], datetime):
-                bar['date'] = pd.to_datetime(bar['date'])
-            if bar['date'].tzinfo is None:
-                bar['date'] = est.localize(bar['date'])
+        # Ensure dates are timezone-aware (localized per column, not per bar)
+        df_10s = localize_dates(df_10s)
+        df_1m = localize_dates(df_1m)
+        
+        # Session flags for every bar up front instead of hour/minute comparisons per bar
+        minute_of_day = (df_10s['date'].dt.hour * 60 + df_10s['date'].dt.minute).to_numpy()
+        premarket_mask, regular_hours_mask = trading_hours_masks(minute_of_day)
+        tradable_mask = premarket_mask | regular_hours_mask
+        before_open_mask = minute_of_day < 9 * 60 + 30  # session VWAP starts at 9:30 AM
+        end_of_day_mask = minute_of_day >= END_OF_DAY  # check_end_of_day
+        
+        # 10-sec bars as float64 columns - windows below are views into them, not per-bar list copies
+        bars_10s = frame_to_soa(df_10s)
+        times_10s = df_10s['date'].tolist()  # Timestamps for day rollover and trade records
+        closes_10s = bars_10s.closes
+        
+        # 1-min bars likewise; fetch_historical_data_ibkr returns them sorted, so each
+        # VWAP window is a contiguous index range found by binary search on epoch seconds
+        bars_1m = frame_to_soa(df_1m)
+        times_1m = bars_1m.times
+        
+        # VWAP / MACD series and entry signals for the current window start - every window
+        # sharing a start is a prefix of it, so they are computed once per start instead of once per bar
+        series_start = None
+        vwap_series = None
+        macd_series = None
+        signal_ok = None
         
         # Simulate bar-by-bar
         lookback_bars = 360  # 1 hour of 10-sec bars for pattern detection
         lookback_1m = StrategyConfig.VWAP_LOOKBACK_BARS  # Full day of 1-min bars for VWAP
         
-        for i in range(lookback_bars, len(bars_10s_list)):
-            current_bar = bars_10s_list[i]
-            current_time = current_bar['date']
+        in_position = False  # mirrors self.position is not None for the hot loop
+        exit_bar_idx = -1  # bar where the open position exits (see find_exit_bar), -1 when flat
+        
+        for i in range(lookback_bars, len(bars_10s)):
+            current_time = times_10s[i]
             
             # Reset trading halt flag on new day
             current_date = current_time.date()
@@ -421,13 +546,12 @@ class BacktestEngine:
                 self.current_trading_date = current_date
                 self.trading_halted_today = False
             
-            # Get recent bars for analysis
-            recent_10s = bars_10s_list[i-lookback_bars:i+1]
-            
             # Check exit conditions FIRST (must check exits even outside trading hours)
-            if self.position is not None:
-                should_exit, exit_price, exit_reason = self.check_exit_conditions(recent_10s, i, current_time)
+            if i == exit_bar_idx:
+                should_exit, exit_price, exit_reason = self.check_exit_conditions(bars_10s, i)
                 if should_exit:
+                    in_position = False
+                    exit_bar_idx = -1
                     self.exit_position(exit_price, current_time, exit_reason)
                     
                     # If END OF DAY exit, halt trading for rest of day
@@ -437,37 +561,53 @@ class BacktestEngine:
             
             # Skip non-trading hours for NEW ENTRIES (but continue checking exits for existing positions above)
             # Only allow entries during pre-market (5:00 AM - 9:30 AM) and regular hours (9:30 AM - 3:50 PM)
-            if not is_premarket(current_time) and not is_regular_hours(current_time):
+            if not tradable_mask[i]:
                 continue
             
-            # Get 1-min bars for VWAP: Use session VWAP from 9:30 AM onwards (ignore pre-market)
-            market_open_time = current_time.replace(hour=9, minute=30, second=0, microsecond=0)
-            if current_time.hour < 9 or (current_time.hour == 9 and current_time.minute < 30):
-                # Pre-market: use only pre-market bars
-                recent_1m = [b for b in bars_1m_list if b['date'] <= current_time][-lookback_1m:]
-            else:
-                # Regular hours: use only bars from 9:30 AM onwards for session VWAP
-                recent_1m = [b for b in bars_1m_list if b['date'] >= market_open_time and b['date'] <= current_time]
-            
             # Check entry conditions (only if not in position and trading not halted)
-            if self.position is None and not self.trading_halted_today:
-                should_enter, entry_price, stop_price, profit_price, shares = \
-                    self.check_entry_conditions(recent_10s, recent_1m, i)
+            if not in_position and not self.trading_halted_today:
+                # Get 1-min bars for VWAP: Use session VWAP from 9:30 AM onwards (ignore pre-market)
+                end_1m = int(np.searchsorted(times_1m, bars_10s.times[i], side='right'))
+                if before_open_mask[i]:
+                    # Pre-market: use only pre-market bars
+                    start_1m = max(end_1m - lookback_1m, 0)
+                else:
+                    # Regular hours: use only bars from 9:30 AM onwards for session VWAP
+                    market_open_time = current_time.replace(hour=9, minute=30, second=0, microsecond=0)
+                    start_1m = int(np.searchsorted(times_1m, int(market_open_time.timestamp()), side='left'))
+                
+                if start_1m != series_start:
+                    series_start = start_1m
+                    macd_series = calculate_macd_series(bars_1m.closes[start_1m:])
+                    signal_ok, vwap_series, _, _ = entry_signals(bars_1m[start_1m:], macd_series)
+                
+                k = end_1m - start_1m - 1  # this window's last bar in the series
+                
+                # Precomputed signals rule out most bars; only candidates get the full check
+                should_enter = False
+                if k >= 0 and signal_ok[k] and closes_10s[i] > vwap_series[k]:
+                    vwap = float(vwap_series[k])
+                    macd = (macd_series[0][k], macd_series[1][k], macd_series[2][k])
+                    should_enter, entry_price, stop_price, profit_price, shares = \
+                        self.check_entry_conditions(bars_10s, bars_1m[start_1m:end_1m], i, vwap, macd)
                 
                 if should_enter:
                     self.enter_position(entry_price, stop_price, profit_price, shares, current_time, i)
+                    self.position['exit_bar_idx'], self.position['exit_code'] = \
+                        find_exit_bar(bars_10s, end_of_day_mask, i, entry_price, stop_price, profit_price)
+                    in_position = True
+                    exit_bar_idx = self.position['exit_bar_idx']
             
             # Track equity
             if i % 360 == 0:  # Every hour
                 equity = self.capital
-                if self.position is not None:
-                    equity += self.position['shares'] * current_bar['close']
+                if in_position:
+                    equity += self.position['shares'] * closes_10s[i]
                 self.equity_curve.append({'time': current_time, 'equity': equity})
         
         # Close any remaining position at end
         if self.position is not None:
-            final_bar = bars_10s_list[-1]
-            self.exit_position(final_bar['close'], final_bar['date'], "END OF BACKTEST")
+            self.exit_position(closes_10s[-1], times_10s[-1], "END OF BACKTEST")
         
         # Print results
         self.print_results(symbol)
@@ -482,42 +622,41 @@ class BacktestEngine:
             print("No trades executed.")
             return
         
-        # Basic stats
+        # Basic stats - per-trade columns pulled out once, everything below is vectorized
         total_trades = len(self.trades)
-        winning_trades = [t for t in self.trades if t['pnl'] > 0]
-        losing_trades = [t for t in self.trades if t['pnl'] <= 0]
+        pnls = np.fromiter((t['pnl'] for t in self.trades), dtype=np.float64, count=total_trades)
+        commissions = np.fromiter((t['commission'] for t in self.trades), dtype=np.float64, count=total_trades)
+        pnls_gross = np.fromiter((t['pnl_gross'] for t in self.trades), dtype=np.float64, count=total_trades)
         
-        win_rate = (len(winning_trades) / total_trades) * 100 if total_trades > 0 else 0
+        win_mask = pnls > 0
+        num_winners = int(win_mask.sum())
+        num_losers = total_trades - num_winners
+        total_win = float(pnls[win_mask].sum())
+        total_loss = float(pnls[~win_mask].sum())
         
-        total_pnl = sum([t['pnl'] for t in self.trades])
-        avg_pnl = total_pnl / total_trades if total_trades > 0 else 0
+        total_pnl = float(pnls.sum())
+        avg_pnl = total_pnl / total_trades
         
         # Commission stats
-        total_commission = sum([t['commission'] for t in self.trades])
-        avg_commission = total_commission / total_trades if total_trades > 0 else 0
-        total_pnl_gross = sum([t['pnl_gross'] for t in self.trades])
+        total_commission = float(commissions.sum())
+        avg_commission = total_commission / total_trades
+        total_pnl_gross = float(pnls_gross.sum())
         
-        avg_win = sum([t['pnl'] for t in winning_trades]) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum([t['pnl'] for t in losing_trades]) / len(losing_trades) if losing_trades else 0
+        avg_win = total_win / num_winners if num_winners else 0
+        avg_loss = total_loss / num_losers if num_losers else 0
         
-        profit_factor = abs(sum([t['pnl'] for t in winning_trades]) / sum([t['pnl'] for t in losing_trades])) if losing_trades and sum([t['pnl'] for t in losing_trades]) != 0 else float('inf')
+        profit_factor = abs(total_win / total_loss) if num_losers and total_loss != 0 else float('inf')
         
         total_return_pct = ((self.capital - self.initial_capital) / self.initial_capital) * 100
         
-        # Max drawdown
-        peak = self.initial_capital
-        max_dd = 0
-        for trade in self.trades:
-            running_capital = self.initial_capital + sum([t['pnl'] for t in self.trades[:self.trades.index(trade)+1]])
-            if running_capital > peak:
-                peak = running_capital
-            dd = ((peak - running_capital) / peak) * 100
-            if dd > max_dd:
-                max_dd = dd
+        # Max drawdown - running capital after each trade vs its peak (starting capital included)
+        running_capital = self.initial_capital + np.cumsum(pnls)
+        peak = np.maximum(np.maximum.accumulate(running_capital), self.initial_capital)
+        max_dd = float((((peak - running_capital) / peak) * 100).max())
         
         print(f"Total Trades: {total_trades}")
-        print(f"Winning Trades: {len(winning_trades)} ({len(winning_trades)/total_trades*100:.1f}%)" if total_trades > 0 else "Winning Trades: 0 (0.0%)")
-        print(f"Losing Trades: {len(losing_trades)}")
+        print(f"Winning Trades: {num_winners} ({num_winners/total_trades*100:.1f}%)")
+        print(f"Losing Trades: {num_losers}")
         print(f"\nP&L:")
         print(f"  Gross P&L: ${total_pnl_gross:+.2f}")
         print(f"  Total Commission: ${total_commission:.2f} (${avg_commission:.2f}/trade)")
@@ -543,6 +682,28 @@ class BacktestEngine:
         print(f"{'='*70}\n")
 
 
+def run_symbol_backtest(symbol, df_10s, df_1m, trade_date):
+    """
+    Backtest one symbol - runs in a worker process per symbol when several cores are available
+    
+    The engine's report is captured instead of printed, so parallel symbols
+    don't interleave their output; main() prints each report in symbol order.
+    
+    Parameters:
+    - symbol: Stock symbol
+    - df_10s: DataFrame with 10-second bars
+    - df_1m: DataFrame with 1-minute bars
+    - trade_date: Trading date string (YYYY-MM-DD)
+    
+    Returns: (trades, final_capital, report_text)
+    """
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        engine = BacktestEngine(initial_capital=500.0)
+        engine.run_backtest(df_10s, df_1m, symbol, trade_date, trade_date)
+    return engine.trades, engine.capital, report.getvalue()
+
+
 def main():
     """Main backtesting function"""
     print("="*70)
@@ -583,27 +744,42 @@ def main():
     all_trades = []
     combined_engine = BacktestEngine(initial_capital=500.0)
     
+    # Fetch every symbol first over one shared TWS connection - the backtests are the CPU-bound part
+    app = DataFetcher()
+    jobs = []
     for symbol in symbols:
         print(f"\n{'='*70}")
         print(f"BACKTESTING: {symbol}")
         print(f"{'='*70}")
         
         # Fetch data from IBKR (single trading day)
-        df_10s = fetch_historical_data_ibkr(symbol, trade_date, trade_date, bar_size="10 secs")
-        df_1m = fetch_historical_data_ibkr(symbol, trade_date, trade_date, bar_size="1 min")
+        df_10s, df_1m = fetch_historical_data_ibkr(symbol, trade_date, trade_date, app=app)
         
         if df_10s.empty or df_1m.empty:
             print(f"\nWARNING: Could not fetch data for {symbol}. Skipping.")
             continue
         
-        # Run backtest for this symbol
-        engine = BacktestEngine(initial_capital=500.0)
-        engine.run_backtest(df_10s, df_1m, symbol, trade_date, trade_date)
-        
-        # Add symbol to trades and aggregate
-        for trade in engine.trades:
-            trade['symbol'] = symbol
-            all_trades.append(trade)
+        jobs.append((symbol, df_10s, df_1m))
+    
+    if app.isConnected():
+        app.disconnect()
+    
+    # Run the symbols' backtests in parallel - each has its own engine, nothing is shared.
+    # Worker processes only pay off with more than one symbol and core; otherwise run in-process
+    if jobs:
+        job_symbols, frames_10s, frames_1m = zip(*jobs)
+        workers = min(len(jobs), os.cpu_count() or 1)
+        with (ProcessPoolExecutor(max_workers=workers) if workers > 1 else contextlib.nullcontext()) as pool:
+            results = (pool.map if pool else map)(run_symbol_backtest, job_symbols, frames_10s, frames_1m,
+                                                  itertools.repeat(trade_date))
+            
+            for symbol, (trades, final_capital, report) in zip(job_symbols, results):
+                print(report, end="")
+                
+                # Add symbol to trades and aggregate
+                for trade in trades:
+                    trade['symbol'] = symbol
+                    all_trades.append(trade)
     
     # Show combined results if multiple symbols
     if len(symbols) > 1 and all_trades:
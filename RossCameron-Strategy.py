@@ -30,7 +30,33 @@ CONFIGURATION:
 Modify these parameters to change strategy behavior:
 """
 
+import sys
+from dataclasses import dataclass
 import numpy as np
+import pandas as pd
+from strategy_messages import message as _message
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional - kernels fall back to plain Python loops
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Numba's on-disk cache re-imports this module by name when loading compiled kernels,
+# so only enable it when the loader registered the module in sys.modules
+JIT_CACHE = __name__ in sys.modules
+
+# Kernels are compiled with nogil=True: they only touch arrays and scalars, so the live
+# scanner's per-symbol threads (and any threaded backtest driver) can run them in parallel
+
+# Validate array input contracts (dtype/contiguity) on the hot paths - off in production
+DEBUG_CHECKS = False
 
 # ==================== STRATEGY CONFIGURATION ====================
 
@@ -73,6 +99,7 @@ class StrategyConfig:
     # Profit/Loss Targets
     PROFIT_TARGET_PCT = 0.2          # 20% profit target
     ENTRY_SPREAD_PCT = 0.002          # 0.2% spread simulation for entry
+    TRAILING_MIN_GAIN_PCT = 5.0       # Candle Under Candle exit only arms after a 5% peak gain
     
     # Trading Hours (EST)
     PREMARKET_START_HOUR = 5          # 5:00 AM
@@ -104,19 +131,178 @@ class StrategyConfig:
     MAX_CONCURRENT_POSITIONS = 3       # Maximum number of symbols to trade simultaneously
 
 
+def reload_config():
+    """
+    Recompute the hot-path copies of StrategyConfig values - call after changing StrategyConfig
+    
+    The entry checks run every bar, so the kernel thresholds are read from these module-level
+    tuples (one global lookup) instead of one class attribute lookup per value per call.
+    """
+    global MACD_ALPHAS, MACD_12_26_9, PULLBACK_PARAMS, VOLUME_PARAMS, END_OF_DAY_MINUTES
+    
+    # EMA smoothing factors (fast, slow, signal)
+    MACD_ALPHAS = (2 / (StrategyConfig.MACD_FAST + 1), 2 / (StrategyConfig.MACD_SLOW + 1),
+                   2 / (StrategyConfig.MACD_SIGNAL + 1))
+    
+    # Standard periods can use the kernel specialized with constant smoothing factors
+    MACD_12_26_9 = (StrategyConfig.MACD_FAST, StrategyConfig.MACD_SLOW, StrategyConfig.MACD_SIGNAL) == (12, 26, 9)
+    
+    # Trailing threshold arguments of _pullback_numba
+    PULLBACK_PARAMS = (StrategyConfig.MIN_SURGE_PCT, StrategyConfig.SURGE_LOOKBACK_MIN, StrategyConfig.SURGE_LOOKBACK_MAX,
+                       StrategyConfig.RECENT_HIGH_LOOKBACK, StrategyConfig.MIN_PULLBACK_PCT, StrategyConfig.MAX_PULLBACK_PCT)
+    
+    # Trailing threshold arguments of _volume_numba / _volume_numpy
+    VOLUME_PARAMS = (StrategyConfig.MIN_RELATIVE_VOLUME, StrategyConfig.VOLUME_SPIKE_THRESHOLD,
+                     StrategyConfig.VOLUME_WICK_RATIO, StrategyConfig.MAX_RED_CANDLES_IN_PULLBACK)
+    
+    # End-of-day exit time in minutes after midnight
+    END_OF_DAY_MINUTES = StrategyConfig.END_OF_DAY_HOUR * 60 + StrategyConfig.END_OF_DAY_MINUTE
+
+
+reload_config()
+
+
+# ==================== BAR DATA ====================
+
+class BarsSoA:
+    """
+    Struct-of-arrays bar container - one float64 ndarray per field instead of a list of dicts
+    
+    Supports len() and slicing like a list of bars, so bars[-N:] returns a
+    BarsSoA of views (no copy). Indexing a single bar returns a bar dictionary.
+    'times' holds epoch seconds (int64) or None when bars carry no timestamps.
+    """
+    __slots__ = ('opens', 'highs', 'lows', 'closes', 'volumes', 'times')
+    
+    def __init__(self, opens, highs, lows, closes, volumes, times=None):
+        self.opens = opens
+        self.highs = highs
+        self.lows = lows
+        self.closes = closes
+        self.volumes = volumes
+        self.times = times
+    
+    @classmethod
+    def from_records(cls, bars):
+        """
+        Build a BarsSoA from a list of bar dictionaries
+        
+        Parameters:
+        - bars: List of bar dictionaries with 'open', 'high', 'low', 'close', 'volume' (and optional 'date')
+        
+        Returns: BarsSoA
+        """
+        n = len(bars)
+        opens = np.fromiter((bar['open'] for bar in bars), dtype=np.float64, count=n)
+        highs = np.fromiter((bar['high'] for bar in bars), dtype=np.float64, count=n)
+        lows = np.fromiter((bar['low'] for bar in bars), dtype=np.float64, count=n)
+        closes = np.fromiter((bar['close'] for bar in bars), dtype=np.float64, count=n)
+        volumes = np.fromiter((float(bar['volume']) for bar in bars), dtype=np.float64, count=n)
+        
+        times = None
+        if n > 0 and all(hasattr(bar.get('date'), 'timestamp') for bar in bars):
+            times = np.fromiter((int(bar['date'].timestamp()) for bar in bars), dtype=np.int64, count=n)
+        
+        return cls(opens, highs, lows, closes, volumes, times)
+    
+    def __len__(self):
+        return self.closes.shape[0]
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return BarsSoA(self.opens[key], self.highs[key], self.lows[key], self.closes[key], self.volumes[key],
+                           None if self.times is None else self.times[key])
+        
+        bar = {
+            'open': self.opens[key],
+            'high': self.highs[key],
+            'low': self.lows[key],
+            'close': self.closes[key],
+            'volume': self.volumes[key],
+        }
+        if self.times is not None:
+            bar['date'] = self.times[key]
+        return bar
+
+
+def as_soa(bars):
+    """
+    Return bars as a BarsSoA, converting a list of bar dictionaries if needed
+    
+    Parameters:
+    - bars: BarsSoA or list of bar dictionaries
+    
+    Returns: BarsSoA
+    """
+    if isinstance(bars, BarsSoA):
+        return bars
+    return BarsSoA.from_records(bars)
+
+
 # ==================== INDICATOR CALCULATIONS ====================
 
-def calculate_macd(closes, fast=None, slow=None, signal=None):
+@njit(cache=JIT_CACHE, nogil=True)
+def _macd_series_numba(closes, alpha_fast, alpha_slow, alpha_signal):
     """
-    Calculate MACD indicator
+    MACD, signal and histogram series from one fused pass, written into one preallocated block
+    
+    Each EMA follows ema[i] = values[i] * alpha + ema[i-1] * (1 - alpha), seeded with values[0].
+    
+    Parameters:
+    - closes: float64 array of closing prices (at least 1)
+    - alpha_fast, alpha_slow, alpha_signal: Smoothing factors 2 / (period + 1)
+    
+    Returns: float64 array of shape (3, len(closes)) - rows are macd, signal, histogram
+    """
+    n = closes.shape[0]
+    series = np.empty((3, n), dtype=np.float64)  # every cell is written below, no zero fill needed
+    ema_fast = closes[0]
+    ema_slow = closes[0]
+    signal_line = 0.0
+    series[0, 0] = 0.0
+    series[1, 0] = 0.0
+    series[2, 0] = 0.0
+    for i in range(1, n):
+        ema_fast = closes[i] * alpha_fast + ema_fast * (1 - alpha_fast)
+        ema_slow = closes[i] * alpha_slow + ema_slow * (1 - alpha_slow)
+        macd_line = ema_fast - ema_slow
+        signal_line = macd_line * alpha_signal + signal_line * (1 - alpha_signal)
+        series[0, i] = macd_line
+        series[1, i] = signal_line
+        series[2, i] = macd_line - signal_line
+    return series
+
+
+def _ema(values, alpha):
+    """
+    EMA of a float64 array via pandas' C ewm - the calculate_macd_series path without numba
+    
+    ewm(adjust=False) runs the same recurrence as _macd_series_numba (seeded with values[0]),
+    so the interpreted fallback never loops over bars in Python.
+    
+    Parameters:
+    - values: float64 array
+    - alpha: Smoothing factor 2 / (period + 1)
+    
+    Returns: float64 array of EMA values (same length as values)
+    """
+    return pd.Series(values, copy=False).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def calculate_macd_series(closes, fast=None, slow=None, signal=None):
+    """
+    Calculate full MACD series (one EMA pass over all closes)
+    
+    Element [k] equals calculate_macd(closes[:k+1]) for k + 1 >= slow - the EMAs are seeded
+    at closes[0], so one pass serves every window that starts at the same bar.
     
     Parameters:
-    - closes: List of closing prices
+    - closes: float64 ndarray of closing prices, used as-is (no copy) - lists are still accepted but converted
     - fast: Fast EMA period (default from config)
     - slow: Slow EMA period (default from config)
     - signal: Signal line period (default from config)
     
-    Returns: (macd_line, signal_line, histogram) or (None, None, None)
+    Returns: (macd_arr, signal_arr, histogram_arr) as ndarrays or (None, None, None)
     """
     if fast is None:
         fast = StrategyConfig.MACD_FAST
@@ -128,35 +314,188 @@ def calculate_macd(closes, fast=None, slow=None, signal=None):
     if len(closes) < slow:
         return None, None, None
     
-    closes_arr = np.array(closes)
+    closes_arr = closes if isinstance(closes, np.ndarray) and closes.dtype == np.float64 else np.asarray(closes, dtype=np.float64)
+    
+    if NUMBA_AVAILABLE:
+        series = _macd_series_numba(closes_arr, 2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+        return series[0], series[1], series[2]
+    
+    # Calculate EMAs (pandas ewm without numba)
+    ema_fast = _ema(closes_arr, 2 / (fast + 1))
+    ema_slow = _ema(closes_arr, 2 / (slow + 1))
+    
+    macd_line = ema_fast - ema_slow
+    
+    # Calculate signal line
+    signal_line = _ema(macd_line, 2 / (signal + 1))
+    
+    histogram = macd_line - signal_line
+    
+    return macd_line, signal_line, histogram
+
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _macd_fold_numba(closes, ema_fast, ema_slow, signal_line, alpha_fast, alpha_slow, alpha_signal):
+    """
+    Step the three MACD recurrences of calculate_macd_series over closes in one fused pass,
+    starting from the given EMA values - scalars only, no per-bar arrays
+    
+    Parameters:
+    - closes: float64 array of closing prices to fold in (may be empty)
+    - ema_fast, ema_slow, signal_line: EMA values at the bar before closes[0]
+    - alpha_fast, alpha_slow, alpha_signal: Smoothing factors 2 / (period + 1)
+    
+    Returns: (ema_fast, ema_slow, signal_line) after the last close
+    """
+    for i in range(closes.shape[0]):
+        ema_fast = closes[i] * alpha_fast + ema_fast * (1 - alpha_fast)
+        ema_slow = closes[i] * alpha_slow + ema_slow * (1 - alpha_slow)
+        signal_line = (ema_fast - ema_slow) * alpha_signal + signal_line * (1 - alpha_signal)
+    return ema_fast, ema_slow, signal_line
+
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _macd_fold_12_26_9(closes, ema_fast, ema_slow, signal_line):
+    """
+    _macd_fold_numba specialized for the standard 12/26/9 periods - the smoothing factors
+    are compile-time constants, so the compiler folds them into the recurrences
+    
+    Parameters / Returns: same as _macd_fold_numba, without the alpha arguments
+    """
+    for i in range(closes.shape[0]):
+        ema_fast = closes[i] * (2 / 13) + ema_fast * (1 - 2 / 13)
+        ema_slow = closes[i] * (2 / 27) + ema_slow * (1 - 2 / 27)
+        signal_line = (ema_fast - ema_slow) * (2 / 10) + signal_line * (1 - 2 / 10)
+    return ema_fast, ema_slow, signal_line
+
+
+def _default_macd_fold():
+    """(fold kernel, alpha arguments) for the configured MACD periods"""
+    if MACD_12_26_9:
+        return _macd_fold_12_26_9, ()
+    return _macd_fold_numba, MACD_ALPHAS
+
+
+def calculate_macd(closes, fast=None, slow=None, signal=None):
+    """
+    Calculate MACD indicator
+    
+    Parameters:
+    - closes: float64 ndarray of closing prices (e.g. BarsSoA.closes), used as-is - lists are still accepted but converted
+    - fast: Fast EMA period (default from config)
+    - slow: Slow EMA period (default from config)
+    - signal: Signal line period (default from config)
     
-    # Calculate EMAs
-    ema_fast = np.zeros(len(closes))
-    ema_slow = np.zeros(len(closes))
+    Returns: (macd_line, signal_line, histogram) or (None, None, None)
+    """
+    if DEBUG_CHECKS:
+        assert isinstance(closes, np.ndarray) and closes.dtype == np.float64 and closes.flags.c_contiguous, \
+            "calculate_macd expects a contiguous float64 ndarray"
     
-    ema_fast[0] = closes_arr[0]
-    ema_slow[0] = closes_arr[0]
+    if not isinstance(closes, np.ndarray) or closes.dtype != np.float64:
+        closes = np.asarray(closes, dtype=np.float64)
     
-    alpha_fast = 2 / (fast + 1)
-    alpha_slow = 2 / (slow + 1)
+    if not NUMBA_AVAILABLE:
+        macd_line, signal_line, histogram = calculate_macd_series(closes, fast, slow, signal)
+        if macd_line is None:
+            return None, None, None
+        return macd_line[-1], signal_line[-1], histogram[-1]
     
-    for i in range(1, len(closes)):
-        ema_fast[i] = closes_arr[i] * alpha_fast + ema_fast[i-1] * (1 - alpha_fast)
-        ema_slow[i] = closes_arr[i] * alpha_slow + ema_slow[i-1] * (1 - alpha_slow)
+    if fast is None and slow is None and signal is None:
+        slow = StrategyConfig.MACD_SLOW
+        fold, alphas = _default_macd_fold()
+    else:
+        if fast is None:
+            fast = StrategyConfig.MACD_FAST
+        if slow is None:
+            slow = StrategyConfig.MACD_SLOW
+        if signal is None:
+            signal = StrategyConfig.MACD_SIGNAL
+        fold, alphas = _macd_fold_numba, (2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
     
+    if len(closes) < slow:
+        return None, None, None
+    
+    # EMAs are seeded at the first close, so the MACD and signal lines start at 0
+    ema_fast, ema_slow, signal_line = fold(closes[1:], closes[0], closes[0], 0.0, *alphas)
     macd_line = ema_fast - ema_slow
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@dataclass
+class MACDState:
+    """Per-symbol MACD EMAs over completed bars, stepped forward as new bars close (live trading)"""
+    ema_fast: float = 0.0
+    ema_slow: float = 0.0
+    signal_line: float = 0.0
+    bar_count: int = 0  # completed bars folded in (0 = not seeded)
+    last_bar_time: int | None = None  # epoch seconds of the last folded bar
+
+
+def update_macd_state(state, bars):
+    """
+    MACD of bars from a MACDState - only bars closed since the last update are folded in
     
-    # Calculate signal line
-    signal_line = np.zeros(len(macd_line))
-    signal_line[0] = macd_line[0]
-    alpha_signal = 2 / (signal + 1)
+    Completed bars (all but the last) are added to the state once; the newest bar may still be
+    forming, so it is stepped on top each time without being stored. The state re-seeds itself
+    when bars no longer start where it did (e.g. a new session window).
+    Values equal calculate_macd(bars.closes).
     
-    for i in range(1, len(macd_line)):
-        signal_line[i] = macd_line[i] * alpha_signal + signal_line[i-1] * (1 - alpha_signal)
+    Parameters:
+    - state: MACDState for this symbol (modified in place)
+    - bars: BarsSoA with times, starting at the same bar every call
     
-    histogram = macd_line - signal_line
+    Returns: (macd_line, signal_line, histogram) or (None, None, None)
+    """
+    n = len(bars)
+    if n < StrategyConfig.MACD_SLOW or bars.times is None:
+        return calculate_macd(bars.closes)
+    
+    fold, alphas = _default_macd_fold()
+    times = bars.times
+    closes = bars.closes
+    completed = n - 1
+    
+    # The state must cover exactly bars[:bar_count] - otherwise the window moved, start over
+    count = state.bar_count
+    if count and (count > completed or times[count - 1] != state.last_bar_time):
+        count = 0
+    if count == 0:
+        state.ema_fast = state.ema_slow = float(closes[0])
+        state.signal_line = 0.0
+        count = 1
+    
+    if count < completed:
+        state.ema_fast, state.ema_slow, state.signal_line = fold(
+            closes[count:completed], state.ema_fast, state.ema_slow, state.signal_line, *alphas)
+    state.bar_count = completed
+    state.last_bar_time = int(times[completed - 1])
+    
+    # Newest bar on top of the completed-bar state
+    ema_fast, ema_slow, signal_line = fold(
+        closes[completed:], state.ema_fast, state.ema_slow, state.signal_line, *alphas)
+    macd_line = ema_fast - ema_slow
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _vwap_numba(highs, lows, closes, volumes):
+    """
+    VWAP over typical prices in one pass: sum((h + l + c) / 3 * v) / sum(v)
     
-    return macd_line[-1], signal_line[-1], histogram[-1]
+    Parameters:
+    - highs, lows, closes, volumes: float64 arrays of equal length
+    
+    Returns: VWAP value, or NaN when total volume is zero
+    """
+    total_pv = 0.0
+    total_volume = 0.0
+    for i in range(closes.shape[0]):
+        total_pv += (highs[i] + lows[i] + closes[i]) / 3.0 * volumes[i]
+        total_volume += volumes[i]
+    if total_volume == 0.0:
+        return np.nan
+    return total_pv / total_volume
 
 
 def calculate_vwap(bars):
@@ -166,57 +505,216 @@ def calculate_vwap(bars):
     Using typical price: (High + Low + Close) / 3
     
     Parameters:
-    - bars: List of bar dictionaries with 'high', 'low', 'close', 'volume'
+    - bars: BarsSoA or list of bar dictionaries with 'high', 'low', 'close', 'volume'
     
     Returns: VWAP value or None
     """
     if len(bars) < 2:
         return None
     
-    total_pv = 0.0
-    total_volume = 0.0
+    bars = as_soa(bars)
     
-    for bar in bars:
-        typical_price = (bar['high'] + bar['low'] + bar['close']) / 3
-        pv = typical_price * bar['volume']
-        total_pv += pv
-        total_volume += bar['volume']
+    if NUMBA_AVAILABLE:
+        vwap = _vwap_numba(bars.highs, bars.lows, bars.closes, bars.volumes)
+        return None if np.isnan(vwap) else float(vwap)
     
+    # Without numba: one dot product over the typical-price column
+    total_volume = bars.volumes.sum()
     if total_volume == 0:
         return None
     
-    return total_pv / total_volume
+    typical_prices = (bars.highs + bars.lows + bars.closes) / 3
+    return float(typical_prices.dot(bars.volumes) / total_volume)
+
+
+def calculate_vwap_series(bars):
+    """
+    Calculate cumulative VWAP at every bar (running sums from the first bar)
+    
+    Element [k] equals calculate_vwap(bars[:k+1]) for k >= 1 - the sums are accumulated
+    in the same order, so values match exactly. Bars with no volume yet give NaN.
+    
+    Parameters:
+    - bars: BarsSoA
+    
+    Returns: float64 array of VWAP values (same length as bars)
+    """
+    total_pv = np.cumsum((bars.highs + bars.lows + bars.closes) / 3.0 * bars.volumes)
+    total_volume = np.cumsum(bars.volumes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total_volume == 0.0, np.nan, total_pv / total_volume)
 
 
 # ==================== ENTRY CONDITIONS ====================
 
-def check_macd_positive(bars):
+def check_macd_positive(bars, macd=None):
     """
     Check if MACD is positive (above signal line and not crossing down)
     
     Parameters:
-    - bars: List of bar dictionaries with 'close' key
+    - bars: BarsSoA or list of bar dictionaries with 'close' key
+    - macd: Precomputed (macd_line, signal_line, histogram) for these bars (optional)
     
     Returns: (bool, str) - (condition_met, message)
     """
     if len(bars) < StrategyConfig.MIN_BARS_FOR_PATTERN:
         return False, "Not enough data"
     
-    closes = [bar['close'] for bar in bars]
-    macd, signal, histogram = calculate_macd(closes)
+    if macd is None:
+        macd = calculate_macd(as_soa(bars).closes)
+    macd, signal, histogram = macd
     
     if macd is None:
         return False, "MACD calculation failed"
     
     # MACD must be above signal line
     if macd <= signal:
-        return False, f"MACD negative: {macd:.4f} <= {signal:.4f}"
+        return False, _message("MACD negative: {:.4f} <= {:.4f}", macd, signal)
     
     # Check not crossing down (current histogram > 0)
     if histogram <= 0:
-        return False, f"MACD crossing down: histogram={histogram:.4f}"
+        return False, _message("MACD crossing down: histogram={:.4f}", histogram)
+    
+    return True, _message("MACD positive: {:.4f} > {:.4f}, histogram={:.4f}", macd, signal, histogram)
+
+
+# Pullback detector outcome codes (see _pullback_numba)
+PULLBACK_FOUND = 0
+PULLBACK_NO_SURGE = 1
+PULLBACK_SEGMENT_TOO_SHORT = 2
+PULLBACK_HIGH_TOO_RECENT = 3
+PULLBACK_NO_BARS_AFTER_HIGH = 4
+PULLBACK_TOO_SHALLOW = 5
+PULLBACK_TOO_DEEP = 6
+PULLBACK_NO_HIGHER_HIGH = 7
+PULLBACK_NOT_GREEN = 8
+PULLBACK_TOO_FAR_FROM_HIGH = 9
+
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _find_surge_numba(lows, highs, min_surge_pct, surge_lookback_min, surge_lookback_max):
+    """
+    Shortest lookback window (ending before the last 2 bars) whose high/low range is a surge
+    
+    Each longer lookback adds one bar at the front of the window, so the window
+    low/high are extended by that bar instead of rescanning the whole window.
+    
+    Parameters:
+    - lows, highs: float64 arrays of the recent bars
+    - remaining: StrategyConfig surge thresholds
+    
+    Returns: (surge_low, surge_high) - (NaN, NaN) when no lookback qualifies
+    """
+    n = lows.shape[0]
+    segment_low = np.inf
+    segment_high = -np.inf
+    for i in range(max(n - surge_lookback_min - 1, 0), n - 2):
+        if lows[i] < segment_low:
+            segment_low = lows[i]
+        if highs[i] > segment_high:
+            segment_high = highs[i]
+    for lookback in range(surge_lookback_min, min(surge_lookback_max + 1, n - 2)):
+        start = n - lookback - 2
+        if lows[start] < segment_low:
+            segment_low = lows[start]
+        if highs[start] > segment_high:
+            segment_high = highs[start]
+        if lookback < 3:
+            continue
+        surge_pct = ((segment_high - segment_low) / segment_low) * 100
+        if surge_pct >= min_surge_pct:
+            return segment_low, segment_high
+    return np.nan, np.nan
+
+
+def _find_surge_numpy(lows, highs, min_surge_pct, surge_lookback_min, surge_lookback_max):
+    """
+    _find_surge_numba without numba - every lookback's window low/high from one running
+    min/max over the reversed window, then the first qualifying lookback in one vector op
+    
+    Parameters / Returns: same as _find_surge_numba
+    """
+    n = lows.shape[0]
+    stop = min(surge_lookback_max + 1, n - 2)
+    if surge_lookback_min >= stop:
+        return np.nan, np.nan
+    
+    # Element k covers the window with lookback k + 1 (bars [n - k - 3, n - 2))
+    window = slice(n - stop - 1, n - 2)
+    run_low = np.minimum.accumulate(lows[window][::-1])
+    run_high = np.maximum.accumulate(highs[window][::-1])
+    surge_pct = ((run_high - run_low) / run_low) * 100
+    
+    first = max(surge_lookback_min, 3) - 1
+    hits = np.flatnonzero(surge_pct[first:] >= min_surge_pct)
+    if hits.shape[0] == 0:
+        return np.nan, np.nan
+    k = first + hits[0]
+    return run_low[k], run_high[k]
+
+
+_find_surge = _find_surge_numba if NUMBA_AVAILABLE else _find_surge_numpy
+
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _pullback_numba(opens, highs, lows, closes, min_surge_pct, surge_lookback_min, surge_lookback_max,
+                    recent_high_lookback, min_pullback_pct, max_pullback_pct):
+    """
+    Numeric core of detect_pullback_and_new_high over the recent-bar window
+    
+    Parameters:
+    - opens, highs, lows, closes: float64 arrays of the recent bars (at least 8)
+    - remaining: StrategyConfig thresholds
     
-    return True, f"MACD positive: {macd:.4f} > {signal:.4f}, histogram={histogram:.4f}"
+    Returns: (code, surge_low, surge_high, recent_high, pullback_low, pullback_pct, distance_from_high)
+    """
+    n = closes.shape[0]
+    nan = np.nan
+    
+    # STEP 1: Verify surge exists (2%+ move in last 5-20 bars, excluding last 2)
+    surge_low, surge_high = _find_surge(lows, highs, min_surge_pct, surge_lookback_min, surge_lookback_max)
+    if np.isnan(surge_low):
+        return PULLBACK_NO_SURGE, nan, nan, nan, nan, nan, nan
+    
+    # STEP 2: Find recent high (first occurrence, excluding last 2 bars)
+    lookback_bars = min(recent_high_lookback, n - 2)
+    seg_start = n - lookback_bars - 2
+    if n - 2 - seg_start < 3:
+        return PULLBACK_SEGMENT_TOO_SHORT, surge_low, surge_high, nan, nan, nan, nan
+    recent_high = highs[seg_start]
+    recent_high_idx = seg_start
+    for i in range(seg_start + 1, n - 2):
+        if highs[i] > recent_high:
+            recent_high = highs[i]
+            recent_high_idx = i
+    
+    # STEP 3: Find pullback low (after recent high, before last bar)
+    if recent_high_idx >= n - 2:
+        return PULLBACK_HIGH_TOO_RECENT, surge_low, surge_high, recent_high, nan, nan, nan
+    if recent_high_idx + 1 >= n - 1:
+        return PULLBACK_NO_BARS_AFTER_HIGH, surge_low, surge_high, recent_high, nan, nan, nan
+    pullback_low = lows[recent_high_idx + 1]
+    for i in range(recent_high_idx + 2, n - 1):
+        if lows[i] < pullback_low:
+            pullback_low = lows[i]
+    
+    pullback_pct = ((recent_high - pullback_low) / recent_high) * 100
+    if pullback_pct < min_pullback_pct:
+        return PULLBACK_TOO_SHALLOW, surge_low, surge_high, recent_high, pullback_low, pullback_pct, nan
+    if pullback_pct > max_pullback_pct:
+        return PULLBACK_TOO_DEEP, surge_low, surge_high, recent_high, pullback_low, pullback_pct, nan
+    
+    # STEP 4: Check breakout on last bar
+    if highs[n-1] <= highs[n-2]:
+        return PULLBACK_NO_HIGHER_HIGH, surge_low, surge_high, recent_high, pullback_low, pullback_pct, nan
+    if closes[n-1] <= opens[n-1]:
+        return PULLBACK_NOT_GREEN, surge_low, surge_high, recent_high, pullback_low, pullback_pct, nan
+    
+    distance_from_high = ((recent_high - closes[n-1]) / recent_high) * 100
+    if distance_from_high > 10.0:
+        return PULLBACK_TOO_FAR_FROM_HIGH, surge_low, surge_high, recent_high, pullback_low, pullback_pct, distance_from_high
+    
+    return PULLBACK_FOUND, surge_low, surge_high, recent_high, pullback_low, pullback_pct, distance_from_high
 
 
 def detect_pullback_and_new_high(bars):
@@ -232,7 +730,7 @@ def detect_pullback_and_new_high(bars):
     While avoiding sideways/consolidation patterns
     
     Parameters:
-    - bars: List of bar dictionaries with 'high', 'low', 'close', 'open', 'volume'
+    - bars: BarsSoA or list of bar dictionaries with 'high', 'low', 'close', 'open', 'volume'
     
     Returns: (bool, str, float, float) - (pattern_found, message, pullback_low_price, recent_high_price)
     """
@@ -240,99 +738,122 @@ def detect_pullback_and_new_high(bars):
         return False, "Not enough bars", None, None
     
     # Look at recent bars
-    recent = bars[-StrategyConfig.PATTERN_LOOKBACK_BARS:] if len(bars) >= StrategyConfig.PATTERN_LOOKBACK_BARS else bars
+    recent = as_soa(bars[-StrategyConfig.PATTERN_LOOKBACK_BARS:] if len(bars) >= StrategyConfig.PATTERN_LOOKBACK_BARS else bars)
     
     if len(recent) < 8:
         return False, "Insufficient data", None, None
     
-    # STEP 1: Verify surge exists (2%+ move in last 5-20 bars)
-    surge_confirmed = False
-    surge_low = None
-    surge_high = None
-    surge_high_idx = None
-    
-    # Try different lookback periods (5 to 20 bars)
-    for lookback in range(StrategyConfig.SURGE_LOOKBACK_MIN, min(StrategyConfig.SURGE_LOOKBACK_MAX + 1, len(recent) - 2)):
-        check_start_idx = len(recent) - lookback - 2  # Don't include last 2 bars
-        if check_start_idx < 0:
-            continue
-        
-        # Find low and high in this period
-        segment = recent[check_start_idx:-2]
-        if len(segment) < 3:
-            continue
-        
-        segment_low = min([bar['low'] for bar in segment])
-        segment_high = max([bar['high'] for bar in segment])
-        segment_high_idx_in_segment = [bar['high'] for bar in segment].index(segment_high)
-        segment_high_idx = check_start_idx + segment_high_idx_in_segment
-        
-        # Calculate surge percentage
-        surge_pct = ((segment_high - segment_low) / segment_low) * 100
-        
-        if surge_pct >= StrategyConfig.MIN_SURGE_PCT:
-            surge_confirmed = True
-            surge_low = segment_low
-            surge_high = segment_high
-            surge_high_idx = segment_high_idx
-            break
-    
-    if not surge_confirmed:
-        return False, f"No surge: need {StrategyConfig.MIN_SURGE_PCT}%+ move in last {StrategyConfig.SURGE_LOOKBACK_MAX} bars", None, None
-    
-    # STEP 2: Find recent high (in last 15 bars, excluding last 2)
-    lookback_bars = min(StrategyConfig.RECENT_HIGH_LOOKBACK, len(recent) - 2)
-    recent_segment = recent[-lookback_bars-2:-2]
+    code, surge_low, surge_high, recent_high, pullback_low, pullback_pct, distance_from_high = _pullback_numba(
+        recent.opens, recent.highs, recent.lows, recent.closes, *PULLBACK_PARAMS)
     
-    if len(recent_segment) < 3:
+    if code == PULLBACK_NO_SURGE:
+        return False, _message("No surge: need {}%+ move in last {} bars", StrategyConfig.MIN_SURGE_PCT, StrategyConfig.SURGE_LOOKBACK_MAX), None, None
+    if code == PULLBACK_SEGMENT_TOO_SHORT:
         return False, "Not enough bars for pattern", None, None
-    
-    highs = [bar['high'] for bar in recent_segment]
-    recent_high = max(highs)
-    recent_high_idx_in_segment = highs.index(recent_high)
-    recent_high_idx = len(recent) - lookback_bars - 2 + recent_high_idx_in_segment
-    
-    # STEP 3: Find pullback low (after recent high, before last bar)
-    if recent_high_idx >= len(recent) - 2:
+    if code == PULLBACK_HIGH_TOO_RECENT:
         return False, "High too recent, no pullback yet", None, None
-    
-    bars_after_high = recent[recent_high_idx + 1:-1]
-    if len(bars_after_high) == 0:
+    if code == PULLBACK_NO_BARS_AFTER_HIGH:
         return False, "No bars for pullback", None, None
+    if code == PULLBACK_TOO_SHALLOW:
+        return False, _message("No pullback: {:.2f}% < {}%", pullback_pct, StrategyConfig.MIN_PULLBACK_PCT), None, None
+    if code == PULLBACK_TOO_DEEP:
+        return False, _message("Pullback too deep: {:.2f}% > {}%", pullback_pct, StrategyConfig.MAX_PULLBACK_PCT), None, None
+    if code == PULLBACK_NO_HIGHER_HIGH:
+        return False, "No breakout - not making higher high", None, None
+    if code == PULLBACK_NOT_GREEN:
+        return False, "Breakout bar must close green", None, None
+    if code == PULLBACK_TOO_FAR_FROM_HIGH:
+        return False, _message("Too far from high: {:.1f}% below", distance_from_high), None, None
     
-    pullback_low = min([bar['low'] for bar in bars_after_high])
+    # Pattern confirmed!
+    surge_pct_final = ((surge_high - surge_low) / surge_low) * 100
+    message = _message("Momentum: {:.1f}% surge (${:.2f}→${:.2f}), pullback {:.1f}% to ${:.2f}, breakout ${:.2f}",
+                       surge_pct_final, surge_low, surge_high, pullback_pct, pullback_low, recent.highs[-1])
     
-    # Calculate pullback percentage
-    pullback_pct = ((recent_high - pullback_low) / recent_high) * 100
+    return True, message, float(pullback_low), float(recent_high)
+
+
+# Volume check outcome codes (see _volume_numba)
+VOLUME_OK = 0
+VOLUME_LOW_RELATIVE = 1
+VOLUME_TOPPING_TAIL = 2
+VOLUME_SELLING_PRESSURE = 3
+
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _volume_numba(opens, highs, closes, volumes, min_relative_volume, spike_threshold, wick_ratio, max_red_candles):
+    """
+    Numeric core of check_volume_conditions over the recent-bar window
     
-    # Validate pullback is within range (0.3% - 5%)
-    if pullback_pct < StrategyConfig.MIN_PULLBACK_PCT:
-        return False, f"No pullback: {pullback_pct:.2f}% < {StrategyConfig.MIN_PULLBACK_PCT}%", None, None
+    Parameters:
+    - opens, highs, closes, volumes: float64 arrays of the recent bars (at least 3)
+    - remaining: StrategyConfig thresholds
     
-    if pullback_pct > StrategyConfig.MAX_PULLBACK_PCT:
-        return False, f"Pullback too deep: {pullback_pct:.2f}% > {StrategyConfig.MAX_PULLBACK_PCT}%", None, None
+    Returns: (code, relative_volume, avg_last_2_bars, avg_volume, red_candles)
+    """
+    n = closes.shape[0]
+    
+    # Average volume of the history bars (all but the last 2)
+    history_len = n - 2 if n > 2 else n - 1
+    total = 0.0
+    for i in range(history_len):
+        total += volumes[i]
+    avg_volume = total / history_len
+    
+    avg_last_2_bars = (volumes[n-1] + volumes[n-2]) / 2
+    relative_volume = avg_last_2_bars / avg_volume if avg_volume > 0 else 0.0
+    if relative_volume < min_relative_volume:
+        return VOLUME_LOW_RELATIVE, relative_volume, avg_last_2_bars, avg_volume, 0
+    
+    # Volume top: high volume + long upper wick (topping tail)
+    upper_wick = highs[n-1] - max(opens[n-1], closes[n-1])
+    body_size = abs(closes[n-1] - opens[n-1])
+    if volumes[n-1] > avg_volume * spike_threshold and upper_wick > body_size * wick_ratio:
+        return VOLUME_TOPPING_TAIL, relative_volume, avg_last_2_bars, avg_volume, 0
+    
+    # Selling pressure: red candles in the last 5 bars
+    red_candles = 0
+    for i in range(max(n - 5, 0), n):
+        if closes[i] < opens[i]:
+            red_candles += 1
+    if red_candles >= max_red_candles:
+        return VOLUME_SELLING_PRESSURE, relative_volume, avg_last_2_bars, avg_volume, red_candles
+    
+    return VOLUME_OK, relative_volume, avg_last_2_bars, avg_volume, red_candles
+
+
+def _volume_numpy(opens, highs, closes, volumes, min_relative_volume, spike_threshold, wick_ratio, max_red_candles):
+    """
+    _volume_numba without numba - the averages and the red-candle count as array reductions
+    instead of interpreted loops
     
-    # STEP 4: Check breakout on last bar
-    last_bar = recent[-1]
-    second_last_bar = recent[-2]
+    Parameters / Returns: same as _volume_numba
+    """
+    n = closes.shape[0]
     
-    # Must make higher high and close green
-    if last_bar['high'] <= second_last_bar['high']:
-        return False, "No breakout - not making higher high", None, None
+    # Average volume of the history bars (all but the last 2)
+    avg_volume = volumes[:n - 2 if n > 2 else n - 1].mean()
     
-    if last_bar['close'] <= last_bar['open']:
-        return False, "Breakout bar must close green", None, None
+    avg_last_2_bars = (volumes[n-1] + volumes[n-2]) / 2
+    relative_volume = avg_last_2_bars / avg_volume if avg_volume > 0 else 0.0
+    if relative_volume < min_relative_volume:
+        return VOLUME_LOW_RELATIVE, relative_volume, avg_last_2_bars, avg_volume, 0
     
-    # Optional: Verify we're still near the momentum (within 10% of recent high)
-    distance_from_high = ((recent_high - last_bar['close']) / recent_high) * 100
-    if distance_from_high > 10.0:
-        return False, f"Too far from high: {distance_from_high:.1f}% below", None, None
+    # Volume top: high volume + long upper wick (topping tail)
+    upper_wick = highs[n-1] - max(opens[n-1], closes[n-1])
+    body_size = abs(closes[n-1] - opens[n-1])
+    if volumes[n-1] > avg_volume * spike_threshold and upper_wick > body_size * wick_ratio:
+        return VOLUME_TOPPING_TAIL, relative_volume, avg_last_2_bars, avg_volume, 0
     
-    # Pattern confirmed!
-    surge_pct_final = ((surge_high - surge_low) / surge_low) * 100
-    message = f"Momentum: {surge_pct_final:.1f}% surge (${surge_low:.2f}→${surge_high:.2f}), pullback {pullback_pct:.1f}% to ${pullback_low:.2f}, breakout ${last_bar['high']:.2f}"
+    # Selling pressure: red candles in the last 5 bars
+    red_candles = int(np.count_nonzero(closes[-5:] < opens[-5:]))
+    if red_candles >= max_red_candles:
+        return VOLUME_SELLING_PRESSURE, relative_volume, avg_last_2_bars, avg_volume, red_candles
     
-    return True, message, pullback_low, recent_high
+    return VOLUME_OK, relative_volume, avg_last_2_bars, avg_volume, red_candles
+
+
+_check_volume = _volume_numba if NUMBA_AVAILABLE else _volume_numpy
 
 
 def check_volume_conditions(bars):
@@ -344,52 +865,38 @@ def check_volume_conditions(bars):
     3. No excessive selling pressure during pullback
     
     Parameters:
-    - bars: List of bar dictionaries with 'high', 'low', 'close', 'open', 'volume'
+    - bars: BarsSoA or list of bar dictionaries with 'high', 'low', 'close', 'open', 'volume'
     
     Returns: (bool, str) - (condition_met, message)
     """
     if len(bars) < 5:
         return False, "Not enough bars for volume analysis"
     
-    recent = bars[-StrategyConfig.VOLUME_LOOKBACK_BARS:] if len(bars) >= StrategyConfig.VOLUME_LOOKBACK_BARS else bars
+    recent = as_soa(bars[-StrategyConfig.VOLUME_LOOKBACK_BARS:] if len(bars) >= StrategyConfig.VOLUME_LOOKBACK_BARS else bars)
     
     if len(recent) < 3:  # Need at least 3 bars (1 for history + 2 for current check)
         return False, "Not enough bars for volume analysis"
     
-    last_bar = recent[-1]
-    second_last_bar = recent[-2]
-    
-    # Calculate average volume of previous 10 bars (excluding last 2)
-    history_bars = recent[:-2] if len(recent) > 2 else recent[:-1]
-    if len(history_bars) == 0:
-        return False, "Not enough historical bars for volume analysis"
-    
-    avg_volume = sum([bar['volume'] for bar in history_bars]) / len(history_bars)
-    
-    # Calculate average of last 2 bars
-    avg_last_2_bars = (last_bar['volume'] + second_last_bar['volume']) / 2
-    relative_volume = avg_last_2_bars / avg_volume if avg_volume > 0 else 0
+    code, relative_volume, avg_last_2_bars, avg_volume, red_candles = _check_volume(
+        recent.opens, recent.highs, recent.closes, recent.volumes, *VOLUME_PARAMS)
     
     # REQUIREMENT 1: High relative volume (Ross Cameron style)
-    if relative_volume < StrategyConfig.MIN_RELATIVE_VOLUME:
-        return False, f"Low relative volume: {relative_volume:.2f}x avg of last 2 bars (need {StrategyConfig.MIN_RELATIVE_VOLUME}x+) - no momentum"
+    if code == VOLUME_LOW_RELATIVE:
+        return False, _message("Low relative volume: {:.2f}x avg of last 2 bars (need {}x+) - no momentum",
+                               relative_volume, StrategyConfig.MIN_RELATIVE_VOLUME)
     
-    # Check for volume top: high volume + long upper wick (topping tail)
-    upper_wick = last_bar['high'] - max(last_bar['open'], last_bar['close'])
-    body_size = abs(last_bar['close'] - last_bar['open'])
+    if code == VOLUME_TOPPING_TAIL:
+        return False, _message("Volume top detected: high volume ({:.0f} vs avg {:.0f}) with topping tail",
+                               recent.volumes[-1], avg_volume)
     
-    if last_bar['volume'] > avg_volume * StrategyConfig.VOLUME_SPIKE_THRESHOLD and upper_wick > body_size * StrategyConfig.VOLUME_WICK_RATIO:
-        return False, f"Volume top detected: high volume ({last_bar['volume']:.0f} vs avg {avg_volume:.0f}) with topping tail"
+    if code == VOLUME_SELLING_PRESSURE:
+        return False, _message("Excessive selling pressure: {}/5 red candles", red_candles)
     
-    # Check selling pressure during pullback: red candles shouldn't dominate
-    red_candles = sum([1 for bar in recent[-5:] if bar['close'] < bar['open']])  
-    if red_candles >= StrategyConfig.MAX_RED_CANDLES_IN_PULLBACK:
-        return False, f"Excessive selling pressure: {red_candles}/5 red candles"
-    
-    return True, f"Strong volume: {relative_volume:.2f}x avg (last 2 bars: {avg_last_2_bars:.0f} vs hist avg: {avg_volume:.0f}), no topping pattern"
+    return True, _message("Strong volume: {:.2f}x avg (last 2 bars: {:.0f} vs hist avg: {:.0f}), no topping pattern",
+                          relative_volume, avg_last_2_bars, avg_volume)
 
 
-def check_above_vwap(bars, current_price):
+def check_above_vwap(bars, current_price, vwap=None):
     """
     Check if current price is above VWAP
     Only take long trades when above VWAP
@@ -397,43 +904,50 @@ def check_above_vwap(bars, current_price):
     Parameters:
     - bars: List of bar dictionaries for VWAP calculation
     - current_price: Current price to compare
+    - vwap: Precomputed session VWAP (e.g. maintained incrementally) - skips the recompute
     
     Returns: (bool, str, float) - (condition_met, message, vwap_value)
     """
-    vwap = calculate_vwap(bars)
+    if vwap is None:
+        vwap = calculate_vwap(bars)
     
     if vwap is None:
         return False, "VWAP calculation failed", 0.0
     
     if current_price <= vwap:
-        return False, f"Price below VWAP: ${current_price:.4f} <= ${vwap:.4f} (no long entry)", vwap
+        return False, _message("Price below VWAP: ${:.4f} <= ${:.4f} (no long entry)", current_price, vwap), vwap
     
     pct_above = ((current_price - vwap) / vwap) * 100
-    return True, f"Price above VWAP: ${current_price:.4f} > ${vwap:.4f} (+{pct_above:.2f}%)", vwap
+    return True, _message("Price above VWAP: ${:.4f} > ${:.4f} (+{:.2f}%)", current_price, vwap, pct_above), vwap
 
 
-def check_all_entry_conditions(bars_1m, current_price):
+def check_all_entry_conditions(bars_1m, current_price, vwap=None, macd=None):
     """
     Check ALL entry conditions at once
     
     Parameters:
-    - bars_1m: List of 1-minute bars for pattern/MACD/volume/VWAP
+    - bars_1m: 1-minute bars (BarsSoA or list of bar dictionaries) for pattern/MACD/volume/VWAP
     - current_price: Current price
+    - vwap: Precomputed session VWAP over bars_1m (optional)
+    - macd: Precomputed (macd_line, signal_line, histogram) over bars_1m (optional)
     
     Returns: (bool, dict, float, float) - (all_conditions_met, condition_results, pullback_low, recent_high)
     """
+    # Convert once so every check reads the same column arrays
+    bars_1m = as_soa(bars_1m)
+    
     # Check each condition (all using 1-min bars now)
     pattern_ok, pattern_msg, pullback_low, recent_high = detect_pullback_and_new_high(bars_1m)
-    macd_ok, macd_msg = check_macd_positive(bars_1m)
+    macd_ok, macd_msg = check_macd_positive(bars_1m, macd)
     volume_ok, volume_msg = check_volume_conditions(bars_1m)
-    vwap_ok, vwap_msg, vwap_value = check_above_vwap(bars_1m, current_price)
+    vwap_ok, vwap_msg, vwap_value = check_above_vwap(bars_1m, current_price, vwap)
     
     # Compile results (include vwap_value for debugging)
     results = {
-        'pattern': {'ok': pattern_ok, 'msg': pattern_msg},
-        'macd': {'ok': macd_ok, 'msg': macd_msg},
-        'volume': {'ok': volume_ok, 'msg': volume_msg},
-        'vwap': {'ok': vwap_ok, 'msg': vwap_msg, 'vwap_value': vwap_value}
+        'pattern': {'ok': pattern_ok, 'msg': str(pattern_msg)},
+        'macd': {'ok': macd_ok, 'msg': str(macd_msg)},
+        'volume': {'ok': volume_ok, 'msg': str(volume_msg)},
+        'vwap': {'ok': vwap_ok, 'msg': str(vwap_msg), 'vwap_value': vwap_value}
     }
     
     all_ok = pattern_ok and macd_ok and volume_ok and vwap_ok
@@ -441,6 +955,147 @@ def check_all_entry_conditions(bars_1m, current_price):
     return all_ok, results, pullback_low, recent_high
 
 
+def evaluate_entry(bars_1m, current_price, vwap=None, macd=None):
+    """
+    Fast-path entry decision for the backtest - same outcome as check_all_entry_conditions,
+    but the checks share one column conversion, run cheapest first, stop at the first failure
+    and build no messages or results dict
+    
+    Parameters:
+    - bars_1m: 1-minute bars (BarsSoA or list of bar dictionaries)
+    - current_price: Current price
+    - vwap: Precomputed session VWAP over bars_1m (optional)
+    - macd: Precomputed (macd_line, signal_line, histogram) over bars_1m (optional)
+    
+    Returns: (bool, float, float) - (all_conditions_met, pullback_low, recent_high), prices None unless met
+    """
+    bars_1m = as_soa(bars_1m)
+    n = len(bars_1m)
+    if n < StrategyConfig.MIN_BARS_FOR_PATTERN or n < 5:
+        return False, None, None
+    
+    # 1. Price above VWAP - a scalar compare when VWAP is precomputed
+    if vwap is None:
+        vwap = calculate_vwap(bars_1m)
+    if vwap is None or current_price <= vwap:
+        return False, None, None
+    
+    # 2. MACD above signal with a positive histogram - scalar compares when precomputed
+    if macd is None:
+        macd = calculate_macd(bars_1m.closes)
+    macd_line, signal_line, histogram = macd
+    if macd_line is None or macd_line <= signal_line or histogram <= 0:
+        return False, None, None
+    
+    # 3. Volume - reductions over the last VOLUME_LOOKBACK_BARS bars
+    recent = bars_1m[-StrategyConfig.VOLUME_LOOKBACK_BARS:]
+    if len(recent) < 3:
+        return False, None, None
+    volume_code = _check_volume(
+        recent.opens, recent.highs, recent.closes, recent.volumes, *VOLUME_PARAMS)[0]
+    if volume_code != VOLUME_OK:
+        return False, None, None
+    
+    # 4. Pullback pattern (the heaviest scan) over the last PATTERN_LOOKBACK_BARS bars
+    recent = bars_1m[-StrategyConfig.PATTERN_LOOKBACK_BARS:]
+    if len(recent) < 8:
+        return False, None, None
+    pattern = _pullback_numba(
+        recent.opens, recent.highs, recent.lows, recent.closes, *PULLBACK_PARAMS)
+    if pattern[0] != PULLBACK_FOUND:
+        return False, None, None
+    
+    return True, float(pattern[4]), float(pattern[3])
+
+
+# ==================== BATCH SIGNALS (BACKTEST) ====================
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _bar_signals_numba(opens, highs, lows, closes, volumes, min_bars, pattern_lookback, volume_lookback,
+                       min_surge_pct, surge_lookback_min, surge_lookback_max, recent_high_lookback,
+                       min_pullback_pct, max_pullback_pct,
+                       min_relative_volume, spike_threshold, wick_ratio, max_red_candles):
+    """
+    Volume and pullback checks of evaluate_entry for every window bars[:k+1] in one call
+    
+    Parameters:
+    - opens, highs, lows, closes, volumes: float64 arrays of the bar series
+    - remaining: StrategyConfig window sizes and thresholds
+    
+    Returns: (ok, pullback_low, recent_high) arrays - prices are NaN where ok is False
+    """
+    n = closes.shape[0]
+    ok = np.zeros(n, dtype=np.bool_)
+    pullback_low = np.full(n, np.nan)
+    recent_high = np.full(n, np.nan)
+    
+    for k in range(n):
+        end = k + 1
+        if end < min_bars or end < 5:
+            continue
+        
+        start = max(end - volume_lookback, 0)
+        if end - start < 3:
+            continue
+        volume_code = _check_volume(opens[start:end], highs[start:end], closes[start:end], volumes[start:end],
+                                    min_relative_volume, spike_threshold, wick_ratio, max_red_candles)[0]
+        if volume_code != VOLUME_OK:
+            continue
+        
+        start = max(end - pattern_lookback, 0)
+        if end - start < 8:
+            continue
+        pattern = _pullback_numba(opens[start:end], highs[start:end], lows[start:end], closes[start:end],
+                                  min_surge_pct, surge_lookback_min, surge_lookback_max, recent_high_lookback,
+                                  min_pullback_pct, max_pullback_pct)
+        if pattern[0] != PULLBACK_FOUND:
+            continue
+        
+        ok[k] = True
+        pullback_low[k] = pattern[4]
+        recent_high[k] = pattern[3]
+    
+    return ok, pullback_low, recent_high
+
+
+def entry_signals(bars, macd_series=None):
+    """
+    Evaluate the entry conditions for every window bars[:k+1] at once (backtest)
+    
+    Entry at price p with window bars[:k+1] is allowed exactly when
+    evaluate_entry(bars[:k+1], p) would allow it: ok[k] and p > vwap[k].
+    The price check is left to the caller because the price moves within a 1-min bar.
+    
+    Parameters:
+    - bars: BarsSoA of 1-min bars, starting at the VWAP session start
+    - macd_series: Precomputed calculate_macd_series(bars.closes) (optional)
+    
+    Returns: (ok, vwap, pullback_low, recent_high) float/bool arrays (same length as bars)
+    """
+    n = len(bars)
+    
+    # VWAP needs 2 bars and some volume (NaN otherwise, so no price compares above it)
+    vwap = calculate_vwap_series(bars)
+    vwap[:2] = np.nan
+    
+    # MACD above signal with a positive histogram, once a full slow window exists
+    if macd_series is None:
+        macd_series = calculate_macd_series(bars.closes)
+    macd_line, signal_line, histogram = macd_series
+    if macd_line is None:
+        return np.zeros(n, dtype=np.bool_), vwap, np.full(n, np.nan), np.full(n, np.nan)
+    macd_ok = (macd_line > signal_line) & (histogram > 0)
+    macd_ok[:StrategyConfig.MACD_SLOW - 1] = False
+    
+    ok, pullback_low, recent_high = _bar_signals_numba(
+        bars.opens, bars.highs, bars.lows, bars.closes, bars.volumes,
+        StrategyConfig.MIN_BARS_FOR_PATTERN, StrategyConfig.PATTERN_LOOKBACK_BARS, StrategyConfig.VOLUME_LOOKBACK_BARS,
+        *PULLBACK_PARAMS, *VOLUME_PARAMS)
+    
+    ok &= macd_ok
+    return ok, vwap, pullback_low, recent_high
+
+
 # ==================== EXIT CONDITIONS ====================
 
 def check_dynamic_exit(bars):
@@ -449,23 +1104,27 @@ def check_dynamic_exit(bars):
     Exit if the latest completed bar's low is below the previous bar's low
     
     Parameters:
-    - bars: List of bars since entry
+    - bars: List of bars (or BarsSoA) since entry
     
     Returns: (bool, str) - (should_exit, message)
     """
     if len(bars) < 2:
         return False, "Insufficient bar data for exit check"
     
-    # Get the last two completed bars
-    latest_bar = bars[-1]
-    previous_bar = bars[-2]
+    # Get the lows of the last two completed bars (straight from the low column for BarsSoA)
+    if isinstance(bars, BarsSoA):
+        latest_low = float(bars.lows[-1])
+        previous_low = float(bars.lows[-2])
+    else:
+        latest_low = bars[-1]['low']
+        previous_low = bars[-2]['low']
     
     # Check if latest bar's low is below previous bar's low (reversal signal)
-    if latest_bar['low'] < previous_bar['low']:
-        message = f"Candle Under Candle detected: Latest low ${latest_bar['low']:.2f} < Previous low ${previous_bar['low']:.2f}"
+    if latest_low < previous_low:
+        message = f"Candle Under Candle detected: Latest low ${latest_low:.2f} < Previous low ${previous_low:.2f}"
         return True, message
     
-    return False, f"No exit signal: Latest low ${latest_bar['low']:.2f} >= Previous low ${previous_bar['low']:.2f}"
+    return False, f"No exit signal: Latest low ${latest_low:.2f} >= Previous low ${previous_low:.2f}"
 
 
 def check_stop_loss_hit(current_bar, stop_price):
@@ -503,11 +1162,105 @@ def check_end_of_day(current_time):
     
     Returns: bool - True if near close
     """
-    if current_time.hour == StrategyConfig.END_OF_DAY_HOUR and current_time.minute >= StrategyConfig.END_OF_DAY_MINUTE:
-        return True
-    elif current_time.hour > StrategyConfig.END_OF_DAY_HOUR:
-        return True
-    return False
+    return current_time.hour * 60 + current_time.minute >= END_OF_DAY_MINUTES
+
+
+# Exit scan outcome codes (see _first_exit_numba)
+EXIT_NONE = 0
+EXIT_STOP_LOSS = 1
+EXIT_PROFIT_TARGET = 2
+EXIT_DYNAMIC = 3
+EXIT_END_OF_DAY = 4
+
+
+@njit(cache=JIT_CACHE, nogil=True)
+def _first_exit_numba(lows, highs, end_of_day, entry_idx, entry_price, stop_price, profit_price, min_gain_pct):
+    """
+    Walk the bars after entry and return the first one that triggers an exit
+    
+    Checks in the same priority as bar-by-bar evaluation: check_stop_loss_hit,
+    check_profit_target_hit, check_dynamic_exit (low under previous low), check_end_of_day.
+    As in the live algo, the dynamic exit only counts once the highest high since entry
+    (entry bar included) is min_gain_pct above the entry price.
+    
+    Parameters:
+    - lows, highs: float64 arrays of the full bar series
+    - end_of_day: bool array - check_end_of_day per bar
+    - entry_idx: Index of the entry bar (exits are checked from the next bar on)
+    - entry_price: Position's entry price
+    - stop_price, profit_price: Position's stop and target
+    - min_gain_pct: StrategyConfig.TRAILING_MIN_GAIN_PCT
+    
+    Returns: (exit_idx, code) - (len(lows), EXIT_NONE) when no bar triggers
+    """
+    n = lows.shape[0]
+    highest_high = max(entry_price, highs[entry_idx]) if entry_idx < n else entry_price
+    for j in range(entry_idx + 1, n):
+        if highs[j] > highest_high:
+            highest_high = highs[j]
+        if lows[j] <= stop_price:
+            return j, EXIT_STOP_LOSS
+        if highs[j] >= profit_price:
+            return j, EXIT_PROFIT_TARGET
+        if lows[j] < lows[j-1] and (highest_high - entry_price) / entry_price * 100 >= min_gain_pct:
+            return j, EXIT_DYNAMIC
+        if end_of_day[j]:
+            return j, EXIT_END_OF_DAY
+    return n, EXIT_NONE
+
+
+def _first_exit_numpy(lows, highs, end_of_day, entry_idx, entry_price, stop_price, profit_price, min_gain_pct):
+    """
+    _first_exit_numba without numba - one boolean mask per exit rule over the bars after entry,
+    then the first bar where any fires
+    
+    Parameters / Returns: same as _first_exit_numba
+    """
+    n = lows.shape[0]
+    start = entry_idx + 1
+    if start >= n:
+        return n, EXIT_NONE
+    
+    hit_stop = lows[start:] <= stop_price
+    hit_profit = highs[start:] >= profit_price
+    highest_high = np.maximum(np.maximum.accumulate(highs[start-1:])[1:], entry_price)
+    hit_dynamic = (lows[start:] < lows[start-1:-1]) & ((highest_high - entry_price) / entry_price * 100 >= min_gain_pct)
+    any_exit = hit_stop | hit_profit | hit_dynamic | end_of_day[start:]
+    
+    j = int(any_exit.argmax())
+    if not any_exit[j]:
+        return n, EXIT_NONE
+    
+    # Same priority as the bar-by-bar checks when several fire on one bar
+    if hit_stop[j]:
+        return start + j, EXIT_STOP_LOSS
+    if hit_profit[j]:
+        return start + j, EXIT_PROFIT_TARGET
+    if hit_dynamic[j]:
+        return start + j, EXIT_DYNAMIC
+    return start + j, EXIT_END_OF_DAY
+
+
+_first_exit = _first_exit_numba if NUMBA_AVAILABLE else _first_exit_numpy
+
+
+def find_exit_bar(bars, end_of_day, entry_idx, entry_price, stop_price, profit_price):
+    """
+    Find where a position opened at bars[entry_idx] exits (one compiled scan instead of per-bar checks)
+    
+    Parameters:
+    - bars: BarsSoA of the full bar series
+    - end_of_day: bool array - check_end_of_day per bar
+    - entry_idx: Index of the entry bar
+    - entry_price: Entry price (the dynamic exit arms at a TRAILING_MIN_GAIN_PCT peak gain over it)
+    - stop_price: Stop loss price
+    - profit_price: Profit target price
+    
+    Returns: (exit_idx, code) - code is one of the EXIT_* constants, EXIT_NONE if the series ends first
+    """
+    exit_idx, code = _first_exit(bars.lows, bars.highs, end_of_day, entry_idx, float(entry_price),
+                                 float(stop_price), float(profit_price), float(StrategyConfig.TRAILING_MIN_GAIN_PCT))
+    return int(exit_idx), int(code)
 
 
 # ==================== POSITION SIZING ====================
@@ -520,16 +1273,16 @@ def calculate_position_size(account_balance, entry_price, stop_price):
     
     Parameters:
     - account_balance: Actual account balance (ignored for simulation)
-    - entry_price: Entry price per share
+    - entry_price: Entry price per share (whole cents, see calculate_entry_exit_prices)
     - stop_price: Stop loss price
     
     Returns: int - Number of shares to trade
     """
     # Simulate $500 account with $100 per trade
-    simulated_trade_size = StrategyConfig.TRADE_SIZE_DOLLARS
+    simulated_trade_cents = round(StrategyConfig.TRADE_SIZE_DOLLARS * 100)
     
-    # Calculate shares based on entry price
-    shares = int(simulated_trade_size / entry_price)
+    # Calculate shares based on entry price - integer cents, so exact multiples never truncate down
+    shares = simulated_trade_cents // round(entry_price * 100)
     
     return max(shares, 1)  # minimum 1 share
 
@@ -0,0 +1,41 @@
+"""
+Lazily formatted condition messages - shared by the strategy modules
+
+Condition checks return LazyMessage objects so str.format() only runs when a message
+is actually printed or logged; set VERBOSE = True to format eagerly instead.
+"""
+
+# Condition messages are formatted lazily (only when printed/logged) unless VERBOSE is set -
+# most rejection messages are never displayed, so skipping the formatting saves real time
+VERBOSE = False
+
+
+class LazyMessage:
+    """Condition message that defers str.format() until it is actually displayed"""
+    __slots__ = ('template', 'args')
+    
+    def __init__(self, template, *args):
+        self.template = template
+        self.args = args
+    
+    def __str__(self):
+        return self.template.format(*self.args)
+    
+    def __repr__(self):
+        return repr(str(self))
+    
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+    
+    def __eq__(self, other):
+        return str(self) == str(other)
+    
+    def __hash__(self):
+        return hash(str(self))
+
+
+def message(template, *args):
+    """Build a condition message - eagerly when VERBOSE, otherwise as a LazyMessage"""
+    if VERBOSE:
+        return template.format(*args)
+    return LazyMessage(template, *args)
@@ -0,0 +1,53 @@
+"""Exit scan parity with the live algo: the Candle Under Candle exit only arms after the peak-gain threshold"""
+import importlib.util
+import os
+import sys
+import unittest
+
+import numpy as np
+
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "RossCameron-Strategy.py")
+_spec = importlib.util.spec_from_file_location("strategy", _PATH)
+strategy = importlib.util.module_from_spec(_spec)
+sys.modules["strategy"] = strategy
+_spec.loader.exec_module(strategy)
+
+
+def _scan(scan, lows, highs, entry_price=10.0, stop_price=9.0, profit_price=12.0):
+    lows = np.asarray(lows, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    end_of_day = np.zeros(len(lows), dtype=np.bool_)
+    exit_idx, code = scan(lows, highs, end_of_day, 0, entry_price, stop_price, profit_price,
+                          float(strategy.StrategyConfig.TRAILING_MIN_GAIN_PCT))
+    return int(exit_idx), int(code)
+
+
+class ExitScanTest(unittest.TestCase):
+    scans = [strategy._first_exit_numpy] + ([strategy._first_exit_numba] if strategy.NUMBA_AVAILABLE else [])
+    
+    def test_lower_low_before_peak_gain_does_not_exit(self):
+        # Bar 2 undercuts bar 1 after only a 1% gain - an ungated scan would exit DYNAMIC here
+        lows = [9.9, 10.0, 9.95, 10.0]
+        highs = [10.05, 10.1, 10.05, 10.08]
+        for scan in self.scans:
+            with self.subTest(scan=scan.__name__):
+                self.assertEqual(_scan(scan, lows, highs), (len(lows), strategy.EXIT_NONE))
+    
+    def test_lower_low_after_peak_gain_exits(self):
+        # Bar 1 reaches +6%, so the lower low on bar 3 is a trailing exit
+        lows = [9.9, 10.3, 10.5, 10.4]
+        highs = [10.05, 10.6, 10.55, 10.5]
+        for scan in self.scans:
+            with self.subTest(scan=scan.__name__):
+                self.assertEqual(_scan(scan, lows, highs), (3, strategy.EXIT_DYNAMIC))
+    
+    def test_stop_takes_priority(self):
+        lows = [9.9, 10.3, 8.9]
+        highs = [10.05, 10.6, 10.5]
+        for scan in self.scans:
+            with self.subTest(scan=scan.__name__):
+                self.assertEqual(_scan(scan, lows, highs), (2, strategy.EXIT_STOP_LOSS))
+
+
+if __name__ == "__main__":
+    unittest.main()